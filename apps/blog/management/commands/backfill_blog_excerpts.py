@@ -0,0 +1,50 @@
+"""
+Django command to fill in the stored excerpt, word count and reading time of blog posts.
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.blog.models.blogs import BlogPost
+from apps.blog.services.reading import summarize
+from apps.shared.utils.response_cache import invalidate_tags
+
+DERIVED_FIELDS = ('excerpt', 'word_count', 'reading_time')
+
+
+class Command(BaseCommand):
+    """Recompute the derived fields of posts saved before they existed, in pk order."""
+    help = "Backfill BlogPost excerpt, word_count and reading_time from the content."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        seen = updated = 0
+        while True:
+            batch = list(
+                BlogPost.objects.filter(pk__gt=last_pk).order_by('pk')
+                .only('pk', 'content', *DERIVED_FIELDS)[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            seen += len(batch)
+
+            now = timezone.now()
+            changed = []
+            for post in batch:
+                values = summarize(post.content)
+                if values != tuple(getattr(post, name) for name in DERIVED_FIELDS):
+                    post.excerpt, post.word_count, post.reading_time = values
+                    # The payload changed: re-render it and send it to syncing clients
+                    post.updated_at = now
+                    changed.append(post)
+            BlogPost.objects.bulk_update(changed, [*DERIVED_FIELDS, 'updated_at'])
+            updated += len(changed)
+
+        if updated:
+            # bulk_update sends no signals
+            invalidate_tags('blogs')
+        self.stdout.write(self.style.SUCCESS(f"{seen} blog posts checked, {updated} updated"))
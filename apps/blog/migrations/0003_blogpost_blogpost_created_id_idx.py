@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_alter_blogpost_title'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['-created_at', '-id'], name='blogpost_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_blogpost_blogpost_updated_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Minutes'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.utils.text import slugify
+from apps.blog.services.reading import summarize
 from apps.users.models.user_auth import BaseModel
 from django.contrib.auth import get_user_model
 
@@ -26,11 +27,19 @@ class BlogPost(BaseModel):
     content = models.TextField()
     image = models.ImageField(upload_to='blogs/images/', null=True, blank=True)
     is_published = models.BooleanField(choices=STATUS_CHOICES, default=False)
+    # Derived from content on save (apps.blog.services.reading), for list cards
+    excerpt = models.TextField(blank=True, default='', editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text="Minutes")
 
     
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        self.excerpt, self.word_count, self.reading_time = summarize(self.content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt', 'word_count', 'reading_time'}
         super().save(*args, **kwargs)
         
     
@@ -41,6 +50,11 @@ class BlogPost(BaseModel):
         verbose_name = "Blog"
         verbose_name_plural = "Blogs"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='blogpost_created_id_idx'),
+            # Keyset scans of changed rows for mobile sync (apps.sync)
+            models.Index(fields=['updated_at', 'id'], name='blogpost_updated_id_idx'),
+        ]
         
         
 
@@ -14,6 +14,14 @@ class BlogPostSerializer(serializers.ModelSerializer):
         model = BlogPost
         fields = '__all__'
         read_only_fields = ['author', 'slug']
-        
-        
-    
\ No newline at end of file
+
+
+class BlogPostCardSerializer(serializers.ModelSerializer):
+    """A post as a list card: the stored excerpt and reading time instead of the content."""
+    class Meta:
+        model = BlogPost
+        fields = [
+            'id', 'title', 'slug', 'category', 'author', 'image',
+            'excerpt', 'word_count', 'reading_time', 'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
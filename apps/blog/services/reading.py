@@ -0,0 +1,30 @@
+"""
+Excerpt, word count and reading time of a blog post body.
+
+BlogPost stores these when it is saved, so list cards are rendered without
+reading the content. Content may be HTML from the rich text editor; tags
+are stripped and entities decoded before words are counted.
+"""
+
+import math
+from html import unescape
+from typing import Tuple
+
+from django.utils.html import strip_tags
+
+EXCERPT_WORDS = 40
+WORDS_PER_MINUTE = 200
+
+
+def plain_words(content: str):
+    return unescape(strip_tags(content or '')).split()
+
+
+def summarize(content: str) -> Tuple[str, int, int]:
+    """(excerpt, word count, reading time in minutes) of a post body."""
+    words = plain_words(content)
+    excerpt = ' '.join(words[:EXCERPT_WORDS])
+    if len(words) > EXCERPT_WORDS:
+        excerpt += '…'
+    reading_time = math.ceil(len(words) / WORDS_PER_MINUTE)
+    return excerpt, len(words), reading_time
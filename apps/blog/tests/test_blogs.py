@@ -1,4 +1,9 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -54,6 +59,44 @@ class BlogAPITestCase(TestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["slug"], "test-blog")
 
+    def test_blog_list_returns_cards_counted_by_the_fingerprint(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url)
+        # The ETag fingerprint with the total, then the page
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("OVER", queries[1]["sql"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["pagination"]["total_items"], 1)
+        card = response.data["data"][0]
+        self.assertNotIn("content", card)
+        self.assertEqual(card["excerpt"], "Content here")
+        self.assertEqual(card["reading_time"], 1)
+
+    # ----------------------------------------------------
+    # EXCERPTS
+    # ----------------------------------------------------
+    def test_excerpt_and_reading_time_maintained_on_save(self):
+        self.blog.content = "<p>Silk&nbsp;Road <b>cities</b></p>" + " word" * 400
+        self.blog.save(update_fields=["content"])
+        self.blog.refresh_from_db()
+
+        self.assertEqual(self.blog.word_count, 403)
+        self.assertEqual(self.blog.reading_time, 3)
+        self.assertTrue(self.blog.excerpt.startswith("Silk Road cities word"))
+        self.assertTrue(self.blog.excerpt.endswith("…"))
+
+    def test_backfill_command(self):
+        BlogPost.objects.update(excerpt="", word_count=0, reading_time=0)
+        out = StringIO()
+        call_command("backfill_blog_excerpts", batch_size=1, stdout=out)
+
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.word_count, 2)
+        self.assertEqual(self.blog.excerpt, "Content here")
+        self.assertIn("1 blog posts checked, 1 updated", out.getvalue())
+
     # ----------------------------------------------------
     # DETAIL
     # ----------------------------------------------------
@@ -3,35 +3,53 @@ from rest_framework.response import Response
 
 from apps.blog.serializers.blog_serializer import (
     BlogCategorySerializer,
+    BlogPostCardSerializer,
     BlogPostSerializer
 )
 from apps.blog.models.blogs import BlogPost, BlogCategory
-
-
-class BlogListView(generics.ListAPIView):
+from apps.shared.mixins.conditional_mixins import ConditionalGetMixin
+from apps.shared.mixins.fieldset_mixins import SparseFieldsetsMixin
+from apps.shared.mixins.prerendered_mixins import PrerenderedMixin
+from apps.shared.utils.compiled_serializer import CompiledListMixin
+from apps.shared.utils.custom_pagination import CustomCursorPagination
+from apps.shared.utils.custom_response import PrerenderedResponse
+from apps.shared.utils.renderers import render_with_raw
+from apps.shared.utils.response_cache import CachedResponseMixin
+
+
+class BlogListView(ConditionalGetMixin, CachedResponseMixin, SparseFieldsetsMixin, CompiledListMixin,
+                   generics.ListAPIView):
     """
-    List all published blog posts.
+    List all published blog posts as cards: the excerpt, word count and
+    reading time stored on the post instead of its content, read with one
+    query per page. The count is the one the ETag fingerprint already took.
     """
+    cache_tags = ('blogs',)
     queryset = BlogPost.objects.filter(is_published=True)
-    serializer_class = BlogPostSerializer
+    serializer_class = BlogPostCardSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = CustomCursorPagination
 
     def list(self, request, *args, **kwargs):
-        posts = self.get_queryset()
-        serializer = self.get_serializer(posts, many=True)
+        posts = self.filter_queryset(self.get_queryset())
+        data = self.paginate_compiled(posts, fields=self.get_sparse_fields())
+        if self.paginator.total is None and self.fingerprint is not None:
+            self.paginator.total = self.fingerprint[1]
 
         return Response({
             "status": "success",
-            "count": posts.count(),
+            "count": self.paginator.total,
             "message": "Blog posts retrieved successfully",
-            "data": serializer.data
+            "data": data,
+            "pagination": self.paginator.get_pagination_meta()
         }, status=status.HTTP_200_OK)
 
 
-class BlogDetailView(generics.RetrieveAPIView):
+class BlogDetailView(ConditionalGetMixin, CachedResponseMixin, PrerenderedMixin, generics.RetrieveAPIView):
     """
     Retrieve a single blog post by slug.
     """
+    cache_tags = ('blogs',)
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
     permission_classes = [permissions.AllowAny]
@@ -40,14 +58,13 @@ class BlogDetailView(generics.RetrieveAPIView):
     lookup_url_kwarg = "slug"
 
     def retrieve(self, request, *args, **kwargs):
-        post = self.get_object()
-        serializer = self.get_serializer(post)
+        post = self.get_prerendered_object()
 
-        return Response({
+        return PrerenderedResponse(render_with_raw({
             "status": "success",
             "message": "Blog post retrieved successfully",
-            "data": serializer.data
-        }, status=status.HTTP_200_OK)
+            "data": post
+        }), status=status.HTTP_200_OK)
 
 
 class BlogCreateView(generics.CreateAPIView):
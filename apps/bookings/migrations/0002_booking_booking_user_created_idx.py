@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+        ('excursions', '0002_excursion_excursion_created_id_idx'),
+        ('hotels', '0003_hotel_hotel_created_id_idx'),
+        ('tours', '0002_tour_tour_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='booking_user_created_idx'),
+        ),
+    ]
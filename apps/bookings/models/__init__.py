@@ -0,0 +1 @@
+from .booking_model import Booking
\ No newline at end of file
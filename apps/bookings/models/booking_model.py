@@ -27,5 +27,10 @@ class Booking(BaseModel):
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='booking_user_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user} booking"
@@ -1,8 +1,10 @@
+from django.db import transaction
 from rest_framework import serializers
 from apps.hotels.models.hotels import Hotel
 from apps.tours.models.tours import Tour
 from apps.excursions.models.excursion import Excursion
 from apps.bookings.models.booking_model import Booking
+from apps.bookings.services.inventory import reserve_inventory
 
 
 class HotelInfoSerializer(serializers.ModelSerializer):
@@ -89,6 +91,8 @@ class BookingSerializer(serializers.ModelSerializer):
         if hotel_id:
             if not data.get("check_in") or not data.get("check_out"):
                 raise serializers.ValidationError("Hotel booking requires check-in & check-out.")
+            if data["check_out"] <= data["check_in"]:
+                raise serializers.ValidationError("Check-out must be after check-in.")
 
         else:
             if data.get("check_in") or data.get("check_out"):
@@ -129,8 +133,6 @@ class BookingSerializer(serializers.ModelSerializer):
         if hotel:
             nights = (validated_data["check_out"] - validated_data["check_in"]).days
             validated_data["total_price"] = hotel.price_per_night * nights * guests
-            hotel.available_rooms -= guests
-            hotel.save()
 
         elif tour:
             validated_data["total_price"] = tour.price * guests
@@ -138,4 +140,13 @@ class BookingSerializer(serializers.ModelSerializer):
         elif excursion:
             validated_data["total_price"] = excursion.price * guests
 
-        return super().create(validated_data)
+        # Stock and booking row are committed together; raises InsufficientInventory
+        with transaction.atomic():
+            reserve_inventory(
+                hotel=hotel,
+                tour=tour,
+                quantity=guests,
+                check_in=validated_data.get("check_in"),
+                check_out=validated_data.get("check_out"),
+            )
+            return super().create(validated_data)
@@ -0,0 +1 @@
+from .inventory import InsufficientInventory, cancel_booking, reserve_inventory, release_inventory
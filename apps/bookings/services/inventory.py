@@ -0,0 +1,103 @@
+"""
+Room and seat inventory for bookings.
+
+Stock is changed with conditional UPDATE ... SET x = x +/- n WHERE
+<capacity check> statements, so the database serialises concurrent bookings
+on the rows and a booking either takes its stock or affects no row. Nothing
+is read into Python first, which is what made the old read-modify-write
+oversell. Hotel rooms are booked per night (apps.hotels.services.availability),
+tour seats on the tour row.
+
+Bookings leave the catalog alone: seats_booked is not part of the tour's
+payload (it is read live from the availability endpoint), so updated_at is
+not touched and the stored payloads, the snapshot and mobile sync are not
+refreshed by every booking. Only responses tagged 'availability' are dropped.
+"""
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.hotels.services.availability import release_room_nights, reserve_room_nights
+from apps.shared.utils.response_cache import invalidate_tags
+from apps.tours.models import Tour
+
+
+class InsufficientInventory(Exception):
+    """Raised when a hotel or tour does not have enough rooms or seats left."""
+
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(message)
+
+
+def _on_commit_invalidate(*tags):
+    # Queryset.update() sends no post_save, so cached availability is dropped here.
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+def reserve_inventory(hotel=None, tour=None, quantity=1, check_in=None, check_out=None):
+    """
+    Take `quantity` rooms from a hotel for every night from check_in to
+    check_out, or `quantity` seats from a tour.
+
+    Must run inside the transaction that creates the booking, so a failed
+    booking insert (or a full night) gives the stock back.
+    """
+    if hotel is not None:
+        if not reserve_room_nights(hotel, check_in, check_out, quantity):
+            raise InsufficientInventory("Not enough rooms available for these dates.")
+        _on_commit_invalidate('availability')
+
+    elif tour is not None:
+        updated = Tour.objects.filter(
+            pk=tour.pk, seats_booked__lte=F('capacity') - quantity
+        ).update(seats_booked=F('seats_booked') + quantity)
+        if not updated:
+            raise InsufficientInventory("Not enough seats available on this tour.")
+        _on_commit_invalidate('availability')
+
+
+def release_inventory(hotel_id=None, tour_id=None, quantity=1, check_in=None, check_out=None):
+    """Give `quantity` rooms (for the nights of the stay) or seats back."""
+    if hotel_id is not None:
+        if check_in and check_out:
+            release_room_nights(hotel_id, check_in, check_out, quantity)
+            _on_commit_invalidate('availability')
+
+    elif tour_id is not None:
+        Tour.objects.filter(pk=tour_id, seats_booked__gte=quantity).update(
+            seats_booked=F('seats_booked') - quantity
+        )
+        _on_commit_invalidate('availability')
+
+
+def cancel_booking(booking: Booking) -> bool:
+    """
+    Cancel a booking and release its stock exactly once.
+
+    The status flip is itself conditional, so two concurrent cancels of the
+    same booking release the stock only once. Returns False if the booking
+    was already canceled.
+    """
+    with transaction.atomic():
+        canceled = (
+            Booking.objects
+            .filter(pk=booking.pk)
+            .exclude(status="canceled")
+            .update(status="canceled", updated_at=timezone.now())
+        )
+        if not canceled:
+            return False
+
+        release_inventory(
+            hotel_id=booking.hotel_id,
+            tour_id=booking.tour_id,
+            quantity=booking.guests,
+            check_in=booking.check_in,
+            check_out=booking.check_out,
+        )
+
+    booking.status = "canceled"
+    return True
@@ -0,0 +1,176 @@
+import base64
+import json
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.bookings.models.booking_model import Booking
+from apps.excursions.models.excursion import Excursion
+from apps.hotels.models import Hotel, HotelRoomNight
+from apps.tours.models.tours import Tour
+from apps.users.models.user_auth import User
+
+
+class BookingInventoryTests(APITestCase):
+
+    def setUp(self):
+        self.create_url = reverse('booking-create')
+
+        self.user = User.objects.create_user(
+            username='user',
+            email='user@example.com',
+            password='UserPassword123!'
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.hotel = Hotel.objects.create(
+            name='Test Hotel', location='Test City', price_per_night=100, available_rooms=3
+        )
+        self.tour = Tour.objects.create(
+            title='Test Tour', description='A tour', destination='Samarkand',
+            duration_days=2, price=50, capacity=4
+        )
+
+    def book_hotel(self, guests, check_in='2026-01-01', check_out='2026-01-03'):
+        return self.client.post(self.create_url, {
+            'hotel_id': self.hotel.id,
+            'check_in': check_in,
+            'check_out': check_out,
+            'guests': guests,
+        })
+
+    def booked_nights(self):
+        return dict(
+            HotelRoomNight.objects.filter(hotel=self.hotel).values_list('night__day', 'rooms_booked')
+        )
+
+    def test_hotel_booking_takes_rooms_per_night(self):
+        response = self.book_hotel(2)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.booked_nights(), {1: 2, 2: 2})
+        self.hotel.refresh_from_db()
+        self.assertEqual(self.hotel.available_rooms, 3)
+
+    def test_hotel_overbooking_is_rejected(self):
+        self.assertEqual(self.book_hotel(2).status_code, status.HTTP_201_CREATED)
+
+        # Night of Jan 2 has one room left, so the whole stay is refused
+        response = self.book_hotel(2, check_in='2026-01-02', check_out='2026-01-04')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(self.booked_nights(), {1: 2, 2: 2})
+
+        # Other dates are unaffected
+        response = self.book_hotel(3, check_in='2026-01-03', check_out='2026-01-05')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_tour_capacity_is_enforced(self):
+        ok = self.client.post(self.create_url, {'tour_id': self.tour.id, 'guests': 3})
+        full = self.client.post(self.create_url, {'tour_id': self.tour.id, 'guests': 2})
+        self.assertEqual(ok.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(full.status_code, status.HTTP_409_CONFLICT)
+        self.tour.refresh_from_db()
+        self.assertEqual(self.tour.seats_booked, 3)
+
+    def test_tour_seats_are_read_live(self):
+        """Bookings change the availability endpoint, not the tour's payload"""
+        availability_url = reverse('tours:availability', kwargs={'pk': self.tour.pk})
+        self.assertEqual(self.client.get(availability_url).data['data']['seats_available'], 4)
+        detail = self.client.get(reverse('tours:detail', kwargs={'pk': self.tour.pk}))
+        self.assertNotIn('seats_booked', detail.data['data'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.create_url, {'tour_id': self.tour.id, 'guests': 3})
+
+        response = self.client.get(availability_url)
+        self.assertEqual(response.data['data'], {'id': self.tour.pk, 'capacity': 4, 'seats_booked': 3, 'seats_available': 1})
+        self.assertEqual(Tour.objects.get(pk=self.tour.pk).updated_at, self.tour.updated_at)
+
+    def test_cancel_releases_inventory_once(self):
+        booking_id = self.book_hotel(2).data['data']['id']
+        cancel_url = reverse('booking-cancel', args=[booking_id])
+
+        self.assertEqual(self.client.patch(cancel_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.patch(cancel_url).status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self.booked_nights(), {1: 0, 2: 0})
+        self.assertEqual(Booking.objects.get(pk=booking_id).status, 'canceled')
+
+
+class BookingHistoryTests(APITestCase):
+
+    def setUp(self):
+        self.list_url = reverse('booking-list-all')
+
+        self.user = User.objects.create_user(
+            username='user',
+            email='user@example.com',
+            password='UserPassword123!'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def add_bookings(self, count):
+        for i in range(count):
+            hotel = Hotel.objects.create(name=f'Hotel {i}', location='City', price_per_night=100)
+            tour = Tour.objects.create(
+                title=f'Tour {i}', description='A tour', destination='Bukhara',
+                duration_days=1, price=10, capacity=10
+            )
+            excursion = Excursion.objects.create(
+                title=f'Excursion {i}', location='Khiva', duration_hours=2, price=5, description='Walk'
+            )
+            Booking.objects.create(user=self.user, hotel=hotel)
+            Booking.objects.create(user=self.user, tour=tour)
+            Booking.objects.create(user=self.user, excursion=excursion)
+
+    def count_list_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries), response
+
+    def test_query_count_does_not_grow_with_bookings(self):
+        self.add_bookings(1)
+        few, response = self.count_list_queries(self.list_url)
+        self.assertEqual(response.data['count'], 3)
+
+        self.add_bookings(3)
+        many, response = self.count_list_queries(self.list_url)
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual(len(response.data['data']), 10)
+        self.assertEqual(few, many)
+        self.assertEqual(many, 1)
+
+    def test_cursor_with_out_of_range_id_is_rejected(self):
+        """A cursor id the database cannot hold is a bad cursor, not a server error"""
+        self.add_bookings(1)
+        for pk in (2 ** 63, -2 ** 63 - 1, 1e400):
+            payload = {'v': '2026-01-01T00:00:00+00:00', 'i': pk}
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            response = self.client.get(self.list_url, {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_count_is_given_on_every_page(self):
+        """Each page's own query counts the history, whatever the cursor carries"""
+        self.add_bookings(4)
+        first = self.client.get(self.list_url)
+        self.assertEqual(first.data['count'], 12)
+        cursor = first.data['pagination']['next_cursor']
+
+        queries, second = self.count_list_queries(f'{self.list_url}?cursor={cursor}')
+        self.assertEqual(second.data['count'], 12)
+        self.assertEqual(second.data['pagination']['total_items'], 12)
+        self.assertEqual(len(second.data['data']), 2)
+        self.assertEqual(queries, 1)
+
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        forged = base64.urlsafe_b64encode(json.dumps({**payload, 'n': 10 ** 6}).encode()).decode()
+        self.assertEqual(self.client.get(self.list_url, {'cursor': forged}).data['count'], 12)
+
+        # A page with no rows left has none to carry the count
+        Booking.objects.filter(pk__in=[item['id'] for item in second.data['data']]).delete()
+        emptied = self.client.get(self.list_url, {'cursor': cursor})
+        self.assertEqual(emptied.data['data'], [])
+        self.assertEqual(emptied.data['count'], 10)
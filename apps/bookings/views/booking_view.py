@@ -4,6 +4,14 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from apps.bookings.models.booking_model import Booking
 from apps.bookings.serializers.booking_serializer import BookingSerializer
+from apps.bookings.services.inventory import InsufficientInventory, cancel_booking
+from apps.shared.utils.custom_pagination import CustomCursorPagination
+
+
+class BookingCursorPagination(CustomCursorPagination):
+    # The history count comes from each page's query itself
+    count_in_query = True
+
 
 class BookingCreateView(generics.CreateAPIView):
     queryset = Booking.objects.all()
@@ -19,7 +27,14 @@ class BookingCreateView(generics.CreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        booking = serializer.save()
+        try:
+            booking = serializer.save()
+        except InsufficientInventory as e:
+            return Response(
+                {"success": False, "errors": {"guests": [e.message]}},
+                status=status.HTTP_409_CONFLICT
+            )
+
         return Response(
             {
                 "success": True,
@@ -32,12 +47,18 @@ class BookingCreateView(generics.CreateAPIView):
 class BookingListView(generics.ListAPIView):
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = BookingCursorPagination
 
     def get_queryset(self):
         user = self.request.user
         booking_type = self.kwargs.get('booking_type', None) 
 
-        queryset = Booking.objects.filter(user=user).order_by('-created_at')
+        queryset = (
+            Booking.objects
+            .filter(user=user)
+            .select_related('hotel', 'tour', 'excursion')
+            .order_by('-created_at')
+        )
 
         if booking_type == "hotels":
             queryset = queryset.filter(hotel__isnull=False)
@@ -50,11 +71,12 @@ class BookingListView(generics.ListAPIView):
 
 
     def list(self, request, *args, **kwargs):
-        bookings = self.get_queryset()
+        page = self.paginate_queryset(self.get_queryset())
         return Response({
             "success": True,
-            "count": bookings.count(),
-            "data": BookingSerializer(bookings, many=True).data
+            "count": self.paginator.total,
+            "data": BookingSerializer(page, many=True).data,
+            "pagination": self.paginator.get_pagination_meta()
         })
 
 
@@ -95,20 +117,12 @@ class BookingCancelView(generics.UpdateAPIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        if booking.status == "canceled":
+        if not cancel_booking(booking):
             return Response(
                 {"success": False, "message": "Booking already canceled"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-       
-        if booking.hotel:
-            booking.hotel.available_rooms += booking.guests
-            booking.hotel.save()
-
-        booking.status = "canceled"
-        booking.save()
-
         return Response({
             "success": True,
             "message": "Booking canceled successfully"
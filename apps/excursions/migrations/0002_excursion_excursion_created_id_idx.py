@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('excursions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='excursion',
+            index=models.Index(fields=['-created_at', '-id'], name='excursion_created_id_idx'),
+        ),
+    ]
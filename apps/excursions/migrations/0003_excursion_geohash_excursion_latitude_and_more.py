@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:12
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('excursions', '0002_excursion_excursion_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='excursion',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='excursion',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='excursion',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('excursions', '0003_excursion_geohash_excursion_latitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='excursion',
+            index=models.Index(fields=['updated_at', 'id'], name='excursion_updated_id_idx'),
+        ),
+    ]
@@ -1,9 +1,10 @@
 from django.db import models
 from apps.users.models.user_auth import BaseModel
+from apps.shared.models import GeoLocatedModel
 
 
 
-class Excursion(BaseModel):
+class Excursion(GeoLocatedModel, BaseModel):
     STATUS_CHOICES = (
         (True, 'Active'),
         (False, 'Inactive'),
@@ -27,4 +28,9 @@ class Excursion(BaseModel):
         verbose_name = "Excursion"
         verbose_name_plural = "Excursions"
         ordering = ['title']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='excursion_created_id_idx'),
+            # Keyset scans of changed rows for mobile sync (apps.sync)
+            models.Index(fields=['updated_at', 'id'], name='excursion_updated_id_idx'),
+        ]
    
\ No newline at end of file
@@ -1,10 +1,22 @@
 from rest_framework import serializers
 from apps.excursions.models.excursion import Excursion
 
+class YesNoField(serializers.BooleanField):
+    """Boolean rendered as 'Yes' / 'No'"""
+
+    def to_representation(self, value):
+        return 'Yes' if value else 'No'
+
+
 class ExcursionSerializer(serializers.ModelSerializer):
+    is_available = YesNoField(required=False)
+
     class Meta:
         model = Excursion
-        fields = "__all__"
+        fields = [
+            'id', 'created_at', 'updated_at', 'latitude', 'longitude',
+            'title', 'location', 'duration_hours', 'price', 'description', 'image', 'is_available',
+        ]
         read_only_fields = ('id', 'created_at', 'updated_at')
         
     def validate_price(self, value):
@@ -23,9 +35,4 @@ class ExcursionSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("An excursion with this title and location already exists.")
         return data
     
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation['is_available'] = 'Yes' if instance.is_available else 'No'
-        return representation
-    
     
\ No newline at end of file
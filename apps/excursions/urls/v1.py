@@ -4,13 +4,17 @@ from apps.excursions.views.excursion_views import (
     ExcursionDetailView,
     ExcursionCreateView,
     ExcursionUpdateView,
-    ExcursionDeleteView
+    ExcursionDeleteView,
+    ExcursionNearbyView,
+    ExcursionMapClusterView,
 )
 
 app_name = 'excursions'
 
 urlpatterns = [
     path('', ExcursionListView.as_view(), name='excursion-list'),
+    path('nearby/', ExcursionNearbyView.as_view(), name='excursion-nearby'),
+    path('map-clusters/', ExcursionMapClusterView.as_view(), name='excursion-map-clusters'),
     path('<int:pk>/', ExcursionDetailView.as_view(), name='excursion-detail'),
     path('create/', ExcursionCreateView.as_view(), name='excursion-create'),
     path('<int:pk>/update/', ExcursionUpdateView.as_view(), name='excursion-update'),
@@ -1,37 +1,62 @@
 from rest_framework import generics, permissions
 from apps.excursions.models import Excursion
 from apps.excursions.serializers.excursion_serializer import ExcursionSerializer
+from apps.shared.mixins.geo_mixins import MapClusterMixin, NearbyListMixin
+from apps.shared.mixins.prerendered_mixins import CatalogSnapshotMixin
+from apps.shared.mixins.streaming_mixins import StreamingListMixin
+from apps.shared.utils.custom_pagination import CustomCursorPagination
+from apps.shared.utils.response_cache import CachedResponseMixin
 from apps.shared.utils.custom_response import CustomResponse
 
 
-class ExcursionListView(generics.ListAPIView):
+class ExcursionListView(CatalogSnapshotMixin, CachedResponseMixin, StreamingListMixin, generics.ListAPIView):
+    cache_tags = ('excursions',)
+    snapshot_section = 'excursions'
     queryset = Excursion.objects.filter(is_available=True)
     serializer_class = ExcursionSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = CustomCursorPagination
 
     def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        return CustomResponse.success(
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.should_stream(request):
+            return self.stream_list(self.sparse_queryset(queryset))
+
+        return CustomResponse.prerendered(
             request=request,
-            data=serializer.data
+            data=self.paginate_catalog(queryset),
+            pagination=self.paginator.get_pagination_meta()
         )   
 
 
-class ExcursionDetailView(generics.RetrieveAPIView):
+class ExcursionNearbyView(NearbyListMixin, generics.ListAPIView):
+    queryset = Excursion.objects.filter(is_available=True)
+    serializer_class = ExcursionSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+class ExcursionMapClusterView(CachedResponseMixin, MapClusterMixin, generics.ListAPIView):
+    cache_tags = ('excursions',)
+    queryset = Excursion.objects.filter(is_available=True)
+    permission_classes = [permissions.AllowAny]
+
+
+class ExcursionDetailView(CatalogSnapshotMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_tags = ('excursions',)
+    snapshot_section = 'excursions'
     queryset = Excursion.objects.filter(is_available=True)
     serializer_class = ExcursionSerializer
     permission_classes = [permissions.AllowAny]
 
     def retrieve(self, request, *args, **kwargs):
         try:
-            excursion = self.get_object()
+            excursion = self.get_catalog_object()
         except Exception:
             return CustomResponse.not_found(request=request)
 
-        serializer = self.get_serializer(excursion)
-        return CustomResponse.success(
+        return CustomResponse.prerendered(
             request=request,
-            data=serializer.data
+            data=excursion
         )
 
 
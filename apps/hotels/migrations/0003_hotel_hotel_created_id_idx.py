@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0002_remove_hotel_gallery_remove_hotel_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['-created_at', '-id'], name='hotel_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0003_hotel_hotel_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HotelRoomNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('night', models.DateField()),
+                ('rooms_booked', models.PositiveIntegerField(default=0)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_nights', to='hotels.hotel')),
+            ],
+            options={
+                'verbose_name': 'Hotel Room Night',
+                'verbose_name_plural': 'Hotel Room Nights',
+                'db_table': 'hotel_room_nights',
+                'ordering': ['hotel', 'night'],
+                'indexes': [models.Index(fields=['night', 'hotel', 'rooms_booked'], name='room_night_search_idx')],
+                'constraints': [models.UniqueConstraint(fields=('hotel', 'night'), name='hotel_room_night_unique')],
+            },
+        ),
+    ]
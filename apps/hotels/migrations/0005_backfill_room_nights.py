@@ -0,0 +1,52 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import F
+
+
+def backfill_room_nights(apps, schema_editor):
+    """
+    available_rooms used to be decremented per active booking regardless of
+    dates. Give those rooms back to the stock and record the bookings per night.
+    """
+    Hotel = apps.get_model('hotels', 'Hotel')
+    HotelRoomNight = apps.get_model('hotels', 'HotelRoomNight')
+    Booking = apps.get_model('bookings', 'Booking')
+
+    restored = Counter()
+    booked = Counter()
+    bookings = (
+        Booking.objects
+        .filter(hotel__isnull=False)
+        .exclude(status='canceled')
+        .values_list('hotel_id', 'check_in', 'check_out', 'guests')
+    )
+    for hotel_id, check_in, check_out, guests in bookings.iterator():
+        restored[hotel_id] += guests
+        if check_in and check_out:
+            for offset in range((check_out - check_in).days):
+                booked[hotel_id, check_in + timedelta(days=offset)] += guests
+
+    for hotel_id, rooms in restored.items():
+        Hotel.objects.filter(pk=hotel_id).update(available_rooms=F('available_rooms') + rooms)
+
+    HotelRoomNight.objects.bulk_create(
+        [
+            HotelRoomNight(hotel_id=hotel_id, night=night, rooms_booked=rooms)
+            for (hotel_id, night), rooms in booked.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0004_hotelroomnight'),
+        ('bookings', '0002_booking_booking_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_room_nights, migrations.RunPython.noop),
+    ]
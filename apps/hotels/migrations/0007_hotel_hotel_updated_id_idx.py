@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0006_hotel_geohash_hotel_latitude_hotel_longitude'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['updated_at', 'id'], name='hotel_updated_id_idx'),
+        ),
+    ]
@@ -1 +1,2 @@
-from .hotels import Hotel
\ No newline at end of file
+from .hotels import Hotel
+from .room_nights import HotelRoomNight
@@ -1,7 +1,7 @@
 from django.db import models
-from apps.shared.models import BaseModel  # assuming you have a BaseModel with created_at, updated_at
+from apps.shared.models import BaseModel, GeoLocatedModel  # assuming you have a BaseModel with created_at, updated_at
 
-class Hotel(BaseModel):
+class Hotel(GeoLocatedModel, BaseModel):
     STATUS_CHOICES = (
         (True, 'Active'),
         (False, 'Inactive'),
@@ -31,5 +31,10 @@ class Hotel(BaseModel):
         verbose_name = 'Hotel'
         verbose_name_plural = 'Hotels'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='hotel_created_id_idx'),
+            # Keyset scans of changed rows for mobile sync (apps.sync)
+            models.Index(fields=['updated_at', 'id'], name='hotel_updated_id_idx'),
+        ]
 
 
@@ -0,0 +1,29 @@
+from django.db import models
+from apps.hotels.models.hotels import Hotel
+
+
+class HotelRoomNight(models.Model):
+    """
+    Rooms booked at a hotel for one night.
+
+    Hotel.available_rooms is the room stock; the rooms free on a night are
+    available_rooms - rooms_booked. Nights without a row have nothing booked.
+    """
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='room_nights')
+    night = models.DateField()
+    rooms_booked = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.hotel_id} @ {self.night}: {self.rooms_booked} booked"
+
+    class Meta:
+        db_table = 'hotel_room_nights'
+        verbose_name = 'Hotel Room Night'
+        verbose_name_plural = 'Hotel Room Nights'
+        ordering = ['hotel', 'night']
+        constraints = [
+            models.UniqueConstraint(fields=['hotel', 'night'], name='hotel_room_night_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['night', 'hotel', 'rooms_booked'], name='room_night_search_idx'),
+        ]
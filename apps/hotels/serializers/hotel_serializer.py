@@ -19,6 +19,8 @@ class HotelSerializer(serializers.ModelSerializer):
             'has_pool',
             'has_breakfast',
             'has_parking',
+            'latitude',
+            'longitude',
             'created_at',
             'updated_at',
         ]
@@ -37,8 +39,60 @@ class HotelListSerializer(serializers.ModelSerializer):
             "available_rooms",
             "is_available",
             "main_image",
+            "latitude",
+            "longitude",
         ]
         
         read_only_fields = fields
-        
-        
\ No newline at end of file
+
+
+class HotelAvailabilitySerializer(HotelListSerializer):
+    rooms_left = serializers.IntegerField(read_only=True)
+
+    class Meta(HotelListSerializer.Meta):
+        fields = HotelListSerializer.Meta.fields + ["rooms_left"]
+        read_only_fields = fields
+
+
+class AvailabilitySearchSerializer(serializers.Serializer):
+    MAX_NIGHTS = 90
+
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    rooms = serializers.IntegerField(min_value=1, default=1)
+
+    def validate(self, data):
+        nights = (data["check_out"] - data["check_in"]).days
+        if nights <= 0:
+            raise serializers.ValidationError("Check-out must be after check-in.")
+        if nights > self.MAX_NIGHTS:
+            raise serializers.ValidationError(f"Stays are limited to {self.MAX_NIGHTS} nights.")
+        return data
+
+
+class HotelCatalogQuerySerializer(serializers.Serializer):
+    """Filters and ordering accepted by the hotel list"""
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    min_rating = serializers.DecimalField(max_digits=2, decimal_places=1, required=False)
+    min_rooms = serializers.IntegerField(min_value=0, required=False)
+    amenities = serializers.CharField(required=False)
+    ordering = serializers.CharField(required=False, default='-created_at')
+
+    def validate_amenities(self, value):
+        from apps.hotels.services.catalog import AMENITIES
+
+        names = tuple(name.strip() for name in value.split(',') if name.strip())
+        unknown = [name for name in names if name not in AMENITIES]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown amenities: {', '.join(unknown)}. Choose from: {', '.join(AMENITIES)}."
+            )
+        return names
+
+    def validate_ordering(self, value):
+        from apps.hotels.services.catalog import ORDERINGS
+
+        if value not in ORDERINGS:
+            raise serializers.ValidationError(f"Choose from: {', '.join(ORDERINGS)}.")
+        return value
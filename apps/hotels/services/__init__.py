@@ -0,0 +1 @@
+from .availability import available_hotels, nights_between, release_room_nights, reserve_room_nights
@@ -0,0 +1,83 @@
+"""
+Per-night room inventory.
+
+Booking and cancelling touch only the HotelRoomNight rows of the stay, each
+with one conditional UPDATE over the night range. Searching compares the
+busiest night of the range against the hotel's stock in a single query
+served by the (night, hotel, rooms_booked) index; Booking rows are never
+scanned.
+"""
+
+from datetime import date, timedelta
+from typing import List
+
+from django.db.models import F, IntegerField, Max, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.hotels.models import Hotel, HotelRoomNight
+
+
+def nights_between(check_in: date, check_out: date) -> List[date]:
+    """Nights of a stay: check_in up to, not including, check_out."""
+    return [check_in + timedelta(days=offset) for offset in range((check_out - check_in).days)]
+
+
+def reserve_room_nights(hotel: Hotel, check_in: date, check_out: date, rooms: int) -> bool:
+    """
+    Book `rooms` rooms on every night of the stay, or on none of them.
+
+    Must run inside a transaction: when any night is full the caller raises,
+    which rolls back the nights that were taken.
+    """
+    nights = nights_between(check_in, check_out)
+    if not nights:
+        return False
+
+    HotelRoomNight.objects.bulk_create(
+        [HotelRoomNight(hotel=hotel, night=night) for night in nights],
+        ignore_conflicts=True,
+    )
+    updated = (
+        HotelRoomNight.objects
+        .filter(
+            hotel=hotel,
+            night__gte=check_in,
+            night__lt=check_out,
+            rooms_booked__lte=hotel.available_rooms - rooms,
+        )
+        .update(rooms_booked=F('rooms_booked') + rooms)
+    )
+    return updated == len(nights)
+
+
+def release_room_nights(hotel_id: int, check_in: date, check_out: date, rooms: int) -> None:
+    """Give `rooms` rooms back on every night of the stay."""
+    HotelRoomNight.objects.filter(
+        hotel_id=hotel_id,
+        night__gte=check_in,
+        night__lt=check_out,
+        rooms_booked__gte=rooms,
+    ).update(rooms_booked=F('rooms_booked') - rooms)
+
+
+def available_hotels(queryset: QuerySet, check_in: date, check_out: date, rooms: int = 1) -> QuerySet:
+    """
+    Hotels with at least `rooms` rooms free on every night of the stay,
+    annotated with rooms_left (free rooms on the busiest night).
+    """
+    busiest_night = (
+        HotelRoomNight.objects
+        .filter(hotel=OuterRef('pk'), night__gte=check_in, night__lt=check_out)
+        .values('hotel')
+        .annotate(peak=Max('rooms_booked'))
+        .values('peak')
+    )
+    return (
+        queryset
+        .annotate(
+            rooms_left=F('available_rooms') - Coalesce(
+                Subquery(busiest_night, output_field=IntegerField()), Value(0)
+            )
+        )
+        .filter(available_rooms__gte=rooms, rooms_left__gte=rooms)
+    )
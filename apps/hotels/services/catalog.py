@@ -0,0 +1,281 @@
+"""
+Columnar hotel catalog over the shared catalog snapshot.
+
+Listed hotels are held as NumPy columns (price in cents, rating in tenths,
+rooms, created_at in microseconds, amenity bitmask) next to their already
+rendered list rows, in the 'hotels' section of the snapshot file
+(apps.shared.utils.catalog_snapshot) that every worker maps. Filtering,
+keyset pagination, top-K selection and facet counts are vectorised over
+those columns, so browsing the catalog does not query the database.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from apps.hotels.models import Hotel
+from apps.hotels.serializers.hotel_serializer import HotelListSerializer
+from apps.shared.utils import representations
+from apps.shared.utils.catalog_snapshot import BlobColumn, SnapshotSection, catalog_snapshot
+
+AMENITIES = {
+    'wifi': ('has_wifi', 1),
+    'pool': ('has_pool', 2),
+    'breakfast': ('has_breakfast', 4),
+    'parking': ('has_parking', 8),
+}
+
+# Bucket edges in cents; the last bucket is open-ended.
+PRICE_BUCKETS = (0, 5000, 10000, 20000, 50000)
+RATING_BUCKETS = (0, 10, 20, 30, 40)
+
+
+def _bucket_indices(edges, values):
+    # Nothing stops a negative price being saved; it counts in the first bucket
+    # rather than making bincount() raise
+    return np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 1)
+
+
+# ordering -> (column, descending)
+ORDERINGS = {
+    '-created_at': ('created', True),
+    'created_at': ('created', False),
+    'price': ('price', False),
+    '-price': ('price', True),
+    'rating': ('rating', False),
+    '-rating': ('rating', True),
+}
+DEFAULT_ORDERING = '-created_at'
+
+
+class InvalidCatalogCursor(ValueError):
+    pass
+
+
+@dataclass
+class CatalogQuery:
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    min_rating: Optional[Decimal] = None
+    min_rooms: Optional[int] = None
+    amenities: Tuple[str, ...] = ()
+    ordering: str = DEFAULT_ORDERING
+    page_size: int = 10
+    cursor: Optional[str] = None
+
+
+@dataclass
+class CatalogPage:
+    ids: List[int]
+    # List rows as stored: JSON with placeholder URLs, empty where it must be rendered live
+    rows: List[bytes]
+    total: int
+    facets: Dict[str, Any]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def _cents(value) -> int:
+    return int((Decimal(value) * 100).to_integral_value())
+
+
+def _tenths(value) -> int:
+    return int((Decimal(value) * 10).to_integral_value())
+
+
+def _amenity_mask(hotel) -> int:
+    return sum(bit for attr, bit in AMENITIES.values() if getattr(hotel, attr))
+
+
+def snapshot_columns(hotels) -> Tuple[Dict[str, np.ndarray], Dict[str, List[bytes]]]:
+    """Hotel columns and list rows of the catalog snapshot's 'hotels' section."""
+    count = len(hotels)
+    columns = {
+        'price': np.fromiter((_cents(h.price_per_night) for h in hotels), dtype=np.int64, count=count),
+        'rating': np.fromiter((_tenths(h.rating) for h in hotels), dtype=np.int64, count=count),
+        'rooms': np.fromiter((h.available_rooms for h in hotels), dtype=np.int64, count=count),
+        'amenities': np.fromiter((_amenity_mask(h) for h in hotels), dtype=np.uint8, count=count),
+    }
+    rows = representations.render(Hotel, hotels, '', serializer_class=HotelListSerializer)
+    return columns, {'list': [row or b'' for row in rows]}
+
+
+def encode_cursor(ordering: str, key: int, pk: int, reverse: bool = False) -> str:
+    payload = {'o': ordering, 'k': key, 'i': pk}
+    if reverse:
+        payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(encoded: str, ordering: str) -> Tuple[int, int, bool]:
+    try:
+        padded = encoded + '=' * (-len(encoded) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload['o'] != ordering:
+            raise ValueError('cursor belongs to another ordering')
+        return int(payload['k']), int(payload['i']), bool(payload.get('r'))
+    except (TypeError, ValueError, KeyError, AttributeError) as e:
+        raise InvalidCatalogCursor(str(e))
+
+
+@dataclass
+class Snapshot:
+    """Column views over the 'hotels' section of the catalog snapshot."""
+    ids: np.ndarray
+    price: np.ndarray
+    rating: np.ndarray
+    rooms: np.ndarray
+    created: np.ndarray
+    amenities: np.ndarray
+    rows: BlobColumn
+
+    @classmethod
+    def from_section(cls, section: SnapshotSection) -> 'Snapshot':
+        return cls(
+            ids=section.column('ids'),
+            price=section.column('price'),
+            rating=section.column('rating'),
+            rooms=section.column('rooms'),
+            created=section.column('created'),
+            amenities=section.column('amenities'),
+            rows=section.blob('list'),
+        )
+
+
+class HotelCatalog:
+
+    def __init__(self):
+        self._section: Optional[SnapshotSection] = None
+        self._snapshot: Optional[Snapshot] = None
+
+    def get_snapshot(self) -> Snapshot:
+        section = catalog_snapshot.section('hotels')
+        if section is not self._section:
+            self._snapshot = Snapshot.from_section(section)
+            self._section = section
+        return self._snapshot
+
+    # Queries
+
+    def _filter_mask(self, snapshot: Snapshot, query: CatalogQuery) -> np.ndarray:
+        mask = np.ones(len(snapshot.ids), dtype=bool)
+        if query.min_price is not None:
+            mask &= snapshot.price >= _cents(query.min_price)
+        if query.max_price is not None:
+            mask &= snapshot.price <= _cents(query.max_price)
+        if query.min_rating is not None:
+            mask &= snapshot.rating >= _tenths(query.min_rating)
+        if query.min_rooms is not None:
+            mask &= snapshot.rooms >= query.min_rooms
+        required = sum(AMENITIES[name][1] for name in query.amenities)
+        if required:
+            mask &= (snapshot.amenities & required) == required
+        return mask
+
+    def _facets(self, snapshot: Snapshot, mask: np.ndarray) -> Dict[str, Any]:
+        amenities = snapshot.amenities[mask]
+        prices = snapshot.price[mask]
+        ratings = snapshot.rating[mask]
+
+        price_counts = np.bincount(_bucket_indices(PRICE_BUCKETS, prices), minlength=len(PRICE_BUCKETS))
+        rating_counts = np.bincount(_bucket_indices(RATING_BUCKETS, ratings), minlength=len(RATING_BUCKETS))
+
+        def bucket_label(edges, i, scale):
+            upper = f"{edges[i + 1] // scale}" if i + 1 < len(edges) else ''
+            return f"{edges[i] // scale}-{upper}" if upper else f"{edges[i] // scale}+"
+
+        return {
+            'amenities': {
+                name: int(np.count_nonzero(amenities & bit))
+                for name, (_, bit) in AMENITIES.items()
+            },
+            'price': {
+                bucket_label(PRICE_BUCKETS, i, 100): int(count)
+                for i, count in enumerate(price_counts)
+            },
+            'rating': {
+                bucket_label(RATING_BUCKETS, i, 10): int(count)
+                for i, count in enumerate(rating_counts)
+            },
+        }
+
+    @staticmethod
+    def _top_k(keys: np.ndarray, ids: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k smallest (key, id) pairs, in order."""
+        if len(keys) > k:
+            # Partition on the key, then keep every tie of the k-th key so ids decide.
+            threshold = np.partition(keys, k - 1)[k - 1]
+            candidates = np.flatnonzero(keys <= threshold)
+        else:
+            candidates = np.arange(len(keys))
+        order = np.lexsort((ids[candidates], keys[candidates]))
+        return candidates[order[:k]]
+
+    def query(self, query: CatalogQuery) -> CatalogPage:
+        if query.ordering not in ORDERINGS:
+            query.ordering = DEFAULT_ORDERING
+        column, descending = ORDERINGS[query.ordering]
+
+        snapshot = self.get_snapshot()
+        mask = self._filter_mask(snapshot, query)
+        total = int(np.count_nonzero(mask))
+        facets = self._facets(snapshot, mask)
+
+        position, reverse = None, False
+        if query.cursor:
+            key, pk, reverse = decode_cursor(query.cursor, query.ordering)
+            position = (key, pk)
+
+        # Sort ascending on signed keys: descending orderings negate key and id.
+        sign = -1 if descending else 1
+        if reverse:
+            sign = -sign
+        keys = sign * getattr(snapshot, column)
+        ids = sign * snapshot.ids
+
+        if position is not None:
+            key, pk = sign * position[0], sign * position[1]
+            mask = mask & ((keys > key) | ((keys == key) & (ids > pk)))
+
+        candidates = np.flatnonzero(mask)
+        picked = candidates[self._top_k(keys[candidates], ids[candidates], query.page_size + 1)]
+        has_more = len(picked) > query.page_size
+        picked = picked[:query.page_size]
+        if reverse:
+            picked = picked[::-1]
+
+        if position is None:
+            has_next, has_prev = has_more, False
+        elif reverse:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, True
+
+        values = getattr(snapshot, column)
+
+        def cursor_at(index, reverse_cursor):
+            return encode_cursor(query.ordering, int(values[index]), int(snapshot.ids[index]), reverse_cursor)
+
+        page = CatalogPage(
+            ids=[int(snapshot.ids[i]) for i in picked],
+            rows=[bytes(snapshot.rows[i]) for i in picked],
+            total=total,
+            facets=facets,
+        )
+        if len(picked):
+            page.next_cursor = cursor_at(picked[-1], False) if has_next else None
+            page.prev_cursor = cursor_at(picked[0], True) if has_prev else None
+        elif position is not None:
+            # Nothing left on this side of the cursor; point back where we came from.
+            cursor = encode_cursor(query.ordering, position[0], position[1], not reverse)
+            page.next_cursor = cursor if reverse else None
+            page.prev_cursor = cursor if not reverse else None
+        return page
+
+
+catalog = HotelCatalog()
@@ -1,7 +1,11 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from datetime import date
 from apps.hotels.models.hotels import Hotel
+from apps.hotels.models.room_nights import HotelRoomNight
 from apps.users.models.user_auth import User
 
 
@@ -106,3 +110,176 @@ class HotelTests(APITestCase):
         url = reverse('hotels:hotel-delete', args=[self.hotel.id])
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_hotels_cursor_pagination(self):
+        """Hotel list is paginated by opaque cursors without gaps or duplicates"""
+        for i in range(14):
+            Hotel.objects.create(**{**self.hotel_data, 'name': f'Hotel {i}'})
+
+        seen = []
+        response = self.client.get(self.list_url, {'page_size': 4, 'total': 'exact'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['pagination']['total_items'], 15)
+        self.assertIsNone(response.data['pagination']['prev_cursor'])
+
+        while True:
+            seen.extend(item['id'] for item in response.data['data'])
+            next_cursor = response.data['pagination']['next_cursor']
+            if not next_cursor:
+                break
+            response = self.client.get(self.list_url, {'page_size': 4, 'cursor': next_cursor})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        expected = list(Hotel.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+        # Walking back from the last page returns the previous page in order
+        prev_cursor = response.data['pagination']['prev_cursor']
+        response = self.client.get(self.list_url, {'page_size': 4, 'cursor': prev_cursor})
+        self.assertEqual([item['id'] for item in response.data['data']], expected[8:12])
+
+    def test_list_hotels_invalid_cursor(self):
+        """A tampered cursor is rejected"""
+        response = self.client.get(self.list_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_availability_search(self):
+        """Only hotels with enough rooms free on every night of the stay are returned"""
+        busy = Hotel.objects.create(**{**self.hotel_data, 'name': 'Busy Hotel', 'available_rooms': 2})
+        HotelRoomNight.objects.create(hotel=busy, night=date(2026, 6, 2), rooms_booked=2)
+        HotelRoomNight.objects.create(hotel=self.hotel, night=date(2026, 6, 1), rooms_booked=7)
+
+        url = reverse('hotels:hotel-availability')
+        response = self.client.get(url, {'check_in': '2026-06-01', 'check_out': '2026-06-03', 'rooms': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item['id'], item['rooms_left']) for item in response.data['data']],
+            [(self.hotel.id, 3)]
+        )
+
+        # The busy hotel is free again after its full night
+        response = self.client.get(url, {'check_in': '2026-06-03', 'check_out': '2026-06-04', 'rooms': 2})
+        self.assertEqual({item['id'] for item in response.data['data']}, {self.hotel.id, busy.id})
+
+    def test_availability_search_requires_valid_range(self):
+        """A reversed stay is rejected"""
+        url = reverse('hotels:hotel-availability')
+        response = self.client.get(url, {'check_in': '2026-06-03', 'check_out': '2026-06-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_hotels_filters_and_facets(self):
+        """The list filters by price, rating and amenities and returns facet counts"""
+        Hotel.objects.create(**{**self.hotel_data, 'name': 'Budget', 'price_per_night': 40, 'rating': 3.1})
+        Hotel.objects.create(**{**self.hotel_data, 'name': 'Pool', 'price_per_night': 90, 'has_pool': True})
+
+        response = self.client.get(self.list_url, {'max_price': 100, 'amenities': 'wifi,pool'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in response.data['data']], ['Pool'])
+        self.assertEqual(response.data['pagination']['total_items'], 1)
+        self.assertEqual(response.data['facets']['amenities']['pool'], 1)
+
+        response = self.client.get(self.list_url)
+        facets = response.data['facets']
+        self.assertEqual(facets['price'], {'0-50': 1, '50-100': 1, '100-200': 1, '200-500': 0, '500+': 0})
+        self.assertEqual(facets['rating']['3-4'], 1)
+        self.assertEqual(facets['rating']['4+'], 2)
+
+        response = self.client.get(self.list_url, {'amenities': 'sauna'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_hotels_facets_count_negative_values_in_first_bucket(self):
+        """A negative price or rating does not break the facet counts"""
+        Hotel.objects.create(**{**self.hotel_data, 'name': 'Odd', 'price_per_night': -5, 'rating': -1})
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['facets']['price']['0-50'], 1)
+        self.assertEqual(response.data['facets']['rating']['0-1'], 1)
+
+    def test_list_hotels_sorted_by_price_across_pages(self):
+        """Price ordering pages through every hotel once, without database queries"""
+        for price in (300, 120, 120, 80, 500):
+            Hotel.objects.create(**{**self.hotel_data, 'price_per_night': price})
+        self.client.get(self.list_url)
+
+        prices = []
+        params = {'ordering': 'price', 'page_size': 2}
+        with CaptureQueriesContext(connection) as queries:
+            while True:
+                response = self.client.get(self.list_url, params)
+                prices.extend(float(item['price_per_night']) for item in response.data['data'])
+                if not response.data['pagination']['next_cursor']:
+                    break
+                params['cursor'] = response.data['pagination']['next_cursor']
+
+        self.assertEqual(prices, [80, 120, 120, 150, 300, 500])
+        self.assertEqual(len(queries), 0)
+
+    def test_list_hotels_follows_committed_changes(self):
+        """Saves and deletes are patched into the catalog once committed"""
+        self.client.get(self.list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel.name = 'Renamed Hotel'
+            self.hotel.save()
+            Hotel.objects.create(**{**self.hotel_data, 'name': 'New Hotel'})
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(
+            [item['name'] for item in response.data['data']], ['New Hotel', 'Renamed Hotel']
+        )
+        # The changed section is rebuilt once, by the first read
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.list_url)
+        self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel.delete()
+        response = self.client.get(self.list_url)
+        self.assertEqual([item['name'] for item in response.data['data']], ['New Hotel'])
+
+    def test_nearby_hotels(self):
+        """Nearby search returns the closest hotels with their distance"""
+        self.hotel.latitude, self.hotel.longitude = 41.3111, 69.2797  # Tashkent
+        self.hotel.save()
+        close = Hotel.objects.create(**{**self.hotel_data, 'latitude': 41.30, 'longitude': 69.25})
+        Hotel.objects.create(**{**self.hotel_data, 'latitude': 39.6542, 'longitude': 66.9597})  # Samarkand
+
+        url = reverse('hotels:hotel-nearby')
+        response = self.client.get(url, {'lat': 41.3111, 'lng': 69.2797, 'radius_km': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['data']], [self.hotel.id, close.id])
+        self.assertEqual(response.data['data'][0]['distance_km'], 0)
+
+        response = self.client.get(url, {'lat': 41.3111, 'lng': 69.2797, 'limit': 3})
+        self.assertEqual(len(response.data['data']), 3)
+        self.assertEqual(response.data['radius_km'], 500)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nearby_hotels_across_the_antimeridian(self):
+        """Hotels on the other side of ±180 are found"""
+        east = Hotel.objects.create(**{**self.hotel_data, 'latitude': -16.78, 'longitude': 179.33})  # Labasa
+        west = Hotel.objects.create(**{**self.hotel_data, 'latitude': -16.80, 'longitude': -179.97})  # Taveuni
+
+        response = self.client.get(reverse('hotels:hotel-nearby'), {'lat': -16.8, 'lng': 179.98, 'radius_km': 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['data']], [west.id, east.id])
+
+    def test_hotel_map_clusters(self):
+        """Map clusters group hotels per grid cell inside the viewport"""
+        for offset in range(3):
+            Hotel.objects.create(**{**self.hotel_data, 'latitude': 41.30 + offset / 1000, 'longitude': 69.25})
+        lone = Hotel.objects.create(**{**self.hotel_data, 'latitude': 39.6542, 'longitude': 66.9597})
+
+        url = reverse('hotels:hotel-map-clusters')
+        response = self.client.get(url, {'zoom': 6, 'bbox': '60,37,75,46'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        clusters = sorted(response.data['data'], key=lambda cluster: cluster['count'])
+        self.assertEqual([cluster['count'] for cluster in clusters], [1, 3])
+        self.assertEqual(clusters[0]['id'], lone.id)
+        self.assertIsNone(clusters[1]['id'])
+
+        response = self.client.get(url, {'zoom': 6, 'bbox': '75,46,60,37'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,6 +1,9 @@
 from django.urls import path
 from apps.hotels.views.hotel_view import (
     HotelListView,
+    HotelAvailabilityView,
+    HotelNearbyView,
+    HotelMapClusterView,
     HotelDetailView,
     HotelCreateView,
     HotelUpdateView,
@@ -11,6 +14,9 @@ app_name = 'hotels'
 
 urlpatterns = [
     path('', HotelListView.as_view(), name='hotel-list'),
+    path('availability/', HotelAvailabilityView.as_view(), name='hotel-availability'),
+    path('nearby/', HotelNearbyView.as_view(), name='hotel-nearby'),
+    path('map-clusters/', HotelMapClusterView.as_view(), name='hotel-map-clusters'),
     path('<int:pk>/', HotelDetailView.as_view(), name='hotel-detail'),
     path('create/', HotelCreateView.as_view(), name='hotel-create'),
     path('<int:pk>/update/', HotelUpdateView.as_view(), name='hotel-update'),
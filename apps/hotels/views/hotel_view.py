@@ -1,39 +1,150 @@
 
 from rest_framework import generics, permissions
+from rest_framework.exceptions import NotFound
 from apps.hotels.models import Hotel
-from apps.hotels.serializers.hotel_serializer import HotelSerializer, HotelListSerializer
+from apps.hotels.serializers.hotel_serializer import (
+    AvailabilitySearchSerializer,
+    HotelAvailabilitySerializer,
+    HotelCatalogQuerySerializer,
+    HotelListSerializer,
+    HotelSerializer,
+)
+from apps.hotels.services.availability import available_hotels
+from apps.hotels.services.catalog import CatalogQuery, InvalidCatalogCursor, catalog
+from apps.shared.mixins.conditional_mixins import ConditionalGetMixin
+from apps.shared.mixins.fieldset_mixins import SparseFieldsetsMixin
+from apps.shared.mixins.geo_mixins import MapClusterMixin, NearbyListMixin
+from apps.shared.mixins.prerendered_mixins import CatalogSnapshotMixin
+from apps.shared.utils import representations
+from apps.shared.utils.catalog_snapshot import catalog_snapshot
+from apps.shared.utils.custom_pagination import CustomCursorPagination
+from apps.shared.utils.renderers import FastJSONRenderer, RawJSON
+from apps.shared.utils.response_cache import CachedResponseMixin
 from apps.shared.utils.custom_response import CustomResponse
 
 
-class HotelListView(generics.ListAPIView):
+class HotelListView(ConditionalGetMixin, CachedResponseMixin, SparseFieldsetsMixin, generics.ListAPIView):
+    """
+    Filtered, sorted hotel list with facet counts, answered from the columnar
+    catalog in the shared snapshot (apps.hotels.services.catalog) without
+    database queries. Conditional GETs are validated against the snapshot.
+    A sparse fieldset serializes the page's hotels from the narrowed queryset.
+    """
+    cache_tags = ('hotels',)
     queryset = Hotel.objects.filter(is_available=True)
     serializer_class = HotelListSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = CustomCursorPagination
     
+    def get_fingerprint(self):
+        return catalog_snapshot.section('hotels').fingerprint
+
     def list(self, request,  *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
+        params = HotelCatalogQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return CustomResponse.validation_error(
+                request=request,
+                errors=params.errors
+            )
+
+        query = CatalogQuery(
+            **params.validated_data,
+            page_size=self.paginator.get_page_size(request),
+            cursor=request.query_params.get(self.paginator.cursor_query_param),
+        )
+        try:
+            page = catalog.query(query)
+        except InvalidCatalogCursor:
+            raise NotFound(self.paginator.invalid_cursor_message)
+
+        return CustomResponse.prerendered(
+            request=request,
+            data=self.render_sparse_page(page) if self.get_sparse_fields() is not None
+            else RawJSON.array(self.render_page(request, page)),
+            pagination={
+                'next_cursor': page.next_cursor,
+                'prev_cursor': page.prev_cursor,
+                'page_size': len(page.rows),
+                'total_items': page.total,
+                'total_is_estimate': False,
+            },
+            facets=page.facets
+        )
+
+    def render_sparse_page(self, page) -> RawJSON:
+        hotels = self.sparse_queryset(self.get_queryset()).in_bulk(page.ids)
+        data = self.get_serializer([hotels[pk] for pk in page.ids if pk in hotels], many=True).data
+        return RawJSON(FastJSONRenderer().render(data))
+
+    @staticmethod
+    def render_page(request, page):
+        live = [pk for pk, row in zip(page.ids, page.rows) if not row]
+        rendered = representations.render_live(Hotel, live, request, serializer_class=HotelListSerializer) if live else {}
+        return [
+            representations.with_origin(row, request) if row else rendered[pk]
+            for pk, row in zip(page.ids, page.rows)
+            if row or pk in rendered
+        ]
+
+
+
+class HotelAvailabilityView(CachedResponseMixin, generics.ListAPIView):
+    """Hotels with `rooms` rooms free on every night from check_in to check_out."""
+    cache_tags = ('hotels', 'availability')
+    queryset = Hotel.objects.filter(is_available=True)
+    serializer_class = HotelAvailabilitySerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = CustomCursorPagination
+
+    def list(self, request, *args, **kwargs):
+        search = AvailabilitySearchSerializer(data=request.query_params)
+        if not search.is_valid():
+            return CustomResponse.validation_error(
+                request=request,
+                errors=search.errors
+            )
+
+        queryset = available_hotels(self.get_queryset(), **search.validated_data)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
         return CustomResponse.success(
             request=request,
-            data=serializer.data
-        )    
+            data=serializer.data,
+            pagination=self.paginator.get_pagination_meta()
+        )
 
 
 
-class HotelDetailView(generics.RetrieveAPIView):
+class HotelNearbyView(NearbyListMixin, generics.ListAPIView):
+    queryset = Hotel.objects.filter(is_available=True)
+    serializer_class = HotelListSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+
+class HotelMapClusterView(CachedResponseMixin, MapClusterMixin, generics.ListAPIView):
+    cache_tags = ('hotels',)
+    queryset = Hotel.objects.filter(is_available=True)
+    permission_classes = [permissions.AllowAny]
+
+
+
+class HotelDetailView(CatalogSnapshotMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_tags = ('hotels',)
+    snapshot_section = 'hotels'
     queryset = Hotel.objects.filter(is_available=True)
     serializer_class = HotelSerializer
     permission_classes = [permissions.AllowAny]
     
     def retrieve(self, request, *args, **kwargs):
         try:
-            hotel = self.get_object()
+            hotel = self.get_catalog_object()
         except Exception:
             return CustomResponse.not_found(request=request)
         
-        serializer = self.get_serializer(hotel)
-        return CustomResponse.success(
+        return CustomResponse.prerendered(
             request=request,
-            data=serializer.data
+            data=hotel
         )
 
 
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.search'
+
+    def ready(self):
+        from apps.search.services import index
+
+        index.connect_signals()
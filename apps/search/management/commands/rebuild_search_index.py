@@ -0,0 +1,27 @@
+"""
+Django command to rebuild the full-text search index.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.search.services.index import ENTITIES, rebuild
+
+
+class Command(BaseCommand):
+    """Re-create the search documents of every searchable row."""
+    help = "Rebuild the search index for tours, hotels, excursions and blog posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'entities', nargs='*',
+            help=f"Entities to rebuild: {', '.join(ENTITIES)} (default: all)",
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        unknown = set(options['entities']) - set(ENTITIES)
+        if unknown:
+            raise CommandError(f"Not a searchable entity: {', '.join(sorted(unknown))}")
+
+        counts = rebuild(options['entities'] or None, batch_size=options['batch_size'])
+        for name, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f"{name}: {count} documents indexed"))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(max_length=32)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.TextField(blank=True, default='')),
+                ('place', models.TextField(blank=True, default='')),
+                ('body', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'search_documents',
+                'constraints': [models.UniqueConstraint(fields=('entity', 'object_id'), name='search_document_object_unique')],
+            },
+        ),
+    ]
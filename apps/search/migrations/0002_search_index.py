@@ -0,0 +1,74 @@
+from django.db import migrations
+
+# Note: a later migration that makes Django remake search_documents on SQLite
+# (most column changes) drops these triggers; recreate them there.
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE search_fts USING fts5(
+        title, place, body,
+        content='search_documents', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO search_fts(rowid, title, place, body) VALUES (new.id, new.title, new.place, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO search_fts(search_fts, rowid, title, place, body)
+        VALUES ('delete', old.id, old.title, old.place, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO search_fts(search_fts, rowid, title, place, body)
+        VALUES ('delete', old.id, old.title, old.place, old.body);
+        INSERT INTO search_fts(rowid, title, place, body) VALUES (new.id, new.title, new.place, new.body);
+    END
+    """,
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS search_documents_au",
+    "DROP TRIGGER IF EXISTS search_documents_ad",
+    "DROP TRIGGER IF EXISTS search_documents_ai",
+    "DROP TABLE IF EXISTS search_fts",
+]
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE search_documents ADD COLUMN vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A')
+        || setweight(to_tsvector('simple', place), 'B')
+        || setweight(to_tsvector('simple', body), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX search_documents_vector_idx ON search_documents USING GIN (vector)",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS search_documents_vector_idx",
+    "ALTER TABLE search_documents DROP COLUMN IF EXISTS vector",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    """The inverted index over search_documents, per database (apps.search.services.backends)."""
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_INSTALL, 'postgresql': POSTGRES_INSTALL}),
+            _run({'sqlite': SQLITE_UNINSTALL, 'postgresql': POSTGRES_UNINSTALL}),
+        ),
+    ]
@@ -0,0 +1 @@
+from .search_document import SearchDocument
@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    The searchable text of one catalog row or blog post, in three weighted
+    columns, kept current by apps.search.services.index.
+
+    The inverted index over this table lives outside the model: an FTS5
+    table fed by triggers on SQLite, a generated tsvector column with a GIN
+    index on PostgreSQL (migration 0002).
+    """
+    entity = models.CharField(max_length=32)
+    object_id = models.PositiveBigIntegerField()
+    title = models.TextField(blank=True, default='')
+    # Destination or location
+    place = models.TextField(blank=True, default='')
+    # Description or content, as plain text
+    body = models.TextField(blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_documents'
+        constraints = [
+            models.UniqueConstraint(fields=['entity', 'object_id'], name='search_document_object_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} #{self.object_id}"
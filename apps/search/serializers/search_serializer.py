@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+from apps.search.services.index import ENTITIES
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Query parameters of the search endpoint"""
+    q = serializers.CharField(max_length=200)
+    type = serializers.CharField(required=False, help_text="Comma-separated: tours, hotels, excursions, blogs")
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+    offset = serializers.IntegerField(min_value=0, max_value=1000, default=0)
+
+    def validate_type(self, value):
+        names = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in names if name not in ENTITIES]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown types: {', '.join(unknown)}. Choose from: {', '.join(ENTITIES)}."
+            )
+        return names
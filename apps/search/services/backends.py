@@ -0,0 +1,108 @@
+"""
+Database specific querying of the search index.
+
+SQLite: the FTS5 table search_fts, an external-content index over
+search_documents fed by triggers, ranked with bm25() weighting the title,
+place and body columns.
+
+PostgreSQL: the generated search_documents.vector column (title, place and
+body weighted A, B and C) with a GIN index, ranked with ts_rank_cd().
+PostgreSQL has no BM25; ts_rank_cd with length normalization is the closest
+built-in ranking. The 'simple' configuration is used, since the catalog
+mixes Uzbek, Russian and English text that no single stemmer fits.
+
+Other databases fall back to unranked substring matching.
+
+A query is split into words; every word must match, and the last one also
+matches as a prefix, so results follow the user while they type.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from django.db import connection
+from django.db.models import Q
+
+from apps.search.models import SearchDocument
+
+MAX_TERMS = 10
+_WORD = re.compile(r'\w+')
+
+
+@dataclass(frozen=True)
+class Hit:
+    entity: str
+    object_id: int
+    # Higher is better
+    score: float
+
+
+def query_terms(text: str) -> List[str]:
+    return [word.lower() for word in _WORD.findall(text or '')][:MAX_TERMS]
+
+
+class SQLiteBackend:
+    # bm25() weights of the title, place and body columns
+    weights = (10.0, 5.0, 1.0)
+
+    def search(self, terms: Sequence[str], entities: Sequence[str], limit: int, offset: int) -> List[Hit]:
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        placeholders = ', '.join(['%s'] * len(entities))
+        sql = (
+            f"SELECT d.entity, d.object_id, bm25(search_fts, {', '.join(map(str, self.weights))}) AS rank "
+            "FROM search_fts JOIN search_documents d ON d.id = search_fts.rowid "
+            f"WHERE search_fts MATCH %s AND d.entity IN ({placeholders}) "
+            "ORDER BY rank, d.id LIMIT %s OFFSET %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [match, *entities, limit, offset])
+            # bm25() is lower for better matches
+            return [Hit(entity, object_id, -rank) for entity, object_id, rank in cursor.fetchall()]
+
+    def optimize(self):
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO search_fts(search_fts) VALUES ('rebuild')")
+            cursor.execute("INSERT INTO search_fts(search_fts) VALUES ('optimize')")
+
+
+class PostgresBackend:
+
+    def search(self, terms: Sequence[str], entities: Sequence[str], limit: int, offset: int) -> List[Hit]:
+        query = ' & '.join([*terms[:-1], f'{terms[-1]}:*'])
+        sql = (
+            "SELECT entity, object_id, ts_rank_cd(vector, query, 1) AS rank "
+            "FROM search_documents, to_tsquery('simple', %s) query "
+            "WHERE vector @@ query AND entity = ANY(%s) "
+            "ORDER BY rank DESC, id LIMIT %s OFFSET %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [query, list(entities), limit, offset])
+            return [Hit(entity, object_id, rank) for entity, object_id, rank in cursor.fetchall()]
+
+    def optimize(self):
+        # The generated column and its GIN index are maintained by PostgreSQL
+        pass
+
+
+class SubstringBackend:
+
+    def search(self, terms: Sequence[str], entities: Sequence[str], limit: int, offset: int) -> List[Hit]:
+        documents = SearchDocument.objects.filter(entity__in=entities)
+        for term in terms:
+            documents = documents.filter(
+                Q(title__icontains=term) | Q(place__icontains=term) | Q(body__icontains=term)
+            )
+        rows = documents.order_by('id').values_list('entity', 'object_id')[offset:offset + limit]
+        return [Hit(entity, object_id, 0.0) for entity, object_id in rows]
+
+    def optimize(self):
+        pass
+
+
+def get_backend():
+    if connection.vendor == 'sqlite':
+        return SQLiteBackend()
+    if connection.vendor == 'postgresql':
+        return PostgresBackend()
+    return SubstringBackend()
@@ -0,0 +1,144 @@
+"""
+Full-text search over tours, hotels, excursions and blog posts.
+
+Every visible row of the ENTITIES models has one SearchDocument holding its
+text: title, place (destination or location) and body (description or
+content, with tags stripped). post_save and post_delete keep the documents
+current in the same transaction as the change, and a row that is hidden
+loses its document. rebuild() re-creates them in batches, e.g. after rows
+were changed with queryset updates, which send no signals.
+
+Queries run against the database's own inverted index
+(apps.search.services.backends).
+"""
+
+from dataclasses import dataclass
+from html import unescape
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.html import strip_tags
+
+from apps.search.models import SearchDocument
+from apps.search.services.backends import Hit, get_backend, query_terms
+
+
+@dataclass(frozen=True)
+class SearchEntity:
+    model: str
+    title: str
+    place: Optional[str]
+    body: str
+    # Filter selecting the rows that are searchable
+    filters: Dict[str, Any]
+    # Serializer of the results
+    serializer: str
+
+    @property
+    def fields(self):
+        return tuple(name for name in (self.title, self.place, self.body) if name)
+
+
+ENTITIES = {
+    'tours': SearchEntity(
+        'tours.Tour', 'title', 'destination', 'description', {'status': True},
+        'apps.tours.serializers.tour_serializer.TourSerializer',
+    ),
+    'hotels': SearchEntity(
+        'hotels.Hotel', 'name', 'location', 'description', {'is_available': True},
+        'apps.hotels.serializers.hotel_serializer.HotelListSerializer',
+    ),
+    'excursions': SearchEntity(
+        'excursions.Excursion', 'title', 'location', 'description', {'is_available': True},
+        'apps.excursions.serializers.excursion_serializer.ExcursionSerializer',
+    ),
+    'blogs': SearchEntity(
+        'blog.BlogPost', 'title', None, 'content', {'is_published': True},
+        'apps.blog.serializers.blog_serializer.BlogPostCardSerializer',
+    ),
+}
+
+
+def _text(value) -> str:
+    return ' '.join(unescape(strip_tags(str(value or ''))).split())
+
+
+def _is_searchable(entity: SearchEntity, instance) -> bool:
+    return all(getattr(instance, key) == value for key, value in entity.filters.items())
+
+
+def document_values(entity: SearchEntity, instance) -> Dict[str, str]:
+    return {
+        'title': _text(getattr(instance, entity.title)),
+        'place': _text(getattr(instance, entity.place)) if entity.place else '',
+        'body': _text(getattr(instance, entity.body)),
+    }
+
+
+def search(text: str, entities: Sequence[str] = None, limit: int = 20, offset: int = 0) -> List[Hit]:
+    """Documents matching every word of `text`, best first."""
+    terms = query_terms(text)
+    if not terms:
+        return []
+    return get_backend().search(terms, list(entities or ENTITIES), limit, offset)
+
+
+def rebuild(names: Iterable[str] = None, batch_size: int = 500) -> Dict[str, int]:
+    """Re-create the documents of the given entities; returns the count per entity."""
+    counts = {}
+    for name in names or ENTITIES:
+        entity = ENTITIES[name]
+        model = apps.get_model(entity.model)
+        rows = (
+            model._default_manager.filter(**entity.filters)
+            .order_by('pk')
+            .only('pk', *entity.fields)
+            .iterator(chunk_size=batch_size)
+        )
+        counts[name] = 0
+        with transaction.atomic():
+            SearchDocument.objects.filter(entity=name).delete()
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                SearchDocument.objects.bulk_create([
+                    SearchDocument(entity=name, object_id=instance.pk, **document_values(entity, instance))
+                    for instance in batch
+                ])
+                counts[name] += len(batch)
+    get_backend().optimize()
+    return counts
+
+
+# Signals
+
+_ENTITY_NAMES = {}
+
+
+def _index_instance(sender, instance, update_fields=None, raw=False, **kwargs):
+    name = _ENTITY_NAMES[sender]
+    entity = ENTITIES[name]
+    if raw or (update_fields is not None and not set(update_fields) & {*entity.fields, *entity.filters}):
+        return
+    if _is_searchable(entity, instance):
+        SearchDocument.objects.update_or_create(
+            entity=name, object_id=instance.pk, defaults=document_values(entity, instance)
+        )
+    else:
+        SearchDocument.objects.filter(entity=name, object_id=instance.pk).delete()
+
+
+def _unindex_instance(sender, instance, **kwargs):
+    SearchDocument.objects.filter(entity=_ENTITY_NAMES[sender], object_id=instance.pk).delete()
+
+
+def connect_signals():
+    for name, entity in ENTITIES.items():
+        model = apps.get_model(entity.model)
+        _ENTITY_NAMES[model] = name
+        post_save.connect(_index_instance, sender=model, dispatch_uid=f'search-index-{name}')
+        post_delete.connect(_unindex_instance, sender=model, dispatch_uid=f'search-unindex-{name}')
@@ -0,0 +1,75 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.blog.models.blogs import BlogPost
+from apps.hotels.models.hotels import Hotel
+from apps.search.models import SearchDocument
+from apps.search.services.index import search
+from apps.tours.models.tours import Tour
+from apps.users.models.user_auth import User
+
+
+class SearchTests(APITestCase):
+
+    def setUp(self):
+        self.url = reverse('search:search')
+        self.hotel = Hotel.objects.create(
+            name='Registan Palace', location='Samarkand', price_per_night=100,
+            description='Rooms facing the old squares',
+        )
+        self.tour = Tour.objects.create(
+            title='Silk Road classic', destination='Samarkand', duration_days=5, price=1000, capacity=10,
+            description='Madrasahs and bazaars of Samarkand and Bukhara',
+        )
+        author = User.objects.create_user(username='author', email='author@example.com', password='Pass12345!')
+        self.post = BlogPost.objects.create(
+            title='Packing for Bukhara', content='<p>Light clothes &amp; a scarf.</p>', author=author,
+            is_published=True,
+        )
+
+    def test_title_matches_rank_first_across_entities(self):
+        """A word in the title outranks the same word in a description"""
+        response = self.client.get(self.url, {'q': 'bukhara'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = [(item['type'], item['id']) for item in response.data['data']]
+        self.assertEqual(results, [('blogs', self.post.pk), ('tours', self.tour.pk)])
+        self.assertEqual(response.data['data'][1]['data']['title'], 'Silk Road classic')
+
+    def test_every_word_must_match_and_last_is_a_prefix(self):
+        """Multi-word queries narrow the results; the last word matches while typing"""
+        self.assertEqual([hit.object_id for hit in search('samarkand regis')], [self.hotel.pk])
+        self.assertEqual({hit.entity for hit in search('samarkand')}, {'hotels', 'tours'})
+        self.assertEqual([hit.entity for hit in search('samarkand', entities=['tours'])], ['tours'])
+        self.assertEqual(search('"*)('), [])
+
+    def test_index_follows_saves_hides_and_deletes(self):
+        """Signals keep the index current"""
+        self.tour.title = 'Khiva walls'
+        self.tour.save()
+        self.assertEqual([hit.entity for hit in search('khiva')], ['tours'])
+
+        self.tour.status = False
+        self.tour.save()
+        self.assertEqual(search('khiva'), [])
+
+        self.hotel.delete()
+        self.assertFalse(SearchDocument.objects.filter(entity='hotels').exists())
+        self.assertEqual(search('registan'), [])
+
+    def test_rebuild_command(self):
+        """The index is re-created from the catalog"""
+        SearchDocument.objects.all().delete()
+        Hotel.objects.filter(pk=self.hotel.pk).update(name='Amir Temur Hotel')
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('hotels: 1 documents indexed', out.getvalue())
+        self.assertEqual([hit.object_id for hit in search('temur')], [self.hotel.pk])
+
+    def test_invalid_type(self):
+        response = self.client.get(self.url, {'q': 'samarkand', 'type': 'cars'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.search.views.search_view import SearchView
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', SearchView.as_view(), name='search'),
+]
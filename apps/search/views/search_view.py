@@ -0,0 +1,69 @@
+from django.apps import apps
+from django.utils.module_loading import import_string
+from rest_framework import generics, permissions
+
+from apps.search.serializers.search_serializer import SearchQuerySerializer
+from apps.search.services.index import ENTITIES, search
+from apps.shared.utils import representations
+from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.renderers import RawJSON, render_with_raw
+from apps.shared.utils.response_cache import CachedResponseMixin
+
+
+class SearchView(CachedResponseMixin, generics.ListAPIView):
+    """
+    Full-text search over tours, hotels, excursions and blog posts
+    (apps.search.services.index).
+
+    ?q= matches every word, the last one also as a prefix; ?type= narrows
+    the entities. Results are ranked best first, each with its type, id,
+    score and the object as the entity's list endpoints render it.
+    """
+    cache_tags = ('tours', 'hotels', 'excursions', 'blogs')
+    permission_classes = [permissions.AllowAny]
+
+    def list(self, request, *args, **kwargs):
+        params = SearchQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return CustomResponse.validation_error(
+                request=request,
+                errors=params.errors
+            )
+
+        limit, offset = params.validated_data['limit'], params.validated_data['offset']
+        # One extra hit tells us whether another page exists
+        hits = search(
+            params.validated_data['q'], params.validated_data.get('type'), limit=limit + 1, offset=offset
+        )
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+
+        payloads = {}
+        for name in {hit.entity for hit in hits}:
+            entity = ENTITIES[name]
+            rendered = representations.render_live(
+                apps.get_model(entity.model),
+                [hit.object_id for hit in hits if hit.entity == name],
+                request,
+                serializer_class=import_string(entity.serializer),
+            )
+            payloads.update({(name, pk): payload for pk, payload in rendered.items()})
+
+        results = [
+            render_with_raw({
+                'type': hit.entity,
+                'id': hit.object_id,
+                'score': hit.score,
+                'data': RawJSON(payloads[hit.entity, hit.object_id]),
+            })
+            for hit in hits if (hit.entity, hit.object_id) in payloads
+        ]
+        return CustomResponse.prerendered(
+            request=request,
+            data=RawJSON.array(results),
+            pagination={
+                'limit': limit,
+                'offset': offset,
+                'next_offset': offset + limit if has_more else None,
+            }
+        )
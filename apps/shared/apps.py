@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class SharedConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.shared'
+
+    def ready(self):
+        from apps.shared.utils import catalog_snapshot, representations, response_cache
+
+        response_cache.check_shared_cache()
+        response_cache.connect_signals()
+        representations.connect_signals()
+        catalog_snapshot.connect_signals()
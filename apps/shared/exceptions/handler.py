@@ -1,3 +1,4 @@
+import os
 import traceback
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
@@ -6,6 +7,20 @@ from apps.shared.exceptions.custom_exceptions import CustomException
 from apps.shared.utils.custom_response import CustomResponse
 from apps.shared.utils.custom_current_host import get_client_ip
 
+def get_route(request):
+    """The URL pattern the request was resolved with, e.g. 'api/v1/hotels/<int:pk>/'."""
+    resolver_match = getattr(request, 'resolver_match', None) if request else None
+    return getattr(resolver_match, 'route', None)
+
+
+def get_location(exc):
+    """File and line the exception was raised at."""
+    frames = traceback.extract_tb(exc.__traceback__)
+    if not frames:
+        return 'unknown'
+    return f"{os.path.basename(frames[-1].filename)}:{frames[-1].lineno}"
+
+
 def custom_exception_handler(exc, context):
     """
     Handles all exceptions in DRF, sends alerts to Telegram,
@@ -21,6 +36,10 @@ def custom_exception_handler(exc, context):
     client_ip = get_client_ip(request) if request else 'unknown'
     port = request.META.get('REMOTE_PORT', 'unknown') if request else 'unknown'
 
+    # Repeats of the same failure are aggregated into one digest line: keyed on
+    # the URL pattern, not the path, so /hotels/1/ and /hotels/2/ are one failure
+    fingerprint = (view_name, get_route(request) or path, type(exc).__name__, get_location(exc))
+
     # Full traceback
     tb = traceback.format_exc()
     tb = tb[-2000:] if tb else "No traceback available"
@@ -37,7 +56,7 @@ def custom_exception_handler(exc, context):
         message += f"<b>CustomException Message:</b> {exc.message_key}\n"
         if exc.context:
             message += f"<b>Context:</b> {exc.context}\n"
-        send_alert(message)
+        send_alert(message, fingerprint=fingerprint)
         return CustomResponse.error(message_key=exc.message_key, request=request, context=exc.context)
 
     # Call default DRF handler first
@@ -47,9 +66,10 @@ def custom_exception_handler(exc, context):
     if response is None:
         message += f"<b>Exception:</b> {str(exc)}\n"
         message += f"<b>Traceback:</b> {tb}\n"
-        send_alert(message)
+        send_alert(message, fingerprint=fingerprint)
         return CustomResponse.error(message_key="UNKNOWN_ERROR", request=request, context={'exc': str(exc)})
 
-    # For DRF-handled exceptions, optionally alert (comment if too noisy)
-    send_alert(message + f"<b>DRF Exception:</b> {str(exc)}")
+    # Routine client errors (400, 401, 403, 404, ...) are not alerted
+    if response.status_code >= 500:
+        send_alert(message + f"<b>DRF Exception:</b> {str(exc)}", fingerprint=fingerprint)
     return response
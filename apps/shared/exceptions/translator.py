@@ -1,10 +1,15 @@
 import logging
-from typing import TypedDict, Any, Dict
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import TypedDict, Any, Dict, FrozenSet
 
 from apps.shared.messages import MESSAGES, MessageTemplate
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_LANGUAGE = "en"
+
 
 class MessageDetail(TypedDict):
     """Structure for formatted message details"""
@@ -13,17 +18,131 @@ class MessageDetail(TypedDict):
     status_code: int
 
 
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A message template parsed once, at import time"""
+    text: str
+    has_fields: bool
+
+    @classmethod
+    def compile(cls, template: str) -> "CompiledTemplate":
+        has_fields = any(field is not None for _, field, _, _ in Formatter().parse(template))
+        # Templates without placeholders are pre-rendered (this also unescapes "{{ }}")
+        return cls(text=template if has_fields else template.format(), has_fields=has_fields)
+
+    def render(self, context: Dict[str, Any], message_key: str, lang: str) -> str:
+        if not self.has_fields:
+            return self.text
+
+        try:
+            return self.text.format(**context)
+        except (KeyError, ValueError, IndexError) as e:
+            logger.warning(
+                f"Message formatting failed - "
+                f"key: {message_key}, lang: {lang}, "
+                f"error: {e}, context: {context}"
+            )
+            return self.text
+
+
+@dataclass(frozen=True)
+class CompiledMessage:
+    """A message with its per-language templates"""
+    id: str
+    status_code: int
+    templates: Dict[str, CompiledTemplate]
+    fallback: CompiledTemplate
+
+    def template_for(self, lang: str) -> CompiledTemplate:
+        template = self.templates.get(lang)
+        if template is None:
+            # Language fallback chain: exact -> base language -> English
+            base_lang = lang.split('-')[0].split('_')[0]
+            template = self.templates.get(base_lang, self.fallback)
+        return template
+
+
+def _compile_messages(messages: Dict[str, MessageTemplate]) -> Dict[str, CompiledMessage]:
+    compiled = {}
+    for key, message in messages.items():
+        templates = {
+            lang: CompiledTemplate.compile(text)
+            for lang, text in message["messages"].items()
+        }
+        compiled[key] = CompiledMessage(
+            id=message["id"],
+            status_code=message["status_code"],
+            templates=templates,
+            fallback=templates.get(DEFAULT_LANGUAGE) or CompiledTemplate.compile("Error occurred"),
+        )
+    return compiled
+
+
+COMPILED_MESSAGES: Dict[str, CompiledMessage] = _compile_messages(MESSAGES)
+
+SUPPORTED_LANGUAGES: FrozenSet[str] = frozenset(
+    lang for message in COMPILED_MESSAGES.values() for lang in message.templates
+)
+
+
+@lru_cache(maxsize=512)
+def negotiate_language(accept_language: str | None) -> str:
+    """
+    Pick the best supported message language for an Accept-Language header.
+
+    Honours q-values and falls back from a regional tag to its base language.
+    Results are memoized per header value.
+
+    Examples:
+        'en-US,en;q=0.9' -> 'en'
+        'ru;q=0.5, uz' -> 'uz'
+        'de' -> 'en'
+    """
+    if not accept_language:
+        return DEFAULT_LANGUAGE
+
+    candidates = []
+    for position, part in enumerate(accept_language.split(',')):
+        tag, _, params = part.strip().partition(';')
+        tag = tag.strip().lower().replace('_', '-')
+        if not tag:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality <= 0:
+            continue
+
+        candidates.append((-quality, position, tag))
+
+    for _, _, tag in sorted(candidates):
+        if tag == '*':
+            return DEFAULT_LANGUAGE
+        if tag in SUPPORTED_LANGUAGES:
+            return tag
+        base_lang = tag.split('-')[0]
+        if base_lang in SUPPORTED_LANGUAGES:
+            return base_lang
+
+    return DEFAULT_LANGUAGE
+
+
 def get_message_detail(
         message_key: str,
         lang: str = "en",
         context: Dict[str, Any] | None = None
 ) -> MessageDetail:
-    # Get message template with fallback
-    message = MESSAGES.get(message_key)
+    # Get compiled message with fallback
+    message = COMPILED_MESSAGES.get(message_key)
 
     if not message:
         logger.warning(f"Message key not found: {message_key}")
-        message = MESSAGES.get('UNKNOWN_ERROR')
+        message = COMPILED_MESSAGES.get('UNKNOWN_ERROR')
 
         if not message:
             logger.error("UNKNOWN_ERROR message not found in MESSAGES dictionary")
@@ -33,32 +152,12 @@ def get_message_detail(
                 "status_code": 500
             }
 
-    context = context or {}
-    messages_dict = message["messages"]
-
-    # Language fallback chain
-    base_lang = lang.split('-')[0].split('_')[0]
-    template = (
-            messages_dict.get(lang)
-            or messages_dict.get(base_lang)
-            or messages_dict.get("en", "Error occurred")
-    )
-
-    # Format message
-    try:
-        formatted_message: str = template.format(**context)
-    except (KeyError, ValueError) as e:
-        logger.warning(
-            f"Message formatting failed - "
-            f"key: {message_key}, lang: {lang}, "
-            f"error: {e}, context: {context}"
-        )
-        formatted_message = template
+    template = message.template_for(lang)
 
     return {
-        "id": message["id"],
-        "message": formatted_message,
-        "status_code": message["status_code"]
+        "id": message.id,
+        "message": template.render(context or {}, message_key, lang),
+        "status_code": message.status_code
     }
 
 
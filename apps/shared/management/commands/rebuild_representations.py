@@ -0,0 +1,48 @@
+"""
+Django command to re-render the pre-rendered representation store.
+"""
+from itertools import islice
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.shared.models import RenderedRepresentation
+from apps.shared.utils import representations
+
+
+class Command(BaseCommand):
+    """Render and store the JSON of every registered catalog object."""
+    help = "Rebuild pre-rendered JSON for hotels, tours, excursions and blog posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*',
+            help="Model labels to rebuild, e.g. tours.Tour (default: all registered models)",
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        labels = options['models'] or list(representations.REPRESENTATIONS)
+        unknown = set(labels) - set(representations.REPRESENTATIONS)
+        if unknown:
+            raise CommandError(f"Not a pre-rendered model: {', '.join(sorted(unknown))}")
+
+        for label in labels:
+            model = apps.get_model(label)
+            objects = model._default_manager.order_by('pk').iterator(chunk_size=options['batch_size'])
+            rendered = 0
+            while True:
+                batch = list(islice(objects, options['batch_size']))
+                if not batch:
+                    break
+                rendered += len(batch)
+                representations.refresh(model, batch)
+
+            orphaned, _ = RenderedRepresentation.objects.filter(
+                content_type=ContentType.objects.get_for_model(model)
+            ).exclude(object_id__in=model._default_manager.values('pk')).delete()
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{label}: {rendered} objects rendered, {orphaned} stale payloads removed"
+            ))
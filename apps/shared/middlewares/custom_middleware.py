@@ -1,6 +1,6 @@
 from apps.shared.exceptions.custom_exceptions import CustomException
-from apps.users.models.device import Device
 from apps.shared.models import Language
+from apps.shared.utils.device_session import get_device_session
 
 class DeviceAndLanguageMiddleware:
 
@@ -13,12 +13,12 @@ class DeviceAndLanguageMiddleware:
         if device_token:
            
             request.device_type = "MOBILE"
-            try:
-                device = Device.objects.get(device_token=device_token)
-                
-                request.lang = request.headers.get("Accept-Language") or device.language or Language.UZ
-            except Device.DoesNotExist:
+            device = get_device_session(device_token, request)
+            if device is None:
                 raise CustomException(message_key="NOT_FOUND")
+
+            request.device_session = device
+            request.lang = request.headers.get("Accept-Language") or device.language or Language.UZ
         else:
            
             request.device_type = "WEB"
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('shared', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderedRepresentation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('language', models.CharField(blank=True, default='', max_length=3)),
+                ('payload', models.BinaryField()),
+                ('source_updated_at', models.DateTimeField()),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'db_table': 'rendered_representations',
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id', 'language'), name='unique_rendered_representation')],
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from apps.shared.utils.response_cache import FINGERPRINT_KEY_PREFIX, build_cache_key, get_cache, request_variant
+
+Fingerprint = Tuple[Optional[datetime], int]
+
+
+class ConditionalGetMixin:
+    """
+    Answers conditional GETs (If-None-Match, If-Modified-Since) of a list or
+    detail view with 304 Not Modified before anything is serialized.
+
+    The validators come from get_fingerprint(): the object's updated_at for
+    a detail view, and (max(updated_at), count) of the filtered queryset for
+    a list. The ETag covers the fingerprint and the request variant (query,
+    language, device, media type); Last-Modified is only sent for details,
+    since deleting a list row does not move its max(updated_at).
+
+    With `cache_tags` set (CachedResponseMixin) the fingerprint is kept in the
+    response cache under the same tag versions as the response, so while
+    nothing changes neither a 304 nor a cache hit queries the database.
+
+    List it before CachedResponseMixin, so a 304 skips the cache lookup too.
+    The request's fingerprint stays on the view as `fingerprint`, so a list
+    can reuse its count instead of counting again.
+    """
+    fingerprint: Optional[Fingerprint] = None
+
+    def is_detail(self) -> bool:
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def get_fingerprint(self) -> Optional[Fingerprint]:
+        """None when there is nothing to validate against, e.g. a missing object."""
+        tags = getattr(self, 'cache_tags', ())
+        if not tags:
+            return self.query_fingerprint()
+
+        cache = get_cache()
+        key = build_cache_key(self.request, tags, prefix=FINGERPRINT_KEY_PREFIX)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached['fingerprint']
+        fingerprint = self.query_fingerprint()
+        cache.set(key, {'fingerprint': fingerprint}, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+        return fingerprint
+
+    def query_fingerprint(self) -> Optional[Fingerprint]:
+        """get_fingerprint() read from the database."""
+        queryset = self.filter_queryset(self.get_queryset())
+        if not self.is_detail():
+            aggregate = queryset.order_by().aggregate(updated=Max('updated_at'), count=Count('pk'))
+            return aggregate['updated'], aggregate['count']
+
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            updated = queryset.filter(**{self.lookup_field: lookup}).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError, ValidationError):
+            return None
+        return None if updated is None else (updated, 1)
+
+    def get_etag(self, fingerprint: Fingerprint) -> str:
+        updated, count = fingerprint
+        parts = [
+            *request_variant(self.request),
+            str(getattr(self.request, 'accepted_media_type', '')),
+            updated.isoformat() if updated else '',
+            str(count),
+        ]
+        return 'W/"%s"' % hashlib.sha256('\n'.join(parts).encode()).hexdigest()[:32]
+
+    def get(self, request, *args, **kwargs):
+        self.fingerprint = fingerprint = self.get_fingerprint()
+        if fingerprint is None:
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag(fingerprint)
+        updated = fingerprint[0]
+        # HTTP dates have whole seconds
+        last_modified = int(updated.timestamp()) if updated and self.is_detail() else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
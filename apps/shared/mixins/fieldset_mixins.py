@@ -0,0 +1,107 @@
+from typing import Dict, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.shortcuts import get_object_or_404
+from rest_framework import serializers
+
+_UNSET = object()
+
+
+def _names(value: Optional[str]) -> Tuple[str, ...]:
+    return tuple(name.strip() for name in (value or '').split(',') if name.strip())
+
+
+class SparseFieldsetsMixin:
+    """
+    ?fields=a,b and ?exclude=c on list and detail views.
+
+    The view's serializer returns only the chosen fields, and
+    sparse_queryset() defers the model columns that only dropped fields
+    read, so large TextFields are not loaded unless asked for.
+    `default_exclude` names fields left out unless ?fields= lists them.
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+    default_exclude = ()
+
+    def get_readable_fields(self) -> Dict[str, serializers.Field]:
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        return {name: field for name, field in serializer.fields.items() if not field.write_only}
+
+    def get_sparse_fields(self) -> Optional[Tuple[str, ...]]:
+        """Names of the fields to return, in serializer order, or None for all of them."""
+        cached = getattr(self, '_sparse_fields', _UNSET)
+        if cached is not _UNSET:
+            return cached
+
+        params = self.request.query_params
+        fields = _names(params.get(self.fields_query_param))
+        exclude = _names(params.get(self.exclude_query_param))
+        if not fields:
+            exclude += tuple(self.default_exclude)
+
+        sparse = None
+        if fields or exclude:
+            readable = self.get_readable_fields()
+            errors = {}
+            for param, names in ((self.fields_query_param, fields), (self.exclude_query_param, exclude)):
+                unknown = [name for name in names if name not in readable]
+                if unknown:
+                    errors[param] = [f"Unknown field(s): {', '.join(unknown)}."]
+            if errors:
+                raise serializers.ValidationError(errors)
+            sparse = tuple(name for name in readable if (not fields or name in fields) and name not in exclude)
+
+        self._sparse_fields = sparse
+        return sparse
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Reject unknown names up front, before views that turn errors into a 404
+        self.get_sparse_fields()
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in [name for name, field in target.fields.items() if not field.write_only]:
+                if name not in fields:
+                    target.fields.pop(name)
+        return serializer
+
+    def sparse_queryset(self, queryset):
+        """The queryset with the columns of dropped fields deferred."""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+
+        readable = self.get_readable_fields()
+        kept = {readable[name].source_attrs[0] for name in fields if readable[name].source_attrs}
+        ordering_field = getattr(getattr(self, 'paginator', None), 'ordering_field', None)
+        deferred = []
+        for name, field in readable.items():
+            if name in fields or len(field.source_attrs) != 1:
+                continue
+            source = field.source_attrs[0]
+            try:
+                model_field = queryset.model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if (
+                model_field.concrete and not model_field.many_to_many and not model_field.primary_key
+                and source not in kept and source != ordering_field
+            ):
+                deferred.append(model_field.name)
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def serialize_sparse_page(self, queryset):
+        page = self.paginate_queryset(self.sparse_queryset(queryset))
+        return self.get_serializer(page, many=True).data
+
+    def serialize_sparse_object(self):
+        queryset = self.sparse_queryset(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        instance = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, instance)
+        return self.get_serializer(instance).data
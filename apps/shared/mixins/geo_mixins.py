@@ -0,0 +1,116 @@
+from rest_framework import serializers
+
+from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.device_session import get_device_session
+from apps.shared.utils.geo import (
+    MAX_RADIUS_KM,
+    cluster_markers,
+    coordinates_from_location,
+    find_nearby,
+    zoom_to_precision,
+)
+
+
+class NearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    lng = serializers.FloatField(min_value=-180, max_value=180, required=False)
+    radius_km = serializers.FloatField(min_value=0.1, max_value=MAX_RADIUS_KM, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate(self, data):
+        if ('lat' in data) != ('lng' in data):
+            raise serializers.ValidationError("lat and lng must be given together.")
+        return data
+
+
+class MapClusterQuerySerializer(serializers.Serializer):
+    zoom = serializers.IntegerField(min_value=0, max_value=20)
+    bbox = serializers.CharField(help_text="min_lng,min_lat,max_lng,max_lat")
+
+    def validate_bbox(self, value):
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(part) for part in value.split(','))
+        except ValueError:
+            raise serializers.ValidationError("Expected min_lng,min_lat,max_lng,max_lat.")
+
+        if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+            raise serializers.ValidationError("Bounding box is out of range or inverted.")
+        return min_lat, min_lng, max_lat, max_lng
+
+
+class NearbyListMixin:
+    """
+    ListAPIView mixin returning the items nearest to ?lat=&lng=, optionally
+    within ?radius_km=, each with its distance_km. Without coordinates the
+    visit_location of the requesting device (Device-Token header) is used.
+    """
+
+    def get_device_coordinates(self, request):
+        from apps.users.models import Device
+
+        device_token = request.headers.get('Device-Token') or request.headers.get('device_token')
+        session = get_device_session(device_token, request=request)
+        if session is None or not session.is_active:
+            return None
+
+        location = Device.objects.filter(pk=session.id).values_list('visit_location', flat=True).first()
+        return coordinates_from_location(location)
+
+    def list(self, request, *args, **kwargs):
+        params = NearbyQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return CustomResponse.validation_error(request=request, errors=params.errors)
+        query = params.validated_data
+
+        if 'lat' in query:
+            origin = (query['lat'], query['lng'])
+        else:
+            origin = self.get_device_coordinates(request)
+            if origin is None:
+                return CustomResponse.validation_error(
+                    request=request,
+                    errors={'lat': ["lat and lng are required when the device has no visit location."]}
+                )
+
+        results, radius = find_nearby(
+            self.filter_queryset(self.get_queryset()),
+            *origin,
+            radius_km=query.get('radius_km'),
+            limit=query['limit'],
+        )
+        serializer = self.get_serializer([obj for _, obj in results], many=True)
+        data = [
+            {**item, 'distance_km': round(distance, 3)}
+            for item, (distance, _) in zip(serializer.data, results)
+        ]
+        return CustomResponse.success(
+            request=request,
+            data=data,
+            origin={'latitude': origin[0], 'longitude': origin[1]},
+            radius_km=radius
+        )
+
+
+class MapClusterMixin:
+    """
+    ListAPIView mixin returning marker clusters for a map viewport:
+    ?zoom=0..20&bbox=min_lng,min_lat,max_lng,max_lat.
+    """
+
+    def list(self, request, *args, **kwargs):
+        params = MapClusterQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return CustomResponse.validation_error(request=request, errors=params.errors)
+
+        zoom = params.validated_data['zoom']
+        clusters = cluster_markers(
+            self.filter_queryset(self.get_queryset()),
+            params.validated_data['bbox'],
+            zoom,
+        )
+        return CustomResponse.success(
+            request=request,
+            data=clusters,
+            zoom=zoom,
+            precision=zoom_to_precision(zoom)
+        )
@@ -0,0 +1,26 @@
+from django.utils.cache import patch_vary_headers
+from rest_framework.settings import api_settings
+
+from apps.shared.utils.parsers import MessagePackParser
+from apps.shared.utils.renderers import MessagePackRenderer, msgpack
+
+# Offered after the defaults, so JSON stays the answer to Accept: */*
+_MSGPACK_RENDERERS = [MessagePackRenderer] if msgpack is not None else []
+_MSGPACK_PARSERS = [MessagePackParser] if msgpack is not None else []
+
+
+class MessagePackMixin:
+    """
+    Lets an API view speak MessagePack as well as JSON.
+
+    Responses are MessagePack when the client's Accept header asks for
+    application/msgpack, and request bodies sent as application/msgpack are
+    parsed. Used by the v2 (mobile) API.
+    """
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *_MSGPACK_RENDERERS]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, *_MSGPACK_PARSERS]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ('Accept',))
+        return response
@@ -0,0 +1,140 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from apps.shared.mixins.conditional_mixins import ConditionalGetMixin
+from apps.shared.mixins.fieldset_mixins import SparseFieldsetsMixin
+from apps.shared.utils import representations
+from apps.shared.utils.catalog_snapshot import catalog_snapshot, from_micros, to_micros
+from apps.shared.utils.renderers import FastJSONRenderer, RawJSON
+
+
+class PrerenderedMixin(SparseFieldsetsMixin):
+    """
+    Lets list and detail views answer from the pre-rendered representation
+    store (apps.shared.utils.representations) instead of the serializer.
+
+    Only the page's keys and updated_at are read from the model table; the
+    JSON comes from the store, re-rendered for rows whose payload is
+    missing or older than the row. A sparse fieldset (?fields=, ?exclude=)
+    is serialized from the narrowed queryset instead.
+    """
+
+    def paginate_prerendered(self, queryset) -> RawJSON:
+        if self.get_sparse_fields() is not None:
+            return RawJSON(FastJSONRenderer().render(self.serialize_sparse_page(queryset)))
+
+        rows = self.paginate_queryset(
+            queryset.values('pk', self.paginator.ordering_field, 'updated_at')
+        )
+        return RawJSON.array(representations.render_rows(queryset.model, rows, self.request))
+
+    def get_prerendered_object(self) -> RawJSON:
+        if self.get_sparse_fields() is not None:
+            return RawJSON(FastJSONRenderer().render(self.serialize_sparse_object()))
+
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            queryset.values('pk', 'updated_at'),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        payloads = representations.render_rows(queryset.model, [row], self.request)
+        if not payloads:
+            # Deleted between the two reads
+            raise Http404
+        return RawJSON(payloads[0])
+
+
+def _cursor_key(value) -> int:
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return to_micros(value)
+
+
+class CatalogSnapshotMixin(ConditionalGetMixin, PrerenderedMixin):
+    """
+    Serves the plain list (cursor, page size and total only) and detail
+    lookups from the view's section of the shared catalog snapshot
+    (apps.shared.utils.catalog_snapshot), without database queries.
+    Conditional GETs of those are validated against the snapshot too; list
+    it before CachedResponseMixin.
+
+    Anything the snapshot does not hold, such as other query parameters, a
+    translated mobile payload or an object with no stored payload, goes
+    through the PrerenderedMixin path.
+    """
+    snapshot_section = None
+    snapshot_query_params = frozenset({'cursor', 'page_size', 'total'})
+
+    def serves_snapshot(self, model) -> bool:
+        return (
+            self.snapshot_section is not None
+            and set(self.request.query_params) <= self.snapshot_query_params
+            and representations.request_language(model, self.request) == ''
+        )
+
+    def get_fingerprint(self):
+        model = self.get_queryset().model
+        if not self.serves_snapshot(model):
+            return super().get_fingerprint()
+
+        section = catalog_snapshot.section(self.snapshot_section)
+        if not self.is_detail():
+            return section.fingerprint
+        if self.lookup_field != 'pk':
+            return super().get_fingerprint()
+        try:
+            row = section.find(int(self.kwargs[self.lookup_url_kwarg or self.lookup_field]))
+        except (TypeError, ValueError):
+            return None
+        if row is None:
+            return None
+        return from_micros(section.column('updated')[row]), 1
+
+    def paginate_catalog(self, queryset) -> RawJSON:
+        if not self.serves_snapshot(queryset.model) or self.paginator.ordering_field != 'created_at':
+            return self.paginate_prerendered(queryset)
+
+        section = catalog_snapshot.section(self.snapshot_section)
+        ids = section.column('ids')
+        rows = self.paginator.paginate_sorted(
+            section.column('created'), ids, self.request, to_key=_cursor_key, to_value=from_micros
+        )
+        page = [(row, int(ids[row])) for row in rows]
+        payloads = self._snapshot_payloads(queryset.model, section, page)
+        return RawJSON.array([payloads[pk] for _, pk in page if pk in payloads])
+
+    def get_catalog_object(self) -> RawJSON:
+        model = self.get_queryset().model
+        if not self.serves_snapshot(model) or self.lookup_field != 'pk':
+            return self.get_prerendered_object()
+
+        try:
+            pk = int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (TypeError, ValueError):
+            raise Http404
+        section = catalog_snapshot.section(self.snapshot_section)
+        row = section.find(pk)
+        if row is None:
+            raise Http404
+
+        payload = section.blob('detail')[row]
+        if not payload:
+            return self.get_prerendered_object()
+        return RawJSON(representations.with_origin(bytes(payload), self.request))
+
+    def _snapshot_payloads(self, model, section, rows):
+        """Payloads by pk of (row, pk) pairs, rendering live those without one."""
+        blob = section.blob('detail')
+        payloads = {}
+        live = []
+        for row, pk in rows:
+            payload = blob[row]
+            if payload:
+                payloads[pk] = representations.with_origin(bytes(payload), self.request)
+            else:
+                live.append(pk)
+        if live:
+            payloads.update(representations.render_live(model, live, self.request))
+        return payloads
@@ -0,0 +1,40 @@
+from itertools import islice
+
+from apps.shared.utils.custom_response import CustomResponse
+
+
+class StreamingListMixin:
+    """
+    Lets a ListAPIView stream its whole queryset with ?stream=1.
+
+    Rows are read with queryset.iterator(chunk_size=stream_chunk_size) and
+    serialized one chunk at a time, so memory stays flat however many rows
+    are returned. The body keeps the CustomResponse envelope; pagination is
+    skipped because every row is sent.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+
+    def should_stream(self, request):
+        return request.query_params.get(self.stream_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def iter_serialized(self, queryset):
+        serializer = self.get_serializer()
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                return
+            # Serializers with translated media load it for the whole chunk at once
+            if hasattr(serializer, 'preload_media'):
+                serializer.preload_media(chunk)
+            for instance in chunk:
+                yield serializer.to_representation(instance)
+
+    def stream_list(self, queryset, message_key="SUCCESS_MESSAGE", **kwargs):
+        return CustomResponse.stream(
+            rows=self.iter_serialized(queryset),
+            message_key=message_key,
+            request=self.request,
+            **kwargs
+        )
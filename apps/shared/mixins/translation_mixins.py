@@ -1,43 +1,121 @@
-from django.conf import settings
+from collections import defaultdict
+
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Manager, Q
 from rest_framework import serializers
 
+from apps.shared.utils.languages import LANGUAGE_CODES, LANGUAGES, translated_field_names
+
+
+def prefetch_media(instances):
+    """
+    Load the Media rows of a batch of model instances in a single query.
+
+    Returns {(content_type_id, object_id): {language: [Media, ...]}} with
+    lower-cased language keys. Every instance gets an entry, so a missing
+    key means "not loaded yet" rather than "has no media".
+    """
+    from apps.shared.models import Media
+
+    object_ids = defaultdict(list)
+    for instance in instances:
+        if instance.pk is not None:
+            content_type = ContentType.objects.get_for_model(instance)
+            object_ids[content_type.id].append(instance.pk)
+
+    media_map = {
+        (content_type_id, pk): {}
+        for content_type_id, pks in object_ids.items()
+        for pk in pks
+    }
+    if not media_map:
+        return media_map
+
+    query = Q()
+    for content_type_id, pks in object_ids.items():
+        query |= Q(content_type_id=content_type_id, object_id__in=pks)
+
+    for media in Media.objects.filter(query):
+        languages = media_map[(media.content_type_id, media.object_id)]
+        languages.setdefault((media.language or "").lower(), []).append(media)
+
+    return media_map
+
+
+class TranslatedListSerializer(serializers.ListSerializer):
+    """Resolve the media of a whole page with one query before serializing it."""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, Manager) else data
+        instances = list(iterable)
+        self.child.preload_media(instances)
+        return super().to_representation(instances)
+
 
 class TranslatedFieldsWriteMixin:
+    # serializer class -> ((field_key, field_factory), ...), built once per process
+    _translated_field_specs = {}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.languages = settings.LANGUAGES
+        self.languages = LANGUAGES
+
+        # Base field is optional
+        for field_name in getattr(self, "translatable_fields", []):
+            if field_name in self.fields:
+                self.fields[field_name].required = False
+
+        # Create language-specific fields
+        for field_key, field_factory in self._get_translated_field_specs():
+            self.fields[field_key] = field_factory()
 
+    def _get_translated_field_specs(self):
+        specs = self._translated_field_specs.get(type(self))
+        if specs is None:
+            specs = tuple(self._build_translated_field_specs())
+            self._translated_field_specs[type(self)] = specs
+        return specs
+
+    def _build_translated_field_specs(self):
         translatable_fields = getattr(self, "translatable_fields", [])
         media_fields = getattr(self, "media_fields", [])
 
         for field_name in translatable_fields:
             is_media = field_name in media_fields
+            original = self.fields.get(field_name)
 
-            # Base field is optional
-            if field_name in self.fields:
-                self.fields[field_name].required = False
+            for (_, lang_name), field_key in zip(self.languages, translated_field_names(field_name)):
+                if is_media:
+                    yield field_key, self._media_field_factory(lang_name)
+                elif original is not None:
+                    yield field_key, self._text_field_factory(original, lang_name)
 
-            # Create language-specific fields
-            for lang_code, lang_name in self.languages:
-                field_key = f"{field_name}_{lang_code.lower()}"
+    @staticmethod
+    def _media_field_factory(lang_name):
+        def factory():
+            return serializers.ListField(
+                child=serializers.FileField(),
+                required=False,
+                write_only=True,
+                allow_empty=True,
+                help_text=f"{lang_name} files",
+            )
+        return factory
 
-                if is_media:
-                    self.fields[field_key] = serializers.ListField(
-                        child=serializers.FileField(),
-                        required=False,
-                        allow_empty=True,
-                        help_text=f"{lang_name} files",
-                    )
-                elif field_name in self.fields:
-                    original = self.fields[field_name]
-                    self.fields[field_key] = original.__class__(
-                        required=False,
-                        allow_blank=True,
-                        allow_null=True,
-                        help_text=f"{lang_name} translation",
-                        max_length=getattr(original, "max_length", None),
-                    )
+    @staticmethod
+    def _text_field_factory(original, lang_name):
+        field_class = original.__class__
+        max_length = getattr(original, "max_length", None)
+
+        def factory():
+            return field_class(
+                required=False,
+                allow_blank=True,
+                allow_null=True,
+                help_text=f"{lang_name} translation",
+                max_length=max_length,
+            )
+        return factory
 
     def create(self, validated_data):
         media_data = self._extract_media_data(validated_data)
@@ -61,8 +139,7 @@ class TranslatedFieldsWriteMixin:
             is_translatable = field_name in translatable_fields
 
             if is_translatable:
-                for lang_code, _ in self.languages:
-                    key = f"{field_name}_{lang_code.lower()}"
+                for key in translated_field_names(field_name):
                     if key in validated_data:
                         media_data[key] = validated_data.pop(key)
             elif field_name in validated_data:
@@ -110,6 +187,35 @@ class TranslatedFieldsWriteMixin:
 class TranslatedFieldsReadMixin:
     """Handle representation for web vs mobile devices with fallbacks."""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, "Meta", None)
+        if meta is not None and not hasattr(meta, "list_serializer_class"):
+            meta.list_serializer_class = TranslatedListSerializer
+
+    def preload_media(self, instances):
+        """Batch-load media for the instances that expose a `media_files` relation."""
+        with_media = [instance for instance in instances if self._has_media_relation(instance)]
+        self._media_cache = prefetch_media(with_media)
+
+    @staticmethod
+    def _has_media_relation(instance):
+        return hasattr(instance, "media_files") and hasattr(getattr(instance, "media_files"), "filter")
+
+    def _get_prefetched_media(self, instance, language):
+        if instance.pk is None:
+            return []
+
+        cache = getattr(self, "_media_cache", None)
+        if cache is None:
+            cache = self._media_cache = {}
+
+        key = (ContentType.objects.get_for_model(instance).id, instance.pk)
+        if key not in cache:
+            # Single instance (detail view): load every language at once.
+            cache.update(prefetch_media([instance]))
+        return cache[key].get((language or "").lower(), [])
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
 
@@ -130,8 +236,8 @@ class TranslatedFieldsReadMixin:
                 else:
                     # web → return all media
                     all_media = []
-                    for lc, _ in settings.LANGUAGES:
-                        all_media.extend(self._get_media(instance, field_name, lc.lower()))
+                    for lc in LANGUAGE_CODES:
+                        all_media.extend(self._get_media(instance, field_name, lc))
                     data[field_name] = all_media
             else:
                 # Text fields handling
@@ -144,16 +250,15 @@ class TranslatedFieldsReadMixin:
                         value = getattr(instance, field_name, "")
                     data[field_name] = value or ""
                     # remove any _en/_uz etc fields if present
-                    for lc, _ in settings.LANGUAGES:
-                        key = f"{field_name}_{lc.lower()}"
+                    for key in translated_field_names(field_name):
                         data.pop(key, None)
                 else:
                     # Web → show all languages; if per-lang attr missing, show base field as fallback
-                    for lc, _ in settings.LANGUAGES:
-                        per_attr = getattr(instance, f"{field_name}_{lc.lower()}", None)
+                    for key in translated_field_names(field_name):
+                        per_attr = getattr(instance, key, None)
                         if per_attr in (None, ""):
                             per_attr = getattr(instance, field_name, "")
-                        data[f"{field_name}_{lc.lower()}"] = per_attr or ""
+                        data[key] = per_attr or ""
                     data.pop(field_name, None)
 
         return data
@@ -166,14 +271,11 @@ class TranslatedFieldsReadMixin:
          - a FileField/ImageField on the instance (e.g., instance.image),
          - serialized dicts (instance may be a dict).
         """
-        # 1) If instance has a related manager media_files, use it
+        # 1) If instance has a related manager media_files, use the batched lookup
         qs_or_list = []
 
-        if hasattr(instance, "media_files") and hasattr(getattr(instance, "media_files"), "filter"):
-            try:
-                qs_or_list = instance.media_files.filter(language__iexact=language)
-            except Exception:
-                qs_or_list = []
+        if self._has_media_relation(instance):
+            qs_or_list = self._get_prefetched_media(instance, language)
         else:
             # 2) If instance is a dict (serialized) and contains media under common keys
             if isinstance(instance, dict):
@@ -203,4 +305,4 @@ class TranslatedFieldsReadMixin:
                 lang = getattr(m, "language", None)
                 id_ = str(getattr(m, "id", None)) if getattr(m, "id", None) is not None else None
                 result.append({"id": id_, "url": url, "filename": filename, "language": lang})
-        return result
\ No newline at end of file
+        return result
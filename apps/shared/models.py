@@ -2,6 +2,7 @@ import uuid
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey
 
@@ -28,6 +29,40 @@ class BaseModel(models.Model):
         abstract = True
         ordering = ['-created_at']
 
+class GeoLocatedModel(models.Model):
+    """
+    Abstract model adding coordinates and a geohash kept in sync on save.
+    The indexed geohash backs nearby search and map clustering.
+    """
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    geohash = models.CharField(max_length=12, blank=True, default='', editable=False, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        from apps.shared.utils.geo import encode_geohash
+
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
+
 class Media(BaseModel):
     MEDIA_TYPES = [
         ('image', 'Image'),
@@ -85,3 +120,29 @@ class Media(BaseModel):
 
         super().save(*args, **kwargs)
 
+
+class RenderedRepresentation(models.Model):
+    """
+    Serialized JSON of one catalog object in one language, kept in step with
+    the object by apps.shared.utils.representations. `language` is blank for
+    serializers whose output does not depend on the request language.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    language = models.CharField(max_length=3, blank=True, default='')
+    payload = models.BinaryField()
+    # updated_at of the object the payload was rendered from
+    source_updated_at = models.DateTimeField()
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'rendered_representations'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'object_id', 'language'],
+                name='unique_rendered_representation',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} [{self.language or '*'}]"
@@ -1,6 +1,6 @@
 from rest_framework.permissions import BasePermission
 from apps.shared.exceptions.custom_exceptions import CustomException
-from apps.users.models.device import Device
+from apps.shared.utils.device_session import get_device_session
 
 
 class IsMobileOrWebUser(BasePermission):
@@ -16,9 +16,8 @@ class IsMobileOrWebUser(BasePermission):
         if not device_token:
             raise CustomException(message_key="TOKEN_IS_NOT_PROVIDED")
 
-        try:
-            device = Device.objects.get(device_token=device_token)
-        except Device.DoesNotExist:
+        device = get_device_session(device_token, request)
+        if device is None:
             raise CustomException(message_key="NOT_FOUND")
         
 
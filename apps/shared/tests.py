@@ -1,3 +1,869 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import uuid
+from datetime import date, datetime, timezone
+from io import BytesIO, StringIO
+from decimal import Decimal
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as django_timezone
+from django.urls import resolve, reverse
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from apps.blog.models.blogs import BlogPost
+from apps.excursions.models import Excursion
+from apps.excursions.serializers.excursion_serializer import ExcursionSerializer
+from apps.hotels.models import Hotel
+from apps.hotels.serializers.hotel_serializer import HotelListSerializer, HotelSerializer
+from apps.shared.exceptions.handler import custom_exception_handler
+from apps.shared.exceptions.translator import get_message_detail, negotiate_language
+from apps.shared.mixins.translation_mixins import TranslatedFieldsWriteMixin, prefetch_media
+from apps.shared.models import Media, RenderedRepresentation
+from apps.shared.utils import catalog_snapshot, representations, response_cache
+from apps.shared.utils.compiled_serializer import compile_serializer
+from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.device_session import get_device_session, invalidate_device_sessions
+from apps.shared.utils.geo import bounding_boxes, covering_prefixes, encode_geohash, haversine_km
+from apps.shared.utils.parsers import MessagePackParser
+from apps.shared.utils.renderers import FastJSONRenderer, MessagePackRenderer
+from apps.shared.utils.telegram_alerts import AlertDispatcher, StubTransport
+from apps.testimonials.models import Testimonial
+from apps.testimonials.serializers.testimonial_serializer import TestimonialSerializer
+from apps.tours.models import Tour
+from apps.tours.serializers.tour_serializer import TourSerializer
+from apps.users.models.user_auth import User
+
+
+class PrefetchMediaTests(TestCase):
+
+    def setUp(self):
+        self.hotels = [
+            Hotel.objects.create(name=f'Hotel {i}', location='City', price_per_night=100)
+            for i in range(3)
+        ]
+        content_type = ContentType.objects.get_for_model(Hotel)
+        Media.objects.bulk_create([
+            Media(
+                content_type=content_type,
+                object_id=self.hotels[0].pk,
+                file='hotels/a.jpg',
+                media_type='image',
+                file_size=1,
+                mime_type='image/jpeg',
+                original_filename='a.jpg',
+                language=language,
+            )
+            for language in ('EN', 'EN', 'UZ')
+        ])
+
+    def test_single_query_for_a_page(self):
+        ContentType.objects.get_for_model(Hotel)  # warm the content type cache
+        with self.assertNumQueries(1):
+            media_map = prefetch_media(self.hotels)
+
+        content_type_id = ContentType.objects.get_for_model(Hotel).id
+        first = media_map[(content_type_id, self.hotels[0].pk)]
+        self.assertEqual(len(first['en']), 2)
+        self.assertEqual(len(first['uz']), 1)
+        self.assertEqual(media_map[(content_type_id, self.hotels[1].pk)], {})
+
+    def test_empty_batch_skips_query(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(prefetch_media([]), {})
+
+
+class TranslatedHotelSerializer(TranslatedFieldsWriteMixin, serializers.ModelSerializer):
+    translatable_fields = ['name']
+
+    class Meta:
+        model = Hotel
+        fields = ['id', 'name']
+
+
+class TranslatedFieldsWriteMixinTests(TestCase):
+
+    def test_fields_follow_project_languages(self):
+        fields = TranslatedHotelSerializer().fields
+        self.assertEqual(
+            [key for key in fields if key.startswith('name_')],
+            ['name_ru', 'name_en', 'name_crl', 'name_uz']
+        )
+        self.assertEqual(fields['name_uz'].max_length, 255)
+
+    def test_field_specs_are_built_once_per_class(self):
+        TranslatedHotelSerializer()
+        specs = TranslatedFieldsWriteMixin._translated_field_specs[TranslatedHotelSerializer]
+        first, second = TranslatedHotelSerializer(), TranslatedHotelSerializer()
+        self.assertIs(TranslatedFieldsWriteMixin._translated_field_specs[TranslatedHotelSerializer], specs)
+        # Field instances are still per serializer, as DRF binds them to their parent.
+        self.assertIsNot(first.fields['name_ru'], second.fields['name_ru'])
+
+
+class ResponseCacheTests(APITestCase):
+
+    def setUp(self):
+        self.hotel = Hotel.objects.create(name='Cached Hotel', location='City', price_per_night=100)
+        self.url = reverse('hotels:hotel-detail', args=[self.hotel.id])
+
+    def test_repeated_get_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    def test_language_is_part_of_the_key(self):
+        self.client.get(self.url, HTTP_ACCEPT_LANGUAGE='en')
+        response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_save_invalidates_model_tags(self):
+        self.client.get(self.url)
+        self.hotel.name = 'Renamed Hotel'
+        self.hotel.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data']['name'], 'Renamed Hotel')
+
+    def test_per_process_cache_is_refused(self):
+        """Workers must share tag versions, so LocMemCache is a configuration error"""
+        response_cache.check_shared_cache()
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with self.assertRaises(ImproperlyConfigured):
+                response_cache.check_shared_cache()
+
+
+class DeviceSessionTests(TestCase):
+
+    def setUp(self):
+        from apps.users.models import Device, User
+        from apps.users.models.device import AppVersion
+
+        self.user = User.objects.create_user(username='mobile', password='MobilePass123!')
+        self.device = Device.objects.create(
+            user=self.user,
+            device_model='Pixel',
+            operation_version='14',
+            device_id='DEVICE-SESSION-1',
+            ip_address='127.0.0.1',
+            language='EN',
+            app_version=AppVersion.objects.create(version='1.0.0', is_active=True),
+        )
+        self.token = str(self.device.device_token)
+
+    def test_token_is_resolved_once(self):
+        with self.assertNumQueries(1):
+            session = get_device_session(self.token)
+        self.assertEqual(session.id, self.device.id)
+        self.assertEqual(session.user_id, self.user.id)
+        self.assertEqual(session.language, 'EN')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_device_session(self.token), session)
+
+    def test_lookup_is_memoized_on_the_request(self):
+        request = RequestFactory().get('/')
+        session = get_device_session(self.token, request)
+        invalidate_device_sessions(self.token)
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_device_session(self.token, request), session)
+
+    def test_unknown_or_malformed_token(self):
+        self.assertIsNone(get_device_session('not-a-uuid'))
+        self.assertIsNone(get_device_session('00000000-0000-0000-0000-000000000000'))
+
+    def test_logout_invalidates_cached_session(self):
+        self.assertTrue(get_device_session(self.token).is_active)
+        self.device.logout()
+        self.assertFalse(get_device_session(self.token).is_active)
+
+    def test_bulk_logout_invalidates_cached_session(self):
+        from apps.users.models import Device
+
+        self.assertTrue(get_device_session(self.token).is_active)
+        Device.objects.logout_all_devices(self.user)
+        self.assertFalse(get_device_session(self.token).is_active)
+
+
+class MessageCatalogTests(TestCase):
+
+    def test_negotiate_language_honours_quality_values(self):
+        self.assertEqual(negotiate_language('ru;q=0.5, uz'), 'uz')
+        self.assertEqual(negotiate_language('en-US,en;q=0.9'), 'en')
+        self.assertEqual(negotiate_language('de, ru;q=0.1'), 'ru')
+        self.assertEqual(negotiate_language('ru;q=0, de'), 'en')
+        self.assertEqual(negotiate_language(''), 'en')
+
+    def test_message_detail_formats_context_with_fallback(self):
+        detail = get_message_detail('USER_NOT_FOUND', lang='ru-RU', context={'user_id': 7})
+        self.assertEqual(detail['id'], 'USER_NOT_FOUND')
+        self.assertIn('7', detail['message'])
+
+        missing_context = get_message_detail('USER_NOT_FOUND', lang='en')
+        self.assertIn('{user_id}', missing_context['message'])
+
+        unknown = get_message_detail('NO_SUCH_KEY', lang='en')
+        self.assertIn(unknown['id'], ('UNKNOWN_ERROR', 'SYSTEM_ERROR'))
+
+
+class FastJSONRendererTests(TestCase):
+
+    def test_output_matches_json_renderer(self):
+        data = {
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'price': Decimal('129.99'),
+            'created_at': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'date': date(2025, 1, 2),
+            'name': 'Отель\u2028Tashkent',
+            1: [None, True, 1.5],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_floats_match_json_renderer(self):
+        floats = [
+            0.0, -0.0, 0.1, 1 / 3, 100.0, 41.311081, -69.240562, 123456789.125,
+            1e-3, 1e-4, 1e-5, -3.5e-5, 9.99e-5, 1e-7, 2.5e-300, 5e-324,
+            1e15, 1e16, 1.5e16, 1e22, 1.7976931348623157e308,
+        ]
+        for value in floats:
+            with self.subTest(value=value):
+                for data in (value, [value], {'lat': value, 'lng': [value, 1]}):
+                    self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_text_matches_json_renderer(self):
+        data = {
+            'ru': 'Отель «Ташкент»',
+            'uz': 'Amir Temur ko‘chasi',
+            'emoji': 'Bukhara \U0001F54C',
+            'controls': 'tab\tnewline\n\x00\x1f\x7f"quote" \\back',
+            'separators': 'a b c',
+            'Ключ': 'e-mail 1e5, [0.00001]',
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_finite_floats_render_as_null(self):
+        """JSONRenderer refuses NaN and Infinity in strict mode; orjson writes null"""
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render({'lat': value})
+                self.assertEqual(FastJSONRenderer().render({'lat': value}), b'{"lat":null}')
+
+    def test_indent_falls_back_to_json_renderer(self):
+        data = {'a': [1, 2]}
+        rendered = FastJSONRenderer().render(data, 'application/json; indent=4')
+        self.assertEqual(rendered, JSONRenderer().render(data, 'application/json; indent=4'))
+
+
+class MessagePackTests(TestCase):
+
+    def test_values_decode_as_in_json(self):
+        data = {
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'price': Decimal('129.99'),
+            'created_at': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'date': date(2025, 1, 2),
+            'items': [None, True, 1.5, 'Отель'],
+        }
+        packed = MessagePackRenderer().render(data)
+        parsed = MessagePackParser().parse(BytesIO(packed))
+        self.assertEqual(parsed, json.loads(JSONRenderer().render(data)))
+
+    def test_malformed_body_is_a_parse_error(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b'\xc1'))
+
+
+class AlertDispatcherTests(TestCase):
+
+    def test_repeats_are_aggregated_into_digest(self):
+        transport = StubTransport()
+        dispatcher = AlertDispatcher(transport, digest_interval=3600)
+        fingerprint = ('HotelDetailView', '/api/v1/hotels/1/', 'ValueError')
+
+        for _ in range(5):
+            dispatcher.submit('boom', fingerprint=fingerprint)
+        dispatcher.submit('other', fingerprint=('TourListView', '/api/v1/tours/', 'KeyError'))
+        self.assertTrue(dispatcher.flush())
+
+        self.assertEqual(transport.messages[:2], ['boom', 'other'])
+        self.assertEqual(len(transport.messages), 3)
+        self.assertIn('<b>4×</b> HotelDetailView', transport.messages[2])
+
+    def test_full_queue_drops_and_counts(self):
+        transport = StubTransport()
+        dispatcher = AlertDispatcher(transport, maxsize=1, digest_interval=3600)
+
+        # No worker, so nothing drains the queue
+        with mock.patch.object(dispatcher, '_ensure_worker'):
+            self.assertTrue(dispatcher.submit('first'))
+            self.assertFalse(dispatcher.submit('second'))
+        self.assertEqual(dispatcher.dropped, 1)
+
+
+class ExceptionAlertTests(TestCase):
+
+    def alert_fingerprint(self, pk):
+        request = RequestFactory().get(reverse('tours:detail', kwargs={'pk': pk}))
+        request.resolver_match = resolve(request.path)
+        try:
+            raise ValueError(f'tour {pk}')
+        except ValueError as exc:
+            with mock.patch('apps.shared.exceptions.handler.send_alert') as send_alert:
+                custom_exception_handler(exc, {'request': request, 'view': None})
+        return send_alert.call_args.kwargs['fingerprint']
+
+    def test_failures_of_a_route_share_a_fingerprint(self):
+        fingerprint = self.alert_fingerprint(1)
+        self.assertEqual(self.alert_fingerprint(2), fingerprint)
+        self.assertNotIn('/1/', ' '.join(fingerprint))
+        self.assertEqual(fingerprint[2], 'ValueError')
+        self.assertTrue(fingerprint[3].startswith('tests.py:'))
+
+
+class GeoTests(TestCase):
+
+    def test_encode_geohash(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+
+    def test_covering_prefixes_contain_every_point_of_the_box(self):
+        latitude, longitude, radius = 41.3111, 69.2797, 7
+        [box] = bounding_boxes(latitude, longitude, radius)
+        prefixes = covering_prefixes(box)
+        self.assertLessEqual(len(prefixes), 16)
+
+        for d_lat in (-0.06, 0, 0.06):
+            for d_lon in (-0.08, 0, 0.08):
+                point = (latitude + d_lat, longitude + d_lon)
+                if haversine_km(latitude, longitude, *point) <= radius:
+                    self.assertTrue(any(encode_geohash(*point).startswith(p) for p in prefixes))
+
+    def test_boxes_split_at_the_antimeridian(self):
+        """A circle crossing ±180 is covered on both sides"""
+        latitude, longitude, radius = -17.8, 179.95, 20  # Fiji
+        boxes = bounding_boxes(latitude, longitude, radius)
+        self.assertEqual(len(boxes), 2)
+        self.assertEqual((boxes[0][3], boxes[1][1]), (180.0, -180.0))
+        prefixes = [prefix for box in boxes for prefix in covering_prefixes(box)]
+
+        for point in ((latitude, 179.99), (latitude, -179.9), (latitude - 0.1, -179.95)):
+            self.assertLessEqual(haversine_km(latitude, longitude, *point), radius)
+            self.assertTrue(any(encode_geohash(*point).startswith(p) for p in prefixes))
+
+
+class StreamingResponseTests(TestCase):
+
+    def test_stream_matches_success_envelope(self):
+        rows = [{'id': i, 'price': Decimal('9.50')} for i in range(50)]
+        expected = FastJSONRenderer().render(CustomResponse.success(data=rows, count=50).data)
+
+        response = CustomResponse.stream(rows=iter(rows), buffer_size=64, count=50)
+        chunks = list(response.streaming_content)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b''.join(chunks), expected)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_stream_without_rows(self):
+        response = CustomResponse.stream(rows=[])
+        self.assertEqual(b''.join(response.streaming_content)[-11:], b',"data":[]}')
+
+
+class CompiledSerializerTests(TestCase):
+
+    def setUp(self):
+        hotel = Hotel.objects.create(
+            name='Compiled Hotel', location='City', price_per_night=Decimal('99.90'),
+            rating=Decimal('4.5'), main_image='hotels/a.jpg', latitude=41.3, longitude=69.2,
+        )
+        Hotel.objects.create(name='Bare Hotel', location='City', price_per_night=100)
+        Tour.objects.create(
+            title='Tour', description='d', destination='Samarkand', duration_days=3,
+            price=Decimal('250.00'), capacity=10, hotel=hotel, image='tours/a.jpg',
+            start_date=date(2026, 5, 1),
+        )
+        Tour.objects.create(
+            title='Tour 2', description='d', destination='Bukhara', duration_days=2,
+            price=Decimal('120.50'), capacity=5,
+        )
+        Excursion.objects.create(
+            title='Excursion', location='Khiva', duration_hours=4, price=Decimal('30.00'),
+            description='d', is_available=False,
+        )
+        Testimonial.objects.create(name='Ann', role='Guest', text='Great', avatar='testimonials/avatars/a.png')
+        self.request = RequestFactory().get('/')
+
+    def test_output_matches_model_serializer(self):
+        for serializer_class, queryset in (
+            (HotelListSerializer, Hotel.objects.order_by('pk')),
+            (TourSerializer, Tour.objects.order_by('pk')),
+            (ExcursionSerializer, Excursion.objects.order_by('pk')),
+            (TestimonialSerializer, Testimonial.objects.order_by('pk')),
+        ):
+            with self.subTest(serializer=serializer_class.__name__):
+                compiled = compile_serializer(serializer_class)
+                expected = serializer_class(queryset, many=True, context={'request': self.request}).data
+                actual = compiled.many(compiled.project(queryset), self.request)
+                self.assertEqual(FastJSONRenderer().render(actual), FastJSONRenderer().render(expected))
+
+    def test_geohash_is_kept_out_of_the_payloads(self):
+        for serializer_class in (HotelSerializer, TourSerializer, ExcursionSerializer):
+            with self.subTest(serializer=serializer_class.__name__):
+                fields = serializer_class().fields
+                self.assertIn('latitude', fields)
+                self.assertNotIn('geohash', fields)
+
+
+class RepresentationStoreTests(APITestCase):
+
+    def setUp(self):
+        self.hotel = Hotel.objects.create(name='Stored Hotel', location='City', price_per_night=100)
+        self.tour = Tour.objects.create(
+            title='Stored Tour', description='d', destination='Samarkand', duration_days=3,
+            price=Decimal('250.00'), capacity=10, hotel=self.hotel, image='tours/a.jpg',
+        )
+        self.request = RequestFactory().get('/')
+
+    def rows(self):
+        return Tour.objects.filter(pk=self.tour.pk).values('pk', 'updated_at')
+
+    def test_detail_is_served_from_store(self):
+        representations.refresh(Tour, [self.tour])
+        response = self.client.get(reverse('tours:detail', kwargs={'pk': self.tour.pk}))
+
+        expected = TourSerializer(self.tour, context={'request': response.wsgi_request}).data
+        body = CustomResponse.success(request=response.wsgi_request, data=expected).data
+        self.assertEqual(response.content, FastJSONRenderer().render(body))
+        self.assertTrue(response.data['data']['image'].startswith('http://testserver/'))
+
+        stored = RenderedRepresentation.objects.get(
+            content_type=ContentType.objects.get_for_model(Tour), object_id=self.tour.pk, language=''
+        )
+        self.assertIn(representations.ORIGIN_PLACEHOLDER.encode(), bytes(stored.payload))
+
+    def test_outdated_payload_is_rerendered(self):
+        representations.refresh(Tour, [self.tour])
+        Tour.objects.filter(pk=self.tour.pk).update(price=Decimal('300.00'), updated_at=django_timezone.now())
+
+        payload, = representations.render_rows(Tour, self.rows(), self.request)
+        self.assertIn(b'"price":"300.00"', payload)
+
+    def test_reads_do_not_store_payloads(self):
+        with CaptureQueriesContext(connection) as queries:
+            payload, = representations.render_rows(Tour, self.rows(), self.request)
+        self.assertIn(b'"title":"Stored Tour"', payload)
+        self.assertFalse(RenderedRepresentation.objects.exists())
+        self.assertFalse([query for query in queries if not query['sql'].startswith('SELECT')])
+
+    def test_payload_with_placeholder_text_is_not_stored(self):
+        self.tour.description = f'See {representations.ORIGIN_PLACEHOLDER}/media/x.jpg'
+        self.tour.save()
+
+        payload, = representations.render_rows(Tour, self.rows(), self.request)
+        self.assertFalse(RenderedRepresentation.objects.filter(object_id=self.tour.pk).exists())
+        self.assertIn(representations.ORIGIN_PLACEHOLDER.encode(), payload)
+        self.assertIn(b'"image":"http://testserver/media/tours/a.jpg"', payload)
+
+    def test_deleting_related_hotel_drops_tour_payload(self):
+        representations.refresh(Tour, [self.tour])
+        self.hotel.delete()
+        self.assertFalse(RenderedRepresentation.objects.filter(object_id=self.tour.pk).exists())
+
+    def test_media_changes_refresh_the_owner(self):
+        content_type = ContentType.objects.get_for_model(Tour)
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            with self.captureOnCommitCallbacks(execute=True):
+                media = Media.objects.create(
+                    content_type=content_type, object_id=self.tour.pk, file=SimpleUploadedFile('fort.jpg', b'jpeg'),
+                    media_type='image', original_filename='fort.jpg', language='EN',
+                )
+            updated_at = Tour.objects.get(pk=self.tour.pk).updated_at
+            self.assertGreater(updated_at, self.tour.updated_at)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                media.delete()
+            self.assertGreater(Tour.objects.get(pk=self.tour.pk).updated_at, updated_at)
+
+    def test_media_owner_is_saved_once_per_transaction(self):
+        saves = []
+        post_save.connect(lambda sender, **kwargs: saves.append(kwargs['instance'].pk), sender=Tour, weak=False,
+                          dispatch_uid='test-tour-saves')
+        self.addCleanup(post_save.disconnect, sender=Tour, dispatch_uid='test-tour-saves')
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            with self.captureOnCommitCallbacks(execute=True):
+                for i in range(3):
+                    Media.objects.create(
+                        content_type=ContentType.objects.get_for_model(Tour), object_id=self.tour.pk,
+                        file=SimpleUploadedFile(f'{i}.jpg', b'jpeg'), media_type='image', language='EN',
+                    )
+                self.assertEqual(saves, [])
+        self.assertEqual(saves, [self.tour.pk])
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command('rebuild_representations', 'tours.Tour', 'hotels.Hotel', stdout=out)
+        self.assertEqual(RenderedRepresentation.objects.count(), 2)
+        self.assertIn('tours.Tour: 1 objects rendered', out.getvalue())
+
+
+class CatalogSnapshotTests(APITestCase):
+
+    def setUp(self):
+        created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.tours = []
+        for i in range(5):
+            tour = Tour.objects.create(
+                title=f'Tour {i}', description='d', destination='Samarkand', duration_days=3,
+                price=Decimal('100.00'), capacity=10, image='tours/a.jpg',
+            )
+            # Two pairs share created_at, so the pk decides between them
+            Tour.objects.filter(pk=tour.pk).update(created_at=created.replace(day=1 + i // 2))
+            self.tours.append(tour)
+        Tour.objects.create(
+            title='Hidden', description='d', destination='Khiva', duration_days=1,
+            price=Decimal('10.00'), capacity=1, status=False,
+        )
+        self.list_url = reverse('tours:list')
+
+    def expected_ids(self):
+        return list(Tour.objects.filter(status=True).order_by('-created_at', '-pk').values_list('pk', flat=True))
+
+    def walk(self, params):
+        ids, cursors = [], []
+        while True:
+            response = self.client.get(self.list_url, params)
+            ids.extend(item['id'] for item in response.data['data'])
+            cursors.append(response.data['pagination'])
+            if not response.data['pagination']['next_cursor']:
+                return ids, cursors
+            params = {**params, 'cursor': response.data['pagination']['next_cursor']}
+
+    def test_list_pages_match_database_order_without_queries(self):
+        self.client.get(self.list_url)
+
+        with CaptureQueriesContext(connection) as queries:
+            ids, pages = self.walk({'page_size': 2, 'total': 'exact'})
+        self.assertEqual(ids, self.expected_ids())
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(pages[0]['total_items'], 5)
+
+        # Walking back from the last page returns the previous one
+        response = self.client.get(self.list_url, {'page_size': 2, 'cursor': pages[-1]['prev_cursor']})
+        self.assertEqual([item['id'] for item in response.data['data']], ids[2:4])
+
+    def test_list_and_detail_match_serializer(self):
+        tour = self.tours[0]
+        response = self.client.get(reverse('tours:detail', kwargs={'pk': tour.pk}))
+        tour.refresh_from_db()
+        expected = TourSerializer(tour, context={'request': response.wsgi_request}).data
+        self.assertEqual(response.data['data'], expected)
+
+        hidden = Tour.objects.get(status=False)
+        response = self.client.get(reverse('tours:detail', kwargs={'pk': hidden.pk}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_committed_change_is_visible(self):
+        self.client.get(self.list_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tours[0].status = False
+            self.tours[0].save()
+
+        ids, _ = self.walk({})
+        self.assertNotIn(self.tours[0].pk, ids)
+
+    def test_snapshot_is_written_and_mapped_by_other_workers(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(CATALOG_SNAPSHOT_DIR=directory):
+            writer = catalog_snapshot.CatalogSnapshot()
+            # Written as if outside the test's transaction
+            with mock.patch.object(catalog_snapshot, 'connection', mock.Mock(in_atomic_block=False)):
+                writer.rebuild()
+            self.assertTrue(writer.path.exists())
+
+            reader = catalog_snapshot.CatalogSnapshot()
+            with CaptureQueriesContext(connection) as queries:
+                section = reader.section('tours')
+            self.assertEqual(len(queries), 0)
+            self.assertIsInstance(reader.get().buffer, catalog_snapshot.mmap.mmap)
+
+            ids = [int(pk) for pk in section.column('ids')]
+            self.assertEqual(ids[::-1], self.expected_ids())
+            self.assertEqual(section.find(self.tours[3].pk), ids.index(self.tours[3].pk))
+            self.assertIsNone(section.find(10 ** 9))
+            self.assertIn(b'"title":"Tour 3"', bytes(section.blob('detail')[section.find(self.tours[3].pk)]))
+
+    def test_workers_agree_on_which_sections_are_stale(self):
+        script = (
+            'import json, sys\n'
+            'import django\n'
+            'django.setup()\n'
+            'from django.test import override_settings\n'
+            'from apps.shared.utils import catalog_snapshot\n'
+            'with override_settings(CACHES=json.loads(sys.argv[1])):\n'
+            '    current = catalog_snapshot.MappedCatalog.open(sys.argv[2])\n'
+            '    print(json.dumps(sorted(catalog_snapshot.CatalogSnapshot()._stale(current))))\n'
+        )
+        caches_setting = json.dumps(settings.CACHES, default=str)
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'core.settings'}
+
+        def stale_in_worker(path):
+            worker = subprocess.run(
+                [sys.executable, '-c', script, caches_setting, str(path)],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+            )
+            return json.loads(worker.stdout)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(CATALOG_SNAPSHOT_DIR=directory):
+            writer = catalog_snapshot.CatalogSnapshot()
+            with mock.patch.object(catalog_snapshot, 'connection', mock.Mock(in_atomic_block=False)):
+                writer.rebuild()
+
+            self.assertEqual(stale_in_worker(writer.path), [])
+            cache.incr(catalog_snapshot.GENERATION_KEY.format('tours'))
+            self.assertEqual(stale_in_worker(writer.path), ['tours'])
+
+    def test_per_process_cache_is_refused(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with self.assertRaises(ImproperlyConfigured):
+                catalog_snapshot.connect_signals()
+
+    def test_deleting_a_hotel_marks_tours_stale(self):
+        # Also publishes the tours created by setUp
+        with self.captureOnCommitCallbacks(execute=True):
+            hotel = Hotel.objects.create(name='Hotel', location='Tashkent', price_per_night=Decimal('50.00'))
+        Tour.objects.filter(pk=self.tours[3].pk).update(hotel=hotel, updated_at=django_timezone.now())
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+                CATALOG_SNAPSHOT_DIR=directory, CATALOG_SNAPSHOT_CHECK_INTERVAL=0):
+            writer = catalog_snapshot.CatalogSnapshot()
+            with mock.patch.object(catalog_snapshot, 'connection', mock.Mock(in_atomic_block=False)):
+                writer.rebuild()
+            self.assertEqual(writer._stale(catalog_snapshot.MappedCatalog.open(writer.path)), set())
+
+            # SET_NULL rewrites the tour without a save signal
+            with self.captureOnCommitCallbacks(execute=True):
+                hotel.delete()
+            self.assertEqual(writer._stale(catalog_snapshot.MappedCatalog.open(writer.path)), {'tours', 'hotels'})
+
+    def test_only_out_of_date_sections_are_rebuilt_in_the_background(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+                CATALOG_SNAPSHOT_DIR=directory, CATALOG_SNAPSHOT_CHECK_INTERVAL=0):
+            writer = catalog_snapshot.CatalogSnapshot()
+            hotel = Hotel.objects.create(name='Hotel', location='Tashkent', price_per_night=Decimal('50.00'))
+            writer.rebuild()
+
+            Hotel.objects.filter(pk=hotel.pk).update(name='Renamed without a signal')
+            Tour.objects.filter(pk=self.tours[3].pk).update(title='Tour three', updated_at=django_timezone.now())
+            cache.incr(catalog_snapshot.GENERATION_KEY.format('tours'))
+
+            # Requests keep the current file and leave the rebuild to the background thread
+            reader = catalog_snapshot.CatalogSnapshot()
+            with mock.patch.object(reader, '_schedule') as schedule, CaptureQueriesContext(connection) as queries:
+                section = reader.section('tours')
+            schedule.assert_called_once_with()
+            self.assertEqual(len(queries), 0)
+            self.assertIn(b'"title":"Tour 3"', bytes(section.blob('detail')[section.find(self.tours[3].pk)]))
+
+            # One worker per node rebuilds at a time
+            lock = writer.path.with_name(f'{writer.path.name}.lock')
+            lock.touch()
+            self.assertIsNone(reader._rebuild_stale(wait=False))
+            lock.unlink()
+
+            rebuilt = reader._rebuild_stale(wait=False)
+            tours, hotels = rebuilt.sections['tours'], rebuilt.sections['hotels']
+            self.assertIn(b'"title":"Tour three"', bytes(tours.blob('detail')[tours.find(self.tours[3].pk)]))
+            # Copied from the previous file rather than read again
+            self.assertIn(b'"name":"Hotel"', bytes(hotels.blob('detail')[hotels.find(hotel.pk)]))
+            self.assertEqual(reader._stale(rebuilt), set())
+            self.assertFalse(lock.exists())
+
+
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.tour = Tour.objects.create(
+            title='Tour', description='d', destination='Samarkand', duration_days=3,
+            price=Decimal('100.00'), capacity=10,
+        )
+        self.testimonials = [
+            Testimonial.objects.create(name=f'Guest {i}', role='Traveller', text='Great', is_published=True)
+            for i in range(2)
+        ]
+
+    def test_unchanged_detail_is_not_modified_without_queries(self):
+        """A snapshot-served detail answers If-None-Match from the snapshot"""
+        url = reverse('tours:detail', kwargs={'pk': self.tour.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len(queries), 0)
+
+        etag = response['ETag']
+        self.tour.price = Decimal('120.00')
+        self.tour.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_fingerprint_follows_deletes(self):
+        """A list is revalidated from the cached fingerprint and changes when a row goes"""
+        url = reverse('testimonials:testimonial-list')
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('Last-Modified', response)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        self.assertNotEqual(self.client.get(url, HTTP_ACCEPT_LANGUAGE='ru')['ETag'], etag)
+
+        self.testimonials[0].delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 1)
+
+
+class SparseFieldsetsTests(APITestCase):
+
+    def setUp(self):
+        author = User.objects.create_user(username='author', email='author@example.com', password='Pass12345!')
+        BlogPost.objects.create(title='Post', content='Long body ' * 100, author=author, is_published=True)
+        self.tour = Tour.objects.create(
+            title='Tour', description='Long description', destination='Samarkand', duration_days=3,
+            price=Decimal('100.00'), capacity=10,
+        )
+        Testimonial.objects.create(name='Ann', role='Guest', text='Great', is_published=True)
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        return response, ' '.join(query['sql'] for query in queries)
+
+    def test_blog_list_never_reads_content(self):
+        response, sql = self.get(reverse('blog:blog-list'), {'fields': 'title,reading_time'})
+        self.assertEqual(response.data['data'], [{'title': 'Post', 'reading_time': 1}])
+        self.assertNotIn('"content"', sql)
+
+    def test_fields_narrow_output_and_columns(self):
+        response, sql = self.get(reverse('tours:list'), {'fields': 'id,title'})
+        self.assertEqual(response.data['data'], [{'id': self.tour.pk, 'title': 'Tour'}])
+        self.assertNotIn('"description"', sql)
+
+        response, _ = self.get(reverse('tours:detail', kwargs={'pk': self.tour.pk}), {'exclude': 'description'})
+        self.assertNotIn('description', response.data['data'])
+        self.assertEqual(response.data['data']['title'], 'Tour')
+
+        response, sql = self.get(reverse('testimonials:testimonial-list'), {'exclude': 'text'})
+        self.assertNotIn('text', response.data['data'][0])
+        self.assertNotIn('"text"', sql)
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('tours:detail', kwargs={'pk': self.tour.pk}), {'fields': 'title,secret'})
+        self.assertEqual(response.status_code, 400)
+
+
+class BatchTests(APITestCase):
+
+    def setUp(self):
+        self.url = reverse('batch')
+        self.user = User.objects.create_user(username='user', email='user@example.com', password='UserPass123!')
+        Tour.objects.create(title='Tour', destination='Paris', duration_days=5, price=1000, capacity=10)
+        Hotel.objects.create(name='Hotel', location='City', price_per_night=100)
+
+    def test_results_match_separate_requests(self):
+        response = self.client.post(self.url, {'requests': [
+            {'id': 'tours', 'path': '/api/v1/tours/', 'query': {'page_size': 1}},
+            {'id': 'hotels', 'method': 'get', 'path': '/api/v1/hotels/?ordering=price'},
+            {'id': 'missing', 'path': '/api/v1/nowhere/'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        tours, hotels, missing = response.data['data']
+        self.assertEqual(tours['id'], 'tours')
+        self.assertEqual(tours['status'], 200)
+        self.assertEqual(tours['body'], self.client.get('/api/v1/tours/', {'page_size': 1}).data)
+        self.assertEqual(hotels['body'], self.client.get('/api/v1/hotels/', {'ordering': 'price'}).data)
+        self.assertEqual(missing['status'], 404)
+
+    def test_sub_requests_share_the_outer_authentication(self):
+        batch = {'requests': [{'path': '/api/v1/bookings/'}]}
+
+        response = self.client.post(self.url, batch, format='json')
+        self.assertEqual(response.data['data'][0]['status'], 401)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.post(self.url, batch, format='json')
+        self.assertEqual(response.data['data'][0]['status'], 200)
+
+    def test_invalid_batches_are_rejected(self):
+        for batch in (
+            {'requests': []},
+            {'requests': [{'path': 'https://example.com/api/v1/tours/'}]},
+            {'requests': [{'path': '/admin/'}]},
+            {'requests': [{'path': '/api/v1/tours/', 'headers': {'Authorization': 'Bearer x'}}]},
+            {'requests': [{'path': '/api/v1/tours/'}] * 21},
+        ):
+            with self.subTest(batch=batch):
+                response = self.client.post(self.url, batch, format='json')
+                self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(self.url, {'requests': [{'method': 'POST', 'path': '/api/v1/batch/'}]}, format='json')
+        self.assertEqual(response.data['data'][0]['status'], 400)
+
+
+class ParallelBatchTests(TransactionTestCase):
+
+    def setUp(self):
+        # Commits here are real: keep the snapshot they write, and its background rebuild, to this test
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        snapshot_settings = override_settings(CATALOG_SNAPSHOT_DIR=directory.name)
+        snapshot_settings.enable()
+        self.addCleanup(snapshot_settings.disable)
+
+    def tearDown(self):
+        timer = catalog_snapshot.catalog_snapshot._timer
+        if timer is not None:
+            timer.cancel()
+            timer.join()
+
+    def test_parallel_gets_match_sequential(self):
+        Tour.objects.create(title='Tour', destination='Paris', duration_days=5, price=1000, capacity=10)
+        Testimonial.objects.create(name='Ann', role='Guest', text='Great', is_published=True)
+        requests = [
+            {'id': name, 'path': f'/api/v1/{name}/'} for name in ('tours', 'testimonials', 'excursions')
+        ]
+
+        sequential = self.client.post(reverse('batch'), {'requests': requests}, content_type='application/json')
+        parallel = self.client.post(
+            reverse('batch'), {'requests': requests, 'parallel': True}, content_type='application/json'
+        )
+        self.assertEqual(parallel.json()['data'], sequential.json()['data'])
+        self.assertEqual([result['status'] for result in parallel.json()['data']], [200, 200, 200])
@@ -0,0 +1,135 @@
+"""
+In-process execution of batched API requests.
+
+run_batch() answers a list of sub-requests (method, path, query, optional
+JSON body and headers) by resolving each path with the URL resolver and
+calling the view directly. The outer request has already been through the
+middleware and authentication, so sub-requests inherit its user (through
+DRF's forced authentication), device and language instead of running them
+again, and the client pays one round-trip for the whole list.
+
+When every sub-request is a GET they may run concurrently on a small thread
+pool; anything else runs in order, so writes see each other. Sub-requests
+never run concurrently inside a transaction, whose uncommitted rows other
+threads' connections could not see.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, connections
+from django.urls import Resolver404, resolve
+from django.utils.http import urlencode
+
+from apps.shared.utils.renderers import RawJSON, render_with_raw
+
+logger = logging.getLogger(__name__)
+
+# Request attributes set by middleware that sub-requests inherit
+INHERITED_ATTRIBUTES = ('user', 'session', 'device_type', 'device_session', 'lang')
+# Response headers passed back with each result
+RETURNED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Location')
+# Headers a sub-request may not set: it shares the outer request's identity
+FORBIDDEN_HEADERS = {'authorization', 'cookie', 'host', 'content-length', 'content-type'}
+
+
+@dataclass
+class SubRequest:
+    method: str
+    path: str
+    query: Dict[str, Any] = field(default_factory=dict)
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    id: Optional[str] = None
+
+
+def _build_request(outer, sub: SubRequest) -> WSGIRequest:
+    body = b'' if sub.body is None else json.dumps(sub.body).encode()
+    environ = {
+        key: value for key, value in outer.META.items()
+        if key not in ('HTTP_AUTHORIZATION', 'HTTP_COOKIE', 'CONTENT_TYPE', 'CONTENT_LENGTH')
+    }
+    environ.update({
+        'REQUEST_METHOD': sub.method,
+        'PATH_INFO': sub.path,
+        'QUERY_STRING': urlencode(sub.query, doseq=True),
+        'wsgi.input': BytesIO(body),
+        'CONTENT_LENGTH': str(len(body)),
+        'CONTENT_TYPE': 'application/json',
+    })
+    for name, value in sub.headers.items():
+        if name.lower() in FORBIDDEN_HEADERS:
+            continue
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+    request = WSGIRequest(environ)
+    for attribute in INHERITED_ATTRIBUTES:
+        if hasattr(outer, attribute):
+            setattr(request, attribute, getattr(outer, attribute))
+    if outer.user.is_authenticated:
+        # Picked up by rest_framework.request.Request in place of the authenticators
+        request._force_auth_user = outer.user
+        request._force_auth_token = outer.auth
+    return request
+
+
+def _result(sub: SubRequest, status: int, body: Any, headers: Dict[str, str] = None) -> bytes:
+    return render_with_raw({'id': sub.id, 'status': status, 'headers': headers or {}, 'body': body})
+
+
+def _execute(outer, sub: SubRequest, batch_view) -> bytes:
+    try:
+        match = resolve(sub.path)
+    except Resolver404:
+        return _result(sub, 404, None)
+    if getattr(match.func, 'view_class', None) is batch_view:
+        return _result(sub, 400, {'detail': 'Batches cannot be nested.'})
+
+    try:
+        response = match.func(_build_request(outer, sub), *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+    except Exception:
+        logger.exception("Batched request %s %s failed", sub.method, sub.path)
+        return _result(sub, 500, None)
+
+    headers = {name: response[name] for name in RETURNED_HEADERS if response.has_header(name)}
+    if not content:
+        body = None
+    elif response.get('Content-Type', '').startswith('application/json'):
+        body = RawJSON(content)
+    else:
+        body = content.decode(response.charset, errors='replace')
+    return _result(sub, response.status_code, body, headers)
+
+
+def _execute_in_thread(outer, sub: SubRequest, batch_view) -> bytes:
+    try:
+        return _execute(outer, sub, batch_view)
+    finally:
+        # Connections are per thread; do not leave the pool's open
+        connections.close_all()
+
+
+def run_batch(outer, requests: List[SubRequest], batch_view, parallel: bool = False) -> RawJSON:
+    """Results of the sub-requests, in order, as a rendered JSON array."""
+    concurrent = (
+        parallel
+        and len(requests) > 1
+        and all(sub.method == 'GET' for sub in requests)
+        and not connection.in_atomic_block
+    )
+    if not concurrent:
+        return RawJSON.array([_execute(outer, sub, batch_view) for sub in requests])
+
+    workers = min(len(requests), getattr(settings, 'BATCH_MAX_WORKERS', 4))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda sub: _execute_in_thread(outer, sub, batch_view), requests))
+    return RawJSON.array(results)
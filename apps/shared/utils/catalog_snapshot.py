@@ -0,0 +1,525 @@
+"""
+Read-only binary snapshot of the public catalog, shared by every worker.
+
+Visible hotels, tours and excursions are written to one file: per section,
+NumPy columns (ids, created_at and updated_at in microseconds, section
+specific columns) and blob columns of pre-rendered JSON
+(apps.shared.utils.representations). Each worker mmaps the file and reads
+columns and payloads straight out of the mapping, so a node holds one copy
+of the catalog however many workers it runs.
+
+Every section has a generation in the default cache, bumped when a change to
+it (or to a row its payloads embed, see Representation.related) commits. The
+cache must be shared by every worker, or each would take the others' file
+for stale; a per-process one is refused at startup. Rebuilds are done by a
+background thread, CATALOG_SNAPSHOT_REBUILD_DELAY seconds after it is asked
+for, so a burst of changes is written once: only the sections whose
+generation differs from the file's are read from the database, the others
+are copied from the current file, and the result is written next to it and
+renamed over it. Requests keep reading the current file meanwhile; workers
+notice a new file with one os.stat() per request. Generations are compared
+at most every CATALOG_SNAPSHOT_CHECK_INTERVAL seconds, which carries changes
+to other nodes, and a file older than CATALOG_SNAPSHOT_MAX_AGE (writes that
+send no signals) is rebuilt whole. A lock file lets one worker per node
+rebuild at a time; the others pick up its file. Only a worker with no file
+to map builds on the request thread.
+
+A change made inside a transaction is kept out of the file until it
+commits: the thread making it reads from a private in-memory snapshot, with
+the sections it changed rebuilt, dropped when the transaction ends.
+
+File layout: MAGIC, header length (uint64 LE), JSON header, padding to 8
+bytes, then the column data; header offsets are relative to the data start.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.db import connection, connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+from apps.shared.utils import representations
+from apps.shared.utils.response_cache import check_shared_cache
+
+MAGIC = b'TRVSNAP3'
+GENERATION_KEY = 'catalog-snapshot:generation:{}'
+# Seconds after which a rebuild lock left by a dead process is broken
+LOCK_TIMEOUT = 600
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class Section:
+    model: str
+    # Filter selecting the publicly visible rows
+    filters: Dict[str, Any] = field(default_factory=dict)
+    # Import path of a function(instances) -> (columns, blobs) adding section specific data
+    extra: Optional[str] = None
+
+
+SECTIONS = {
+    'hotels': Section('hotels.Hotel', {'is_available': True}, extra='apps.hotels.services.catalog.snapshot_columns'),
+    'tours': Section('tours.Tour', {'status': True}),
+    'excursions': Section('excursions.Excursion', {'is_available': True}),
+}
+
+
+def to_micros(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+# Reading
+
+class BlobColumn:
+    """Variable-length byte strings stored as an offsets column plus one data block."""
+
+    def __init__(self, offsets: np.ndarray, data: memoryview):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index) -> memoryview:
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+
+
+class SnapshotSection:
+    """
+    One model's rows, sorted by (created_at, pk). `pk_sorted`/`pk_index`
+    map a pk to its row.
+    """
+
+    def __init__(self, buffer, spec: Dict[str, Any], start: int):
+        self.count = spec['count']
+        self.columns = {
+            name: np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=start + offset)
+            for name, (dtype, offset, count) in spec['columns'].items()
+        }
+        view = memoryview(buffer)
+        self.blobs = {
+            name: BlobColumn(
+                np.frombuffer(buffer, dtype=np.int64, count=self.count + 1, offset=start + offsets_at),
+                view[start + data_at:start + data_at + size],
+            )
+            for name, (offsets_at, data_at, size) in spec['blobs'].items()
+        }
+
+    def __len__(self):
+        return self.count
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def blob(self, name: str) -> BlobColumn:
+        return self.blobs[name]
+
+    @cached_property
+    def fingerprint(self) -> Tuple[Optional[datetime], int]:
+        """The newest updated_at and the number of rows."""
+        updated = self.columns['updated']
+        return (from_micros(updated.max()) if len(updated) else None), self.count
+
+    def find(self, pk: int) -> Optional[int]:
+        """Row of a pk, or None if it is not in the snapshot."""
+        pk_sorted = self.columns['pk_sorted']
+        i = int(np.searchsorted(pk_sorted, pk))
+        if i < len(pk_sorted) and pk_sorted[i] == pk:
+            return int(self.columns['pk_index'][i])
+        return None
+
+
+class MappedCatalog:
+    """A parsed snapshot over a buffer: an mmap of the file or in-memory bytes."""
+
+    def __init__(self, buffer, stat_key=None):
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError('not a catalog snapshot')
+        header_length = int.from_bytes(buffer[8:16], 'little')
+        header = json.loads(bytes(buffer[16:16 + header_length]))
+        start = 16 + header_length
+        start += -start % 8
+
+        self.buffer = buffer
+        self.stat_key = stat_key
+        self.generations = header['generations']
+        self.built_at = header['built_at']
+        self.sections = {
+            name: SnapshotSection(buffer, spec, start) for name, spec in header['sections'].items()
+        }
+
+    @classmethod
+    def open(cls, path: Path) -> 'MappedCatalog':
+        with open(path, 'rb') as f:
+            stat_key = _stat_key(os.fstat(f.fileno()))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, stat_key)
+
+
+def _stat_key(stat) -> Tuple[int, int, int]:
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+# Building
+
+def _build_section(section: Section) -> Tuple[Dict[str, np.ndarray], Dict[str, List[bytes]]]:
+    model = apps.get_model(section.model)
+    instances = list(model._default_manager.filter(**section.filters).order_by('created_at', 'pk'))
+
+    ids = np.fromiter((obj.pk for obj in instances), dtype=np.int64, count=len(instances))
+    by_pk = np.argsort(ids, kind='stable')
+    columns = {
+        'ids': ids,
+        'created': np.fromiter((to_micros(obj.created_at) for obj in instances), dtype=np.int64, count=len(instances)),
+        'updated': np.fromiter((to_micros(obj.updated_at) for obj in instances), dtype=np.int64, count=len(instances)),
+        'pk_sorted': ids[by_pk],
+        'pk_index': by_pk.astype(np.int64),
+    }
+
+    payloads = representations.stored_payloads(
+        model, [{'pk': obj.pk, 'updated_at': obj.updated_at} for obj in instances], ''
+    )
+    # An empty payload means "render this one live"
+    blobs = {'detail': [payloads.get(obj.pk) or b'' for obj in instances]}
+
+    if section.extra:
+        extra_columns, extra_blobs = import_string(section.extra)(instances)
+        columns.update(extra_columns)
+        blobs.update(extra_blobs)
+    return columns, blobs
+
+
+def _pack(items: List[bytes]) -> Tuple[np.ndarray, bytes]:
+    offsets = np.zeros(len(items) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in items], out=offsets[1:])
+    return offsets, b''.join(items)
+
+
+def build(generations: Dict[str, Any], previous: Optional[MappedCatalog] = None,
+          sections: Iterable[str] = SECTIONS) -> bytes:
+    """
+    Serialize the catalog to the snapshot format. Sections not listed in
+    `sections` are copied from `previous` instead of being read again.
+    """
+    sections = set(sections)
+    chunks = []
+    position = 0
+
+    def place(data) -> int:
+        nonlocal position
+        at = position
+        chunks.append(data)
+        position += len(data)
+        padding = -position % 8
+        if padding:
+            chunks.append(b'\0' * padding)
+            position += padding
+        return at
+
+    specs = {}
+    section_generations = {}
+    for name, section in SECTIONS.items():
+        if previous is not None and name not in sections and name in previous.sections:
+            copied = previous.sections[name]
+            columns = copied.columns
+            blobs = {blob_name: (blob.offsets, blob.data) for blob_name, blob in copied.blobs.items()}
+            section_generations[name] = previous.generations.get(name)
+        else:
+            columns, items = _build_section(section)
+            blobs = {blob_name: _pack(values) for blob_name, values in items.items()}
+            section_generations[name] = generations.get(name)
+
+        spec = {'count': len(columns['ids']), 'columns': {}, 'blobs': {}}
+        for column_name, values in columns.items():
+            values = np.ascontiguousarray(values)
+            spec['columns'][column_name] = [values.dtype.str, place(values.tobytes()), len(values)]
+        for blob_name, (offsets, data) in blobs.items():
+            spec['blobs'][blob_name] = [place(offsets.tobytes()), place(data), len(data)]
+        specs[name] = spec
+
+    header = json.dumps({
+        'generations': section_generations,
+        'built_at': time.time(),
+        'sections': specs,
+    }).encode()
+    prefix = MAGIC + len(header).to_bytes(8, 'little') + header
+    prefix += b'\0' * (-len(prefix) % 8)
+    return prefix + b''.join(chunks)
+
+
+# Process state
+
+def _still_open(blocks) -> bool:
+    """Whether the atomic blocks a private snapshot was built in are all still open."""
+    current = connection.atomic_blocks
+    return len(current) >= len(blocks) and all(a is b for a, b in zip(blocks, current))
+
+
+@contextmanager
+def _file_lock(path: Path, wait: bool):
+    """
+    Hold `path` as a lock shared by the processes of a node; yields False
+    instead of waiting if it is taken and `wait` is false.
+    """
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.stat(path).st_mtime > LOCK_TIMEOUT:
+                    # Left behind by a process that died while rebuilding
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if not wait:
+                yield False
+                return
+            time.sleep(0.05)
+        else:
+            break
+
+    os.close(fd)
+    try:
+        yield True
+    finally:
+        os.remove(path)
+
+
+class CatalogSnapshot:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Per thread: the sections changed since the last commit (`pending`) and,
+        # inside a transaction, `private`, a snapshot that may hold its
+        # uncommitted rows, with the sections changed since it was built
+        # (`outdated`) and the atomic blocks it belongs to
+        self._local = threading.local()
+        self._current: Optional[MappedCatalog] = None
+        self._checked_at = 0.0
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def path(self) -> Path:
+        # One file per database, so test runs never map the development catalog
+        database = str(settings.DATABASES['default']['NAME'])
+        digest = hashlib.sha1(database.encode()).hexdigest()[:12]
+        directory = Path(getattr(settings, 'CATALOG_SNAPSHOT_DIR', settings.BASE_DIR / 'var'))
+        return directory / f'catalog-{digest}.snapshot'
+
+    def _generations(self) -> Dict[str, Any]:
+        keys = {name: GENERATION_KEY.format(name) for name in SECTIONS}
+        found = cache.get_many(keys.values())
+        if len(found) < len(keys):
+            for key in keys.values():
+                cache.add(key, time.time_ns(), timeout=None)
+            found = cache.get_many(keys.values())
+        return {name: found.get(key) for name, key in keys.items()}
+
+    def _stale(self, current: Optional[MappedCatalog]) -> Set[str]:
+        """The sections of a file that are out of date."""
+        if current is None or time.time() - current.built_at > getattr(settings, 'CATALOG_SNAPSHOT_MAX_AGE', 300):
+            return set(SECTIONS)
+        generations = self._generations()
+        return {name for name in SECTIONS if current.generations.get(name) != generations[name]}
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            return _stat_key(os.stat(self.path))
+        except FileNotFoundError:
+            return None
+
+    def _transaction(self):
+        """This thread's state, reset when the transaction it belongs to has ended."""
+        local = self._local
+        blocks = getattr(local, 'blocks', None)
+        if not (connection.in_atomic_block and blocks and _still_open(blocks)):
+            local.blocks = list(connection.atomic_blocks)
+            local.private = None
+            local.outdated = set()
+        return local
+
+    def get(self) -> MappedCatalog:
+        """The snapshot this thread reads."""
+        local = self._transaction()
+        if local.private is not None and not local.outdated:
+            return local.private
+
+        if local.private is not None:
+            base, sections = local.private, local.outdated
+        else:
+            base = self._file()
+            if base is not None and not local.outdated:
+                return base
+            sections = local.outdated if base is not None else SECTIONS
+
+        # May hold uncommitted rows: keep it to this thread and transaction
+        local.private = MappedCatalog(build(self._generations(), base, sections))
+        local.outdated = set()
+        return local.private
+
+    def section(self, name: str) -> SnapshotSection:
+        return self.get().sections[name]
+
+    def _file(self) -> Optional[MappedCatalog]:
+        """
+        The mapped file, remapped if another worker replaced it. Out of date
+        sections are left to the background rebuild; only a worker with no
+        file (and outside a transaction) builds one here.
+        """
+        current = self._current
+        if current is None or self._stat() != current.stat_key:
+            current = self._map()
+        if current is None:
+            return None if connection.in_atomic_block else self._rebuild_stale(wait=True)
+
+        now = time.monotonic()
+        if self._timer is None and now - self._checked_at > getattr(settings, 'CATALOG_SNAPSHOT_CHECK_INTERVAL', 1):
+            self._checked_at = now
+            if self._stale(current):
+                self._schedule()
+        return current
+
+    def _map(self) -> Optional[MappedCatalog]:
+        try:
+            self._current = MappedCatalog.open(self.path)
+        except (FileNotFoundError, ValueError):
+            self._current = None
+        return self._current
+
+    def rebuild(self, sections: Iterable[str] = SECTIONS) -> MappedCatalog:
+        """Rebuild sections of the file, copying the others, and map it. Call outside transactions."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.path.with_name(f'{self.path.name}.lock'), wait=True):
+            return self._write(build(self._generations(), self._map(), sections))
+
+    def _rebuild_stale(self, wait: bool) -> Optional[MappedCatalog]:
+        """
+        Rebuild the out of date sections of the file, or return None if
+        another process holds the lock and `wait` is false.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.path.with_name(f'{self.path.name}.lock'), wait) as locked:
+            if not locked:
+                return None
+            # The file another worker may just have written
+            current = self._map()
+            stale = self._stale(current)
+            if not stale:
+                return current
+            return self._write(build(self._generations(), current, stale))
+
+    def _write(self, data: bytes) -> MappedCatalog:
+        path = self.path
+        temporary = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temporary, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        return self._map()
+
+    def _schedule(self):
+        """Start a background rebuild, unless one is already waiting to run."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(
+                getattr(settings, 'CATALOG_SNAPSHOT_REBUILD_DELAY', 0.5), self._rebuild_in_background
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _rebuild_in_background(self):
+        with self._lock:
+            self._timer = None
+        try:
+            if self._rebuild_stale(wait=False) is None:
+                # Another worker is rebuilding; look again once it is done
+                self._schedule()
+        finally:
+            connections.close_all()
+
+    def announce(self, name: str):
+        """
+        Record a change to a section: reads in this thread's transaction see
+        it, and once it commits the section's generation is bumped and the
+        file rebuilt in the background.
+        """
+        local = self._transaction()
+        if connection.in_atomic_block:
+            local.outdated.add(name)
+        local.pending = getattr(local, 'pending', set()) | {name}
+        transaction.on_commit(self._committed, robust=True)
+
+    def _committed(self):
+        # One generation bump per section for all the changes of a transaction
+        names = getattr(self._local, 'pending', set())
+        if not names:
+            return
+        self._local.pending = set()
+        for name in names:
+            key = GENERATION_KEY.format(name)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+        # Still inside an atomic block only when run by captureOnCommitCallbacks:
+        # the rows are not visible to other connections yet
+        if not connection.in_atomic_block:
+            self._schedule()
+
+
+catalog_snapshot = CatalogSnapshot()
+
+
+def _catalog_changed(sender, **kwargs):
+    for name, section in SECTIONS.items():
+        if section.model == sender._meta.label:
+            catalog_snapshot.announce(name)
+
+
+def _related_deleted(sender, **kwargs):
+    # Deleting it rewrites the rows pointing at it (SET_NULL) without a save
+    for name, section in SECTIONS.items():
+        model = apps.get_model(section.model)
+        representation = representations.REPRESENTATIONS.get(section.model)
+        for field_name in representation.related if representation else ():
+            if model._meta.get_field(field_name).related_model is sender:
+                catalog_snapshot.announce(name)
+
+
+def connect_signals():
+    check_shared_cache(DEFAULT_CACHE_ALIAS)
+    for name, section in SECTIONS.items():
+        model = apps.get_model(section.model)
+        post_save.connect(_catalog_changed, sender=model, dispatch_uid=f'catalog-snapshot-save-{name}')
+        post_delete.connect(_catalog_changed, sender=model, dispatch_uid=f'catalog-snapshot-delete-{name}')
+
+        representation = representations.REPRESENTATIONS.get(section.model)
+        for field_name in representation.related if representation else ():
+            related_model = model._meta.get_field(field_name).related_model
+            post_delete.connect(
+                _related_deleted,
+                sender=related_model,
+                dispatch_uid=f'catalog-snapshot-related-{related_model._meta.label}',
+            )
@@ -1,8 +1,21 @@
+import base64
+import json
+from datetime import datetime
+
+import numpy as np
+
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from rest_framework.pagination import PageNumberPagination
+from django.db import connections
+from django.db.models import F, Func, IntegerField, Q, Subquery
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 
 from rest_framework.response import Response
 
+# Primary keys are signed 64-bit integers in every supported database
+MIN_PK, MAX_PK = -2 ** 63, 2 ** 63 - 1
+
+
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 10
     page_query_param = 'page'
@@ -55,3 +68,252 @@ class CustomPageNumberPagination(PageNumberPagination):
             },
             'results': data
         })
+
+
+def estimate_count(queryset) -> int:
+    """
+    Return the planner's row estimate for a queryset.
+
+    PostgreSQL answers this from table statistics via EXPLAIN without touching
+    the rows. Other backends have no cheap estimate, so an exact COUNT(*) is used.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CustomCursorPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    A page is located with a WHERE clause on the (created_at, id) pair of the
+    last row the client has seen instead of OFFSET, so the cost of a page does
+    not grow with its depth and no COUNT(*) is issued. Cursors are opaque
+    tokens; a total is only computed when the client asks for it with
+    ?total=estimated or ?total=exact.
+
+    With count_in_query set, every page counts the whole result set (before
+    the cursor's WHERE clause) with a scalar COUNT subquery in the same query
+    that reads the page, so no separate count is issued. The total is never
+    carried in the cursor: cursors come from the client and could forge it.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+    ordering_field = 'created_at'
+    count_in_query = False
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page = None
+        self.request = None
+        self.next_position = None
+        self.prev_position = None
+        self.total = None
+        self.total_is_estimate = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        unpaged = queryset
+        if self.count_in_query:
+            self.total_is_estimate = False
+            queryset = queryset.annotate(_query_total=Subquery(
+                queryset.order_by().annotate(
+                    _count=Func(F('pk'), function='COUNT', output_field=IntegerField())
+                ).values('_count')
+            ))
+        else:
+            self.total = self.get_total(queryset, request)
+
+        field = self.ordering_field
+        if reverse:
+            queryset = queryset.order_by(field, 'pk')
+        else:
+            queryset = queryset.order_by(f'-{field}', '-pk')
+
+        if position is not None:
+            value, pk = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk})
+                )
+
+        # One extra row tells us whether another page exists in this direction.
+        rows = list(queryset[:page_size + 1])
+        if self.count_in_query:
+            if rows:
+                self.total = rows[0]['_query_total'] if isinstance(rows[0], dict) else rows[0]._query_total
+            else:
+                # No row to read it from, past the end of the results
+                self.total = unpaged.count() if position is not None else 0
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        if position is None:
+            has_next, has_prev = has_more, False
+        elif reverse:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, True
+
+        if rows:
+            self.next_position = self.get_position(rows[-1]) if has_next else None
+            self.prev_position = self.get_position(rows[0]) if has_prev else None
+        else:
+            # Nothing left on this side of the cursor; point back where we came from.
+            self.next_position = position if reverse else None
+            self.prev_position = position if not reverse else None
+
+        self.page = rows
+        return rows
+
+    def paginate_sorted(self, keys, ids, request, to_key, to_value):
+        """
+        Page through rows held in memory instead of a queryset.
+
+        `keys` (integer ordering values) and `ids` are parallel NumPy arrays
+        sorted ascending by (key, id); `to_key` and `to_value` convert between
+        the ordering field's values and keys. Returns the page's row
+        positions, newest first, with cursors and total set the way
+        paginate_queryset() sets them, so the two share their cursors.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        count = len(ids)
+
+        self.total_is_estimate = False
+        mode = request.query_params.get(self.total_query_param)
+        self.total = count if self.count_in_query or mode in ('exact', 'estimated') else None
+
+        def bisect(key, pk, side):
+            lo = int(np.searchsorted(keys, key, side='left'))
+            hi = int(np.searchsorted(keys, key, side='right'))
+            return lo + int(np.searchsorted(ids[lo:hi], pk, side=side))
+
+        # One extra row tells us whether another page exists in this direction.
+        if reverse:
+            start = bisect(to_key(position[0]), position[1], 'right')
+            rows = list(range(start, min(count, start + page_size + 1)))
+        else:
+            end = count if position is None else bisect(to_key(position[0]), position[1], 'left')
+            rows = list(range(end - 1, max(0, end - page_size - 1) - 1, -1))
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        if position is None:
+            has_next, has_prev = has_more, False
+        elif reverse:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, True
+
+        def position_of(row):
+            return to_value(keys[row]), int(ids[row])
+
+        if rows:
+            self.next_position = position_of(rows[-1]) if has_next else None
+            self.prev_position = position_of(rows[0]) if has_prev else None
+        else:
+            self.next_position = position if reverse else None
+            self.prev_position = position if not reverse else None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        raw_size = request.query_params.get(self.page_size_query_param)
+        if raw_size is None:
+            return self.page_size
+        try:
+            size = int(raw_size)
+        except (TypeError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_total(self, queryset, request):
+        mode = request.query_params.get(self.total_query_param)
+        if mode == 'exact':
+            self.total_is_estimate = False
+            return queryset.count()
+        if mode == 'estimated':
+            self.total_is_estimate = connections[queryset.db].vendor == 'postgresql'
+            return estimate_count(queryset)
+        return None
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            # Row of a values() queryset projected with the ordering field and 'pk'
+            return item[self.ordering_field], item['pk']
+        return getattr(item, self.ordering_field), item.pk
+
+    def encode_cursor(self, position, reverse=False):
+        if position is None:
+            return None
+        value, pk = position
+        payload = {'v': value.isoformat(), 'i': pk}
+        if reverse:
+            payload['r'] = 1
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            value = datetime.fromisoformat(payload['v'])
+            pk = int(payload['i'])
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, AttributeError, OverflowError):
+            raise NotFound(self.invalid_cursor_message)
+        if not MIN_PK <= pk <= MAX_PK:
+            # Out of range of the database's integer column
+            raise NotFound(self.invalid_cursor_message)
+
+        return (value, pk), reverse
+
+    def get_pagination_meta(self):
+        meta = {
+            'next_cursor': self.encode_cursor(self.next_position),
+            'prev_cursor': self.encode_cursor(self.prev_position, reverse=True),
+            'page_size': len(self.page or []),
+        }
+        if self.total is not None:
+            meta['total_items'] = self.total
+            meta['total_is_estimate'] = self.total_is_estimate
+        return meta
+
+    def get_paginated_response(self, data):
+        return Response({
+            'pagination': self.get_pagination_meta(),
+            'results': data
+        })
@@ -1,11 +1,14 @@
+import json
 import logging
-from dataclasses import dataclass
-from typing import Dict, Any, Optional, Union
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, Optional, Union
 
+from django.http import StreamingHttpResponse
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from apps.shared.exceptions.translator import get_message_detail
+from apps.shared.exceptions.translator import MessageDetail, get_message_detail, negotiate_language
+from apps.shared.utils.renderers import FastJSONRenderer, MessagePackRenderer, RawJSON, render_with_raw
 
 logger = logging.getLogger(__name__)
 
@@ -16,23 +19,31 @@ class ResponseBody:
     message_key: str
     request: Optional[Request] = None
     context: Optional[Dict[str, Any]] = None
+    _detail: Optional[MessageDetail] = field(default=None, init=False, repr=False)
 
     def get_language(self) -> str:
         """
-        Extract language from request headers.
-        Supports Accept-Language header with quality values.
+        Negotiate the message language from the Accept-Language header.
+        Quality values are honoured; results are memoized per header value.
 
         Examples:
-            'en-US,en;q=0.9' -> 'en-US'
-            'uz' -> 'uz'
+            'en-US,en;q=0.9' -> 'en'
+            'ru;q=0.5, uz' -> 'uz'
         """
         if self.request and hasattr(self.request, 'headers'):
-            accept_lang = self.request.headers.get('Accept-Language', 'en')
-            # Parse Accept-Language header (remove quality values)
-            lang = accept_lang.split(';')[0].split(',')[0].strip()
-            return lang
+            return negotiate_language(self.request.headers.get('Accept-Language', 'en'))
         return 'en'
 
+    def get_message_detail(self) -> MessageDetail:
+        """Resolve id, text and status code in a single catalog lookup"""
+        if self._detail is None:
+            self._detail = get_message_detail(
+                message_key=self.message_key,
+                lang=self.get_language(),
+                context=self.context
+            )
+        return self._detail
+
     def to_dict(self, **kwargs) -> Dict[str, Any]:
         """
         Convert to response dictionary with translated message.
@@ -43,12 +54,7 @@ class ResponseBody:
         Returns:
             Dictionary with message details and any additional fields
         """
-        lang = self.get_language()
-        message_detail = get_message_detail(
-            message_key=self.message_key,
-            lang=lang,
-            context=self.context
-        )
+        message_detail = self.get_message_detail()
 
         response_body = {
             "id": message_detail["id"],
@@ -60,13 +66,42 @@ class ResponseBody:
 
     def get_status_code(self) -> int:
         """Get the HTTP status code for this message"""
-        lang = self.get_language()
-        message_detail = get_message_detail(
-            message_key=self.message_key,
-            lang=lang,
-            context=self.context
+        return self.get_message_detail()["status_code"]
+
+
+class PrerenderedResponse(Response):
+    """
+    DRF Response whose body is already rendered JSON and is sent as is.
+    `data` decodes the body on first access, for code that inspects it; a
+    MessagePack client gets that data re-encoded.
+    """
+
+    def __init__(self, content: bytes, status: int = None, headers=None):
+        self.content_bytes = content
+        super().__init__(
+            data=None,
+            status=status,
+            headers=headers,
+            content_type=FastJSONRenderer.media_type
         )
-        return message_detail["status_code"]
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = json.loads(self.content_bytes)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        if isinstance(getattr(self, 'accepted_renderer', None), MessagePackRenderer):
+            self.content_type = None
+            return super().rendered_content
+        self['Content-Type'] = self.content_type
+        return self.content_bytes
 
 
 class CustomResponse:
@@ -117,6 +152,98 @@ class CustomResponse:
 
         return Response(body, status=final_status)
 
+    @staticmethod
+    def stream(
+            rows: Iterable[Any],
+            message_key: str = "SUCCESS_MESSAGE",
+            request: Request = None,
+            context: Dict[str, Any] = None,
+            status_code: int = None,
+            buffer_size: int = 64 * 1024,
+            **kwargs
+    ) -> StreamingHttpResponse:
+        """
+        Create a success response whose data list is rendered row by row.
+
+        The body has the same shape as success(): id, message, data and any
+        additional fields. Rows are consumed lazily while the response is
+        sent, so memory does not grow with their number.
+
+        Args:
+            rows: Iterable of JSON-serializable items for "data"
+            message_key: Key for message template (default: SUCCESS_MESSAGE)
+            request: Django REST Framework request object
+            context: Variables for message template formatting
+            status_code: Override status code from message template
+            buffer_size: Bytes collected before a chunk is sent
+            **kwargs: Additional fields to include after "data"
+        """
+        body_maker = ResponseBody(
+            message_key=message_key,
+            request=request,
+            context=context
+        )
+        renderer = FastJSONRenderer()
+        head = renderer.render(body_maker.to_dict())
+        tail = renderer.render(kwargs)
+
+        def chunks():
+            # '{"id":..,"message":..' + ',"data":[' + rows + ']' + ',<kwargs>' + '}'
+            buffer = bytearray(head[:-1])
+            buffer += b',"data":['
+            separator = b''
+            for row in rows:
+                buffer += separator
+                buffer += renderer.render(row)
+                separator = b','
+                if len(buffer) >= buffer_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+            buffer += b']'
+            buffer += b',' + tail[1:] if kwargs else b'}'
+            yield bytes(buffer)
+
+        return StreamingHttpResponse(
+            chunks(),
+            status=status_code or body_maker.get_status_code(),
+            content_type=renderer.media_type
+        )
+
+    @staticmethod
+    def prerendered(
+            data: RawJSON,
+            message_key: str = "SUCCESS_MESSAGE",
+            request: Request = None,
+            context: Dict[str, Any] = None,
+            status_code: int = None,
+            **kwargs
+    ) -> PrerenderedResponse:
+        """
+        Create a success response around already rendered JSON.
+
+        The body is byte-identical to success() with the decoded data, but
+        "data" is spliced in as is instead of being serialized again.
+
+        Args:
+            data: Rendered JSON for "data"
+            message_key: Key for message template (default: SUCCESS_MESSAGE)
+            request: Django REST Framework request object
+            context: Variables for message template formatting
+            status_code: Override status code from message template
+            **kwargs: Additional fields to include in response
+        """
+        body_maker = ResponseBody(
+            message_key=message_key,
+            request=request,
+            context=context
+        )
+        body = body_maker.to_dict(data=data, **kwargs)
+
+        return PrerenderedResponse(
+            render_with_raw(body),
+            status=status_code or body_maker.get_status_code()
+        )
+
     @staticmethod
     def error(
             message_key: str,
@@ -0,0 +1,84 @@
+"""
+Cached device-token resolution for mobile requests.
+
+Mobile clients send a Device-Token header on every request. Instead of
+loading the Device row each time, the token is mapped to a small immutable
+DeviceSession record kept in the Django cache for DEVICE_SESSION_CACHE_TIMEOUT
+seconds and memoized on the request, so a token is resolved at most once
+per request and usually not at all.
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+DEVICE_SESSION_KEY_PREFIX = 'device-session:'
+
+
+@dataclass(frozen=True)
+class DeviceSession:
+    """The subset of a Device needed to serve a request."""
+    id: int
+    user_id: Optional[int]
+    language: str
+    is_active: bool
+
+
+def _normalize_token(device_token) -> Optional[str]:
+    try:
+        return str(uuid.UUID(str(device_token)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _cache_key(token: str) -> str:
+    return f"{DEVICE_SESSION_KEY_PREFIX}{token}"
+
+
+def get_device_session(device_token, request=None) -> Optional[DeviceSession]:
+    """
+    Resolve a device token to its DeviceSession, or None if no device has it.
+
+    Args:
+        device_token: Value of the Device-Token header
+        request: Django or DRF request used to memoize the lookup
+
+    Returns:
+        DeviceSession or None
+    """
+    token = _normalize_token(device_token)
+    if token is None:
+        return None
+
+    sessions = None
+    if request is not None:
+        http_request = getattr(request, '_request', request)
+        sessions = http_request.__dict__.setdefault('_device_sessions', {})
+        if token in sessions:
+            return sessions[token]
+
+    session = cache.get(_cache_key(token))
+    if session is None:
+        from apps.users.models.device import Device
+
+        row = Device.objects.filter(device_token=token).values_list(
+            'id', 'user_id', 'language', 'is_active'
+        ).first()
+        if row is not None:
+            session = DeviceSession(*row)
+            cache.set(_cache_key(token), session, getattr(settings, 'DEVICE_SESSION_CACHE_TIMEOUT', 300))
+
+    if sessions is not None:
+        sessions[token] = session
+    return session
+
+
+def invalidate_device_sessions(*device_tokens) -> None:
+    """Drop cached sessions after a device is updated or logged out."""
+    tokens = [_normalize_token(token) for token in device_tokens]
+    keys = [_cache_key(token) for token in tokens if token is not None]
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,219 @@
+"""
+Geohash helpers for nearby search and map clustering.
+
+A geohash interleaves longitude and latitude bits into a base32 string, so
+every prefix is a grid cell and points in the same cell share the prefix. A
+radius search becomes a handful of indexed `geohash LIKE 'prefix%'` range
+scans over the cells covering the circle's bounding box, followed by an
+exact haversine check on the few candidates.
+"""
+
+import math
+from typing import Iterable, List, Optional, Set, Tuple
+
+from django.db.models import Avg, Count, Min, Q
+from django.db.models.functions import Substr
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9
+
+# Upper bound on cells used to cover a search box before falling back to a coarser grid.
+MAX_COVER_CELLS = 16
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bit, ch, even = 0, 0, True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                ch |= 1 << (4 - bit)
+                lon_range[0] = mid
+            else:
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                ch |= 1 << (4 - bit)
+                lat_range[0] = mid
+            else:
+                lat_range[1] = mid
+        even = not even
+
+        if bit < 4:
+            bit += 1
+        else:
+            chars.append(BASE32[ch])
+            bit, ch = 0, 0
+
+    return ''.join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a geohash cell in degrees."""
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(latitude: float, longitude: float, radius_km: float) -> List[Tuple[float, float, float, float]]:
+    """
+    (min_lat, min_lon, max_lat, max_lon) boxes covering a circle: one box, or
+    two when the circle crosses the antimeridian, one on each side of it.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    d_lon = 180.0 if cos_lat < 1e-6 else min(180.0, d_lat / cos_lat)
+    min_lat, max_lat = max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat)
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+
+    if d_lon >= 180.0:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+    if min_lon < -180.0:
+        return [(min_lat, min_lon + 360.0, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon - 360.0)]
+    return [(min_lat, min_lon, max_lat, max_lon)]
+
+
+def _cells(box: Tuple[float, float, float, float], precision: int, limit: int) -> Optional[Set[str]]:
+    min_lat, min_lon, max_lat, max_lon = box
+    height, width = cell_size(precision)
+
+    rows = int(max_lat // height - min_lat // height) + 1
+    cols = int(max_lon // width - min_lon // width) + 1
+    if rows * cols > limit:
+        return None
+
+    cells = set()
+    for row in range(rows):
+        lat = min(max_lat, min_lat + row * height)
+        for col in range(cols):
+            lon = min(max_lon, min_lon + col * width)
+            cells.add(encode_geohash(lat, lon, precision))
+    return cells
+
+
+def covering_prefixes(box: Tuple[float, float, float, float], max_cells: int = MAX_COVER_CELLS) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover the box, using the finest
+    precision that needs at most `max_cells` cells.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cells = _cells(box, precision, max_cells)
+        if cells is not None:
+            return sorted(cells)
+    return []  # the whole world
+
+
+def zoom_to_precision(zoom: int) -> int:
+    """Geohash precision giving a few dozen cells across a typical map viewport."""
+    return max(1, min(GEOHASH_PRECISION, (zoom + 3) // 2))
+
+
+def coordinates_from_location(location) -> Optional[Tuple[float, float]]:
+    """Read (lat, lon) from a Device.visit_location payload, if it holds any."""
+    if not isinstance(location, dict):
+        return None
+
+    lat = next((location[key] for key in ('latitude', 'lat') if key in location), None)
+    lon = next((location[key] for key in ('longitude', 'lng', 'lon') if key in location), None)
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        return lat, lon
+    return None
+
+
+def prefix_filter(prefixes: Iterable[str]):
+    """Q matching rows whose geohash starts with any of the prefixes."""
+    query = Q()
+    for prefix in prefixes:
+        query |= Q(geohash__startswith=prefix)
+    return query
+
+
+# Radii tried in turn for a nearest-N search without an explicit radius.
+NEAREST_SEARCH_RADII_KM = (5, 25, 100, 500)
+MAX_RADIUS_KM = NEAREST_SEARCH_RADII_KM[-1]
+
+
+def find_nearby(queryset, latitude: float, longitude: float, radius_km: float = None, limit: int = 20):
+    """
+    Nearest `limit` rows of a GeoLocatedModel queryset as (distance_km, obj)
+    pairs, closest first, and the radius that was searched.
+
+    With no radius the search widens through NEAREST_SEARCH_RADII_KM until
+    it has `limit` rows. Each step reads only the geohash cells covering the
+    circle's bounding boxes, split at the antimeridian.
+    """
+    radii = (radius_km,) if radius_km else NEAREST_SEARCH_RADII_KM
+    results = []
+
+    for radius in radii:
+        area = Q()
+        for box in bounding_boxes(latitude, longitude, radius):
+            min_lat, min_lon, max_lat, max_lon = box
+            area |= Q(
+                prefix_filter(covering_prefixes(box)),
+                latitude__range=(min_lat, max_lat),
+                longitude__range=(min_lon, max_lon),
+            )
+        candidates = queryset.filter(area)
+
+        results = []
+        for obj in candidates:
+            distance = haversine_km(latitude, longitude, obj.latitude, obj.longitude)
+            if distance <= radius:
+                results.append((distance, obj))
+        results.sort(key=lambda item: (item[0], item[1].pk))
+
+        if len(results) >= limit:
+            break
+
+    return results[:limit], radius
+
+
+def cluster_markers(queryset, box: Tuple[float, float, float, float], zoom: int) -> List[dict]:
+    """
+    Group the rows inside a viewport into geohash grid cells sized for the
+    zoom level, in one GROUP BY query. A cell holding one row carries its id.
+    """
+    min_lat, min_lon, max_lat, max_lon = box
+    precision = zoom_to_precision(zoom)
+    cells = (
+        queryset
+        .filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+        .exclude(geohash='')
+        .annotate(cell=Substr('geohash', 1, precision))
+        .values('cell')
+        .annotate(count=Count('pk'), lat=Avg('latitude'), lng=Avg('longitude'), first_id=Min('pk'))
+        .order_by('cell')
+    )
+    return [
+        {
+            'cell': row['cell'],
+            'count': row['count'],
+            'latitude': round(row['lat'], 6),
+            'longitude': round(row['lng'], 6),
+            'id': row['first_id'] if row['count'] == 1 else None,
+        }
+        for row in cells
+    ]
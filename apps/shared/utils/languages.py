@@ -0,0 +1,24 @@
+"""
+Project language registry.
+
+Everything that fans out per language (translated serializer fields, media
+lookups) iterates these four languages from apps.shared.models.Language
+instead of Django's default LANGUAGES list of ~100 entries.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from apps.shared.models import Language
+
+# (code, label) pairs, e.g. ("RU", "Russian")
+LANGUAGES: Tuple[Tuple[str, str], ...] = tuple(Language.choices)
+
+# Lower-case suffixes used in translated field names, e.g. "title_ru"
+LANGUAGE_CODES: Tuple[str, ...] = tuple(code.lower() for code, _ in LANGUAGES)
+
+
+@lru_cache(maxsize=None)
+def translated_field_names(field_name: str) -> Tuple[str, ...]:
+    """Return the per-language names of a field, e.g. ("title_ru", "title_en", ...)."""
+    return tuple(f"{field_name}_{code}" for code in LANGUAGE_CODES)
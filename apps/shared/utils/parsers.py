@@ -0,0 +1,15 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from apps.shared.utils.renderers import msgpack
+
+
+class MessagePackParser(BaseParser):
+    """Parses MessagePack request bodies (Content-Type: application/msgpack)."""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
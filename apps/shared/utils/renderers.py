@@ -0,0 +1,103 @@
+import re
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is listed in requirements.txt
+    msgpack = None
+
+# orjson writes some floats unlike float.__repr__: exponents (1e16 for 1e+16,
+# 1e-7 for 1e-07) and 1e-5 <= |x| < 1e-4 (0.00001 for 1e-05). Such output is
+# rendered again by JSONRenderer; a false hit inside a string only costs that.
+_EXPONENT = re.compile(rb'e-?\d+(?:[,\]}]|$)')
+_SMALL_FLOAT = b'0.0000'
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Output matches DRF's JSONRenderer byte for byte: datetimes, Decimals, lazy
+    strings and other types orjson does not know are passed to DRF's
+    JSONEncoder, and floats orjson would format differently send the payload
+    to the stdlib renderer. Indented output, ASCII-only output or an
+    unsupported payload fall back to it as well, as does a missing orjson
+    install. The one difference: NaN and Infinity, which JSONRenderer refuses
+    with a ValueError in strict mode, are written as null.
+    """
+    _options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if orjson is not None else 0
+    )
+    _default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if orjson is None or indent or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._default, option=self._options)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _SMALL_FLOAT in ret or _EXPONENT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict javascript subset, as JSONRenderer does.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer for clients that send Accept: application/msgpack.
+
+    Types MessagePack has no encoding for (datetimes, Decimals, UUIDs, lazy
+    strings) are passed to DRF's JSONEncoder, so each value decodes to what
+    the JSON body would hold.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    _default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self._default, use_bin_type=True)
+
+
+class RawJSON(bytes):
+    """Already rendered JSON, inserted verbatim by render_with_raw()."""
+
+    @classmethod
+    def array(cls, items) -> 'RawJSON':
+        return cls(b'[' + b','.join(items) + b']')
+
+
+def render_with_raw(data: dict) -> bytes:
+    """
+    Render a top-level dict whose values may be RawJSON, byte for byte as
+    FastJSONRenderer would render it with those values decoded in place.
+    """
+    renderer = FastJSONRenderer()
+    members = []
+    for key, value in data.items():
+        if isinstance(value, RawJSON):
+            members.append(renderer.render(key) + b':' + value)
+        else:
+            members.append(renderer.render({key: value})[1:-1])
+    return b'{' + b','.join(members) + b'}'
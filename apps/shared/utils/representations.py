@@ -0,0 +1,332 @@
+"""
+Pre-rendered JSON of catalog objects.
+
+Hotels, tours, excursions and blog posts change far less often than they are
+read, so the JSON their detail serializer produces is kept per object (and
+per language, for serializers whose output depends on it) in
+RenderedRepresentation. Saving an object re-renders it once the transaction
+commits; list and detail views then splice the stored bytes into the
+response instead of running the serializer.
+
+Image URLs are absolute and depend on the requested host, so payloads are
+rendered against ORIGIN_PLACEHOLDER and the placeholder is swapped for the
+request's origin when served. A payload is only stored if the placeholder
+occurs nowhere but in those URLs.
+
+Every read carries the row's updated_at, and a payload rendered from an
+older updated_at (queryset.update() sends no signals) is rendered on the
+spot instead, as is a missing one. Reads never store what they render:
+payloads are only written by saves and by the rebuild_representations
+command, which brings such rows back into the store. Writes that change the
+output without touching updated_at are covered explicitly: deleting a
+related row the payload embeds (`related`) drops the payloads of the rows
+pointing at it, and adding, changing or deleting an object's Media rows
+(its translated images) saves the object's updated_at once the transaction
+commits, so its payload, cached responses and snapshot rows follow and
+syncing clients fetch it again.
+"""
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.utils.module_loading import import_string
+
+from apps.shared.mixins.translation_mixins import TranslatedFieldsReadMixin
+from apps.shared.models import Media, RenderedRepresentation
+from apps.shared.utils.compiled_serializer import compile_serializer
+from apps.shared.utils.languages import LANGUAGE_CODES
+from apps.shared.utils.renderers import FastJSONRenderer
+
+ORIGIN_PLACEHOLDER = 'https://origin.invalid'
+_PLACEHOLDER = ORIGIN_PLACEHOLDER.encode()
+
+# Per thread: the Media owners to save when the current transaction commits
+_local = threading.local()
+
+
+@dataclass(frozen=True)
+class Representation:
+    serializer: str
+    # Foreign keys whose target's deletion rewrites the row (SET_NULL) without a save
+    related: Tuple[str, ...] = ()
+
+
+REPRESENTATIONS = {
+    'hotels.Hotel': Representation('apps.hotels.serializers.hotel_serializer.HotelSerializer'),
+    'tours.Tour': Representation('apps.tours.serializers.tour_serializer.TourSerializer', related=('hotel',)),
+    'excursions.Excursion': Representation('apps.excursions.serializers.excursion_serializer.ExcursionSerializer'),
+    'blog.BlogPost': Representation('apps.blog.serializers.blog_serializer.BlogPostSerializer', related=('category',)),
+}
+
+
+class _RenderRequest:
+    """The parts of a request serializers read, with a fixed origin."""
+
+    def __init__(self, language: str, origin: str):
+        self.lang = language or None
+        self.device_type = 'MOBILE' if language else 'WEB'
+        self.origin = origin
+
+    def build_absolute_uri(self, location: str) -> str:
+        if location.startswith('/') and not location.startswith('//'):
+            return self.origin + location
+        return location
+
+
+@lru_cache(maxsize=None)
+def get_serializer_class(model):
+    return import_string(REPRESENTATIONS[model._meta.label].serializer)
+
+
+def is_translated(model) -> bool:
+    return issubclass(get_serializer_class(model), TranslatedFieldsReadMixin)
+
+
+def languages_for(model) -> Tuple[str, ...]:
+    """Languages payloads are stored in; '' is the language-neutral (web) payload."""
+    return ('',) + LANGUAGE_CODES if is_translated(model) else ('',)
+
+
+def request_language(model, request) -> Optional[str]:
+    """The stored language answering this request, or None if it must be rendered live."""
+    if not is_translated(model):
+        return ''
+    lang = getattr(request, 'lang', None)
+    if getattr(request, 'device_type', 'WEB') != 'MOBILE' or not lang:
+        return ''
+    return lang if lang in LANGUAGE_CODES else None
+
+
+def serialize(model, instances: List[Any], request, serializer_class=None) -> List[Dict[str, Any]]:
+    serializer_class = serializer_class or get_serializer_class(model)
+    try:
+        compiled = compile_serializer(serializer_class)
+    except ImproperlyConfigured:
+        return serializer_class(instances, many=True, context={'request': request}).data
+    return compiled.many([compiled.instance_values(obj) for obj in instances], request)
+
+
+def render(model, instances: List[Any], language: str, serializer_class=None) -> List[Optional[bytes]]:
+    """
+    Placeholder payloads of the instances in one language, by default with the
+    model's registered serializer; None where one cannot be stored.
+    """
+    renderer = FastJSONRenderer()
+    payloads = [
+        renderer.render(item)
+        for item in serialize(
+            model, instances, _RenderRequest(language, ORIGIN_PLACEHOLDER), serializer_class
+        )
+    ]
+    if not any(_PLACEHOLDER in payload for payload in payloads):
+        return payloads
+
+    # Without the placeholder every URL must come out relative; text that
+    # itself contains the placeholder would not.
+    relative = serialize(model, instances, _RenderRequest(language, ''), serializer_class)
+    return [
+        payload if _PLACEHOLDER not in payload or payload.replace(_PLACEHOLDER, b'') == renderer.render(item)
+        else None
+        for payload, item in zip(payloads, relative)
+    ]
+
+
+def refresh(model, instances: Iterable[Any]) -> Dict[Tuple[int, str], Optional[bytes]]:
+    """Render and store the payloads of the instances in every language."""
+    instances = list(instances)
+    if not instances:
+        return {}
+
+    content_type = ContentType.objects.get_for_model(model)
+    payloads = {}
+    for language in languages_for(model):
+        for obj, payload in zip(instances, render(model, instances, language)):
+            payloads[obj.pk, language] = payload
+
+    unstorable = [pk for (pk, _), payload in payloads.items() if payload is None]
+    if unstorable:
+        RenderedRepresentation.objects.filter(content_type=content_type, object_id__in=unstorable).delete()
+
+    updated_at = {obj.pk: obj.updated_at for obj in instances}
+    RenderedRepresentation.objects.bulk_create(
+        [
+            RenderedRepresentation(
+                content_type=content_type,
+                object_id=pk,
+                language=language,
+                payload=payload,
+                source_updated_at=updated_at[pk],
+            )
+            for (pk, language), payload in payloads.items()
+            if payload is not None
+        ],
+        update_conflicts=True,
+        unique_fields=['content_type', 'object_id', 'language'],
+        update_fields=['payload', 'source_updated_at', 'rendered_at'],
+    )
+    return payloads
+
+
+def stored_payloads(model, rows: Iterable[Dict[str, Any]], language: str) -> Dict[int, Optional[bytes]]:
+    """
+    Placeholder payloads, by pk, of the objects behind values() rows carrying
+    'pk' and 'updated_at'. Missing and outdated ones are rendered without
+    being stored; None marks an object that cannot be stored.
+    """
+    rows = list(rows)
+    if not rows:
+        return {}
+
+    stored = {
+        object_id: (source_updated_at, bytes(payload))
+        for object_id, source_updated_at, payload in RenderedRepresentation.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id__in=[row['pk'] for row in rows],
+            language=language,
+        ).values_list('object_id', 'source_updated_at', 'payload')
+    }
+
+    payloads = {}
+    for row in rows:
+        source_updated_at, payload = stored.get(row['pk'], (None, None))
+        if payload is not None and source_updated_at == row['updated_at']:
+            payloads[row['pk']] = payload
+
+    missing = [row['pk'] for row in rows if row['pk'] not in payloads]
+    if missing:
+        instances = list(model._default_manager.filter(pk__in=missing))
+        payloads.update(zip([obj.pk for obj in instances], render(model, instances, language)))
+    return payloads
+
+
+def with_origin(payload: bytes, request) -> bytes:
+    """A stored payload with its placeholder URLs made absolute for the request."""
+    return payload.replace(_PLACEHOLDER, request.build_absolute_uri('/')[:-1].encode())
+
+
+def render_live(model, pks: Iterable[int], request, serializer_class=None) -> Dict[int, bytes]:
+    """JSON of the objects, by pk, rendered by the serializer for this request."""
+    instances = list(model._default_manager.filter(pk__in=list(pks)))
+    renderer = FastJSONRenderer()
+    return {
+        obj.pk: renderer.render(item)
+        for obj, item in zip(instances, serialize(model, instances, request, serializer_class))
+    }
+
+
+def relative_payloads(model, rows: Iterable[Dict[str, Any]], language: str) -> Dict[int, bytes]:
+    """
+    JSON by pk of the objects behind values() rows, with site-relative URLs,
+    for output built without a request.
+    """
+    rows = list(rows)
+    payloads = {
+        pk: payload.replace(_PLACEHOLDER, b'')
+        for pk, payload in stored_payloads(model, rows, language).items()
+        if payload is not None
+    }
+    live = [row['pk'] for row in rows if row['pk'] not in payloads]
+    if live:
+        payloads.update(render_live(model, live, _RenderRequest(language, '')))
+    return payloads
+
+
+def render_rows(model, rows: Iterable[Dict[str, Any]], request) -> List[bytes]:
+    """
+    JSON of the objects behind values() rows carrying 'pk' and 'updated_at',
+    in row order, from the store where it is current.
+    """
+    rows = list(rows)
+    language = request_language(model, request)
+    payloads = {}
+    if language is not None:
+        payloads = {
+            pk: with_origin(payload, request)
+            for pk, payload in stored_payloads(model, rows, language).items()
+            if payload is not None
+        }
+
+    live = [row['pk'] for row in rows if row['pk'] not in payloads]
+    if live:
+        payloads.update(render_live(model, live, request))
+
+    return [payloads[row['pk']] for row in rows if row['pk'] in payloads]
+
+
+# Signals
+
+def _refresh_on_commit(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: refresh(sender, sender._default_manager.filter(pk=pk)),
+        robust=True,
+    )
+
+
+def _delete_representations(sender, instance, **kwargs):
+    RenderedRepresentation.objects.filter(
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=instance.pk,
+    ).delete()
+
+
+def _delete_dependent_representations(sender, instance, **kwargs):
+    for label, representation in REPRESENTATIONS.items():
+        model = apps.get_model(label)
+        for field_name in representation.related:
+            if model._meta.get_field(field_name).related_model is sender:
+                RenderedRepresentation.objects.filter(
+                    content_type=ContentType.objects.get_for_model(model),
+                    object_id__in=model._default_manager.filter(**{field_name: instance}).values('pk'),
+                ).delete()
+
+
+def _touch_media_owner(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or instance.content_type_id is None or instance.object_id is None:
+        return
+    if origin is not None and getattr(origin, 'model', type(origin)) is not Media:
+        # Deleted along with its owner (or its content type)
+        return
+    model = ContentType.objects.get_for_id(instance.content_type_id).model_class()
+    if model is None or model._meta.label not in REPRESENTATIONS:
+        return
+    # Uploading a gallery saves many Media rows: each owner is saved once, on commit
+    _local.media_owners = getattr(_local, 'media_owners', set()) | {(model, instance.object_id)}
+    transaction.on_commit(_save_media_owners, robust=True)
+
+
+def _save_media_owners():
+    owners = getattr(_local, 'media_owners', set())
+    if not owners:
+        return
+    _local.media_owners = set()
+    pks_by_model = defaultdict(set)
+    for model, pk in owners:
+        pks_by_model[model].add(pk)
+    for model, pks in pks_by_model.items():
+        for owner in model._default_manager.filter(pk__in=pks):
+            owner.save(update_fields=['updated_at'])
+
+
+def connect_signals():
+    post_save.connect(_touch_media_owner, sender=Media, dispatch_uid='representations-media-save')
+    post_delete.connect(_touch_media_owner, sender=Media, dispatch_uid='representations-media-delete')
+    for label, representation in REPRESENTATIONS.items():
+        model = apps.get_model(label)
+        post_save.connect(_refresh_on_commit, sender=model, dispatch_uid=f'representations-save-{label}')
+        post_delete.connect(_delete_representations, sender=model, dispatch_uid=f'representations-delete-{label}')
+        for field_name in representation.related:
+            related_model = model._meta.get_field(field_name).related_model
+            pre_delete.connect(
+                _delete_dependent_representations,
+                sender=related_model,
+                dispatch_uid=f'representations-related-{related_model._meta.label}',
+            )
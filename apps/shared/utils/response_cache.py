@@ -0,0 +1,171 @@
+"""
+Tag-based cache for public catalog GET responses.
+
+Entries are keyed by host, path, query string and negotiated language, and
+every key embeds the current version of the tags it depends on. Invalidating
+a tag bumps its version, so all entries built against the old version simply
+stop being addressed and expire on their own. Only get/add/incr/get_many are
+used, which keeps it working on the file-based and Redis backends. The cache
+must be shared by every worker (check_shared_cache); a per-process one would
+only drop the responses of the worker that handled the write.
+"""
+
+import hashlib
+import logging
+import time
+from typing import Iterable, List
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+from apps.shared.exceptions.translator import negotiate_language
+from apps.shared.utils.custom_response import PrerenderedResponse
+
+logger = logging.getLogger(__name__)
+
+TAG_KEY_PREFIX = 'response-cache:tag:'
+ENTRY_KEY_PREFIX = 'response-cache:entry:'
+FINGERPRINT_KEY_PREFIX = 'response-cache:fingerprint:'
+
+# Model label -> tags whose responses embed rows of that model.
+# Tours carry their hotel id, which a hotel delete rewrites (SET_NULL).
+# The 'availability' tag is bumped by the booking inventory service, whose
+# queryset updates send no signals.
+MODEL_TAGS = {
+    'hotels.Hotel': ('hotels', 'tours'),
+    'tours.Tour': ('tours',),
+    'excursions.Excursion': ('excursions',),
+    'blog.BlogPost': ('blogs',),
+    'testimonials.Testimonial': ('testimonials',),
+}
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def check_shared_cache(alias: str = None) -> None:
+    """
+    Refuse a per-process cache: a tag bumped in one worker would leave the
+    other workers serving their stale responses.
+    """
+    alias = alias or getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')
+    if isinstance(caches[alias], LocMemCache):
+        raise ImproperlyConfigured(
+            f"CACHES[{alias!r}] is a per-process LocMemCache; the response cache and the catalog "
+            f"snapshot need a cache shared by every worker (FileBasedCache or RedisCache)."
+        )
+
+
+def get_tag_versions(tags: Iterable[str]) -> List[int]:
+    """Return the current version of each tag, creating missing ones."""
+    cache = get_cache()
+    keys = [TAG_KEY_PREFIX + tag for tag in tags]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # A clock-based start never reuses a version of an evicted tag.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Bump tag versions so every cached response depending on them is dropped."""
+    cache = get_cache()
+    for tag in tags:
+        key = TAG_KEY_PREFIX + tag
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def get_request_language(request) -> str:
+    """Data language (device/middleware) and negotiated message language of a request."""
+    accept_language = request.headers.get('Accept-Language', '')
+    lang = getattr(request, 'lang', None) or accept_language
+    return f"{lang}|{negotiate_language(accept_language)}"
+
+
+def request_variant(request) -> List[str]:
+    """The parts of a GET request a catalog response depends on."""
+    query = '&'.join(sorted(request.GET.urlencode().split('&')))
+    return [
+        request.scheme,
+        request.get_host(),
+        request.path,
+        query,
+        getattr(request, 'device_type', 'WEB'),
+        get_request_language(request),
+    ]
+
+
+def build_cache_key(request, tags: Iterable[str], prefix: str = ENTRY_KEY_PREFIX) -> str:
+    tags = tuple(tags)
+    parts = [
+        *request_variant(request),
+        ','.join(f"{tag}:{version}" for tag, version in zip(tags, get_tag_versions(tags))),
+    ]
+    digest = hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+    return prefix + digest
+
+
+class CachedResponseMixin:
+    """
+    Serve GET requests of a DRF view from the response cache.
+
+    Views set `cache_tags` to the tags their payload depends on. Only
+    successful DRF responses are stored (pre-rendered ones as their bytes);
+    everything else passes through.
+    """
+    cache_tags = ()
+    cache_timeout = None
+
+    def get(self, request, *args, **kwargs):
+        cache = get_cache()
+        key = build_cache_key(request, self.cache_tags)
+
+        cached = cache.get(key)
+        if cached is not None:
+            if 'content' in cached:
+                response = PrerenderedResponse(cached['content'], status=cached['status'])
+            else:
+                response = Response(cached['data'], status=cached['status'])
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = super().get(request, *args, **kwargs)
+
+        if isinstance(response, Response) and response.status_code == 200:
+            timeout = self.cache_timeout or getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+            if isinstance(response, PrerenderedResponse):
+                entry = {'content': response.content_bytes, 'status': response.status_code}
+            else:
+                entry = {'data': response.data, 'status': response.status_code}
+            cache.set(key, entry, timeout)
+            response['X-Cache'] = 'MISS'
+
+        return response
+
+
+def _invalidate_model(sender, **kwargs):
+    tags = MODEL_TAGS[sender._meta.label]
+    invalidate_tags(*tags)
+    # Bump again after commit so a response cached from pre-commit data is dropped too.
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+def connect_signals():
+    for label in MODEL_TAGS:
+        model = apps.get_model(label)
+        post_save.connect(_invalidate_model, sender=model, dispatch_uid=f'response-cache-save-{label}')
+        post_delete.connect(_invalidate_model, sender=model, dispatch_uid=f'response-cache-delete-{label}')
@@ -1,21 +1,192 @@
-import threading
-import telebot
+import atexit
 import html
-from core import config
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
 
-bot = telebot.TeleBot(config.TELEGRAM_BOT_TOKEN)
+class TelegramTransport:
+    """Sends alerts to the Telegram channel. The bot is created on first use."""
 
-def _send_telegram_message(text: str):
-    try:
+    def __init__(self):
+        self._bot = None
+        self._channel_id = None
+
+    def _get_bot(self):
+        if self._bot is None:
+            import telebot
+            from core import config
+
+            self._bot = telebot.TeleBot(config.TELEGRAM_BOT_TOKEN)
+            self._channel_id = config.TELEGRAM_CHANNEL_ID
+        return self._bot
+
+    def send(self, text: str):
+        bot = self._get_bot()
         bot.send_message(
-            chat_id=config.TELEGRAM_CHANNEL_ID,
+            chat_id=self._channel_id,
             text=text,
             parse_mode='HTML',
             disable_web_page_preview=True
         )
-    except Exception as e:
-        print(f"Failed to send Telegram message: {e}")
 
-def send_alert(text: str):
-    """Send Telegram alert in background thread."""
-    threading.Thread(target=_send_telegram_message, args=(text,), daemon=True).start()
+
+class FileTransport:
+    """Appends alerts to a local file, for development."""
+
+    def __init__(self, path=None):
+        self.path = path or getattr(settings, 'ALERT_FILE_PATH', 'alerts.log')
+
+    def send(self, text: str):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(f"[{datetime.now().isoformat(timespec='seconds')}]\n{text}\n\n")
+
+
+class StubTransport:
+    """Keeps alerts in memory, for tests."""
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, text: str):
+        self.messages.append(text)
+
+
+class AlertDispatcher:
+    """
+    Delivers alerts from a single background worker fed by a bounded queue.
+
+    The first alert of a fingerprint is sent right away; repeats within the
+    digest interval are only counted and reported together in a periodic
+    digest. When the queue is full, alerts are dropped and counted.
+    """
+
+    def __init__(self, transport, maxsize=1000, digest_interval=60):
+        self.transport = transport
+        self.digest_interval = digest_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._seen = {}
+        self._reported_drops = 0
+
+    def submit(self, text: str, fingerprint=None) -> bool:
+        """Queue an alert without blocking. Returns False if it was dropped."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((fingerprint or (text,), text))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def flush(self, timeout=5.0) -> bool:
+        """Deliver everything queued so far plus the pending digest, and wait for it."""
+        self._ensure_worker()
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='alert-dispatcher', daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        next_digest = time.monotonic() + self.digest_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(next_digest - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                self._send_digest()
+                next_digest = time.monotonic() + self.digest_interval
+                item.set()
+                continue
+
+            if item is not None:
+                self._handle(*item)
+
+            if time.monotonic() >= next_digest:
+                self._send_digest()
+                next_digest = time.monotonic() + self.digest_interval
+
+    def _handle(self, fingerprint, text):
+        entry = self._seen.get(fingerprint)
+        if entry is None:
+            self._seen[fingerprint] = {'repeats': 0}
+            self._deliver(text)
+        else:
+            entry['repeats'] += 1
+
+    def _send_digest(self):
+        repeated = [(fp, entry['repeats']) for fp, entry in self._seen.items() if entry['repeats']]
+        self._seen.clear()
+
+        with self._lock:
+            dropped = self.dropped - self._reported_drops
+            self._reported_drops = self.dropped
+
+        if not repeated and not dropped:
+            return
+
+        lines = [f"📊 <b>Alert digest</b> (last {self.digest_interval}s)\n"]
+        for fingerprint, repeats in sorted(repeated, key=lambda item: -item[1]):
+            label = ' · '.join(html.escape(str(part)) for part in fingerprint)
+            lines.append(f"<b>{repeats}×</b> {label}")
+        if dropped:
+            lines.append(f"\n<b>Dropped (queue full):</b> {dropped}")
+        self._deliver('\n'.join(lines))
+
+    def _deliver(self, text):
+        try:
+            self.transport.send(text)
+        except Exception as e:
+            logger.warning(f"Failed to send alert: {e}")
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> AlertDispatcher:
+    """Return the process-wide dispatcher, built from the ALERT_* settings."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                transport_class = import_string(
+                    getattr(settings, 'ALERT_TRANSPORT',
+                            'apps.shared.utils.telegram_alerts.TelegramTransport')
+                )
+                _dispatcher = AlertDispatcher(
+                    transport=transport_class(),
+                    maxsize=getattr(settings, 'ALERT_QUEUE_SIZE', 1000),
+                    digest_interval=getattr(settings, 'ALERT_DIGEST_INTERVAL', 60),
+                )
+                atexit.register(_dispatcher.flush, 2.0)
+    return _dispatcher
+
+
+def send_alert(text: str, fingerprint=None):
+    """Queue an alert for the background dispatcher. Repeats of a fingerprint are digested."""
+    get_dispatcher().submit(text, fingerprint)
@@ -1,3 +1,71 @@
-from django.shortcuts import render
+from urllib.parse import parse_qs, urlsplit
 
-# Create your views here.
+from django.conf import settings
+from rest_framework import permissions, serializers
+from rest_framework.views import APIView
+
+from apps.shared.utils.batch import FORBIDDEN_HEADERS, SubRequest, run_batch
+from apps.shared.utils.custom_response import CustomResponse
+
+
+class SubRequestSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, allow_null=True, default=None)
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'], default='GET')
+    path = serializers.CharField()
+    query = serializers.DictField(required=False, default=dict)
+    body = serializers.JSONField(required=False, default=None)
+    headers = serializers.DictField(child=serializers.CharField(), required=False, default=dict)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and isinstance(data.get('method'), str):
+            data = {**data, 'method': data['method'].upper()}
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        path = urlsplit(attrs['path'])
+        if path.scheme or path.netloc or not path.path.startswith('/api/'):
+            raise serializers.ValidationError({'path': "Must be an /api/ path on this server."})
+        # A query string in the path is merged under the explicit query
+        attrs['query'] = {**parse_qs(path.query), **attrs['query']}
+        attrs['path'] = path.path
+
+        forbidden = sorted(name for name in attrs['headers'] if name.lower() in FORBIDDEN_HEADERS)
+        if forbidden:
+            raise serializers.ValidationError({'headers': f"Not allowed: {', '.join(forbidden)}."})
+        return attrs
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+    parallel = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        limit = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+        if len(value) > limit:
+            raise serializers.ValidationError(f"At most {limit} requests per batch.")
+        return value
+
+
+class BatchView(APIView):
+    """
+    Runs several API requests in one round-trip (apps.shared.utils.batch).
+
+    The body lists sub-requests as {"id", "method", "path", "query", "body",
+    "headers"}; each result carries its id, status, a few headers and the
+    body. With "parallel": true a batch of GETs runs concurrently.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        serializer = BatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return CustomResponse.validation_error(
+                request=request,
+                errors=serializer.errors
+            )
+
+        requests = [SubRequest(**sub) for sub in serializer.validated_data['requests']]
+        return CustomResponse.prerendered(
+            request=request,
+            data=run_batch(request, requests, type(self), parallel=serializer.validated_data['parallel'])
+        )
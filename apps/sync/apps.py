@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.sync'
+
+    def ready(self):
+        from apps.sync.services import sync
+
+        sync.connect_signals()
@@ -0,0 +1,21 @@
+"""
+Django command to build the offline catalog bundle for the mobile app.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.sync.services.bundle import build_bundle
+
+
+class Command(BaseCommand):
+    """Write a new catalog bundle and manifest; meant to be run periodically (e.g. from cron)."""
+    help = "Build the compressed offline catalog bundle served to the mobile app."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        manifest = build_bundle(batch_size=options['batch_size'])
+        counts = ', '.join(f"{count} {name}" for name, count in manifest['counts'].items())
+        self.stdout.write(self.style.SUCCESS(
+            f"{manifest['file']}: {manifest['size']} bytes, sha256 {manifest['sha256']} ({counts})"
+        ))
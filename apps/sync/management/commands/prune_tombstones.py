@@ -0,0 +1,17 @@
+"""
+Django command to delete sync tombstones past their retention period.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.sync.services.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    """Delete old deletion tombstones; meant to be run periodically (e.g. from cron)."""
+    help = "Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        days = getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 90)
+        self.stdout.write(self.style.SUCCESS(f"{deleted} tombstones older than {days} days deleted"))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(max_length=32)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'sync_tombstones',
+                'ordering': ['deleted_at', 'id'],
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1 @@
+from .tombstone import Tombstone
@@ -0,0 +1,22 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    Records that a catalog row was deleted, so mobile clients syncing changes
+    (apps.sync.services.sync) learn to drop their copy.
+    """
+    entity = models.CharField(max_length=32)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'sync_tombstones'
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} #{self.object_id}"
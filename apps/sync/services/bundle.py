@@ -0,0 +1,149 @@
+"""
+Offline catalog bundle for the mobile app.
+
+build_bundle() writes every visible row of the synced entities
+(apps.sync.services.sync.ENTITIES) to a gzip-compressed JSON Lines file in
+MEDIA_ROOT, so the web tier serves it like any other media file. Each line
+holds one object's pre-rendered JSON and, for serializers with translated
+fields, its JSON per language. Rows are streamed in batches, so memory use
+does not grow with the catalog.
+
+The file is named after its SHA-256 and never changes once written;
+manifest.json next to it names the current bundle with its hash, size and
+a sync token. The first line of the bundle is a header carrying the same
+token, taken just before the build started, so an app installed from the
+bundle carries on with delta syncs (/api/v2/sync/) from there.
+
+Image URLs in the bundle are relative to the site.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.shared.utils import representations
+from apps.shared.utils.compiled_serializer import compile_serializer
+from apps.shared.utils.renderers import FastJSONRenderer
+from apps.sync.services import sync
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+
+def bundle_directory() -> Path:
+    return Path(settings.MEDIA_ROOT) / getattr(settings, 'CATALOG_BUNDLE_DIR', 'catalog')
+
+
+def read_manifest() -> Optional[Dict[str, Any]]:
+    try:
+        with open(bundle_directory() / MANIFEST_NAME, 'rb') as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _payloads(model, entity: sync.SyncEntity, rows, language: str) -> Dict[int, bytes]:
+    if not entity.serializer:
+        return representations.relative_payloads(model, rows, language)
+
+    compiled = compile_serializer(import_string(entity.serializer))
+    renderer = FastJSONRenderer()
+    queryset = model._default_manager.filter(pk__in=[row['pk'] for row in rows])
+    return {row['pk']: renderer.render(compiled.to_representation(row)) for row in compiled.project(queryset, 'pk')}
+
+
+def _entity_lines(name: str, entity: sync.SyncEntity, batch_size: int) -> Iterator[bytes]:
+    model = apps.get_model(entity.model)
+    languages = ('',) if entity.serializer else representations.languages_for(model)
+    prefix = b'{"entity":' + json.dumps(name).encode() + b',"id":'
+
+    rows = (
+        model._default_manager.filter(**entity.filters)
+        .order_by('pk')
+        .values('pk', 'updated_at')
+        .iterator(chunk_size=batch_size)
+    )
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        payloads = {language: _payloads(model, entity, batch, language) for language in languages}
+
+        for row in batch:
+            pk = row['pk']
+            data = payloads[''].get(pk)
+            if data is None:
+                # Deleted while the bundle was being built
+                continue
+            line = prefix + str(pk).encode() + b',"data":' + data
+            translations = [
+                json.dumps(language).encode() + b':' + payloads[language][pk]
+                for language in languages[1:] if pk in payloads[language]
+            ]
+            if translations:
+                line += b',"translations":{' + b','.join(translations) + b'}'
+            yield line + b'}\n'
+
+
+def build_bundle(batch_size: int = 500) -> Dict[str, Any]:
+    """Write a new bundle and manifest, remove older bundles, and return the manifest."""
+    directory = bundle_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    generated_at = timezone.now()
+    # Rows changed after this are sent again by the first delta sync
+    synced_to = generated_at - timedelta(seconds=getattr(settings, 'SYNC_SETTLE_SECONDS', 5))
+    header = {
+        'version': FORMAT_VERSION,
+        'generated_at': generated_at.isoformat(),
+        'sync_token': sync.token_at(synced_to),
+        'languages': list(representations.LANGUAGE_CODES),
+    }
+
+    counts = {name: 0 for name in sync.ENTITIES}
+    temporary = directory / f'.bundle.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as out:
+        out.write(json.dumps(header, separators=(',', ':')).encode() + b'\n')
+        for name, entity in sync.ENTITIES.items():
+            for line in _entity_lines(name, entity, batch_size):
+                out.write(line)
+                counts[name] += 1
+
+    digest = hashlib.sha256()
+    with open(temporary, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    sha256 = digest.hexdigest()
+    bundle_name = f'catalog-{sha256[:16]}.jsonl.gz'
+    os.replace(temporary, directory / bundle_name)
+
+    previous = read_manifest()
+    manifest = {
+        'version': FORMAT_VERSION,
+        'file': bundle_name,
+        'sha256': sha256,
+        'size': (directory / bundle_name).stat().st_size,
+        'generated_at': header['generated_at'],
+        'sync_token': header['sync_token'],
+        'counts': counts,
+    }
+    temporary = directory / f'.manifest.{os.getpid()}.tmp'
+    temporary.write_text(json.dumps(manifest, indent=2))
+    os.replace(temporary, directory / MANIFEST_NAME)
+
+    # Keep the previous bundle for clients still downloading it
+    keep = {bundle_name, previous and previous.get('file')}
+    for path in directory.glob('catalog-*.jsonl.gz'):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+    return manifest
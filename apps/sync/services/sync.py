@@ -0,0 +1,256 @@
+"""
+Delta sync of the public catalog for the mobile app.
+
+A client without a token receives every visible row. Each response carries a
+new opaque token, and a request with it returns only what changed since:
+rows whose updated_at moved, as their current JSON, and the ids of rows that
+were deleted (Tombstone) or hidden in the meantime.
+
+The token is a keyset position per entity, the (updated_at, id) of the last
+row sent, plus the (deleted_at, id) of the last tombstone, so every read is a
+range scan on an (updated_at, id) index and a sync costs as much as what
+changed, not the size of the catalog. It also keeps when the client's first
+sync started, since rows hidden or deleted before then were never sent. A response holds at most `limit` items;
+`has_more` tells the client to call again with the new token.
+
+Rows are only read up to SYNC_SETTLE_SECONDS ago: updated_at is stamped before
+a transaction commits, and a row committed late with an older stamp would
+otherwise land behind a position a client has already passed.
+
+Tombstones are kept SYNC_TOMBSTONE_RETENTION_DAYS (the prune_tombstones
+command deletes older ones). A token whose tombstone position is older than
+that may have missed pruned deletions, so it is answered with a full sync
+flagged `reset`, telling the client to drop its copy first. A sync that reads
+every tombstone moves the position up to its horizon, so clients that keep
+syncing never fall behind the cutoff.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete, pre_delete
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.shared.utils import representations
+from apps.shared.utils.compiled_serializer import compile_serializer
+from apps.shared.utils.renderers import FastJSONRenderer
+from apps.sync.models import Tombstone
+
+
+@dataclass(frozen=True)
+class SyncEntity:
+    model: str
+    # Filter selecting the rows clients keep; changed rows outside it are sent as removed
+    filters: Dict[str, Any]
+    # Serializer for models without a pre-rendered representation
+    serializer: Optional[str] = None
+
+
+ENTITIES = {
+    'hotels': SyncEntity('hotels.Hotel', {'is_available': True}),
+    'tours': SyncEntity('tours.Tour', {'status': True}),
+    'excursions': SyncEntity('excursions.Excursion', {'is_available': True}),
+    'blogs': SyncEntity('blog.BlogPost', {'is_published': True}),
+    'testimonials': SyncEntity(
+        'testimonials.Testimonial', {'is_published': True},
+        serializer='apps.testimonials.serializers.testimonial_serializer.TestimonialSerializer',
+    ),
+}
+# Token key of the tombstone position
+DELETED = 'deleted'
+
+Position = Tuple[datetime, int]
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+@dataclass
+class SyncPage:
+    # When the client's first sync started: it holds nothing hidden or deleted before
+    since: datetime
+    positions: Dict[str, Position]
+    # Rendered JSON of changed rows, per entity
+    changed: Dict[str, List[bytes]] = field(default_factory=lambda: {name: [] for name in ENTITIES})
+    # Ids of deleted or hidden rows, per entity
+    removed: Dict[str, List[int]] = field(default_factory=lambda: {name: [] for name in ENTITIES})
+    has_more: bool = False
+
+    @property
+    def token(self) -> str:
+        payload = {
+            's': self.since.isoformat(),
+            'p': {name: [value.isoformat(), pk] for name, (value, pk) in self.positions.items()},
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def token_at(moment: datetime) -> str:
+    """Token of a client holding the catalog as of `moment`."""
+    return SyncPage(since=moment, positions={name: (moment, 0) for name in (*ENTITIES, DELETED)}).token
+
+
+def tombstone_cutoff() -> datetime:
+    """Tombstones deleted before this may have been pruned."""
+    return timezone.now() - timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 90))
+
+
+def is_expired(since: Optional[datetime], positions: Dict[str, Position]) -> bool:
+    """Whether a token's client may have missed pruned tombstones and must sync from scratch."""
+    if since is None:
+        return False
+    deleted_at, _ = positions.get(DELETED, (since, 0))
+    return deleted_at < tombstone_cutoff()
+
+
+def prune_tombstones() -> int:
+    """Delete the tombstones past the retention period; returns how many."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_cutoff()).delete()
+    return deleted
+
+
+def _timestamp(value: str) -> datetime:
+    value = datetime.fromisoformat(value)
+    if timezone.is_naive(value):
+        raise ValueError('naive timestamp')
+    return value
+
+
+def decode_token(encoded: Optional[str]) -> Tuple[Optional[datetime], Dict[str, Position]]:
+    """The baseline and positions of a token; (None, {}) for a first sync."""
+    if not encoded:
+        return None, {}
+    try:
+        padded = encoded + '=' * (-len(encoded) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        positions = {}
+        for name, (value, pk) in payload['p'].items():
+            # Positions of entities no longer synced are dropped
+            if name in ENTITIES or name == DELETED:
+                positions[name] = (_timestamp(value), int(pk))
+        return _timestamp(payload['s']), positions
+    except (TypeError, ValueError, KeyError, AttributeError) as e:
+        raise InvalidSyncToken(str(e))
+
+
+def _after(position: Optional[Position], field_name: str) -> Q:
+    if position is None:
+        return Q()
+    value, pk = position
+    return Q(**{f'{field_name}__gt': value}) | Q(**{field_name: value, 'pk__gt': pk})
+
+
+def _render(model, entity: SyncEntity, rows: List[Dict[str, Any]], request) -> List[bytes]:
+    if not entity.serializer:
+        return representations.render_rows(model, rows, request)
+
+    compiled = compile_serializer(import_string(entity.serializer))
+    by_pk = {
+        row['pk']: row
+        for row in compiled.project(model._default_manager.filter(pk__in=[row['pk'] for row in rows]), 'pk')
+    }
+    renderer = FastJSONRenderer()
+    return [
+        renderer.render(compiled.to_representation(by_pk[row['pk']], request))
+        for row in rows if row['pk'] in by_pk
+    ]
+
+
+def collect(since: Optional[datetime], positions: Dict[str, Position], limit: int, request) -> SyncPage:
+    """Up to `limit` changes after the positions, entity by entity, then deletions."""
+    horizon = timezone.now() - timedelta(seconds=getattr(settings, 'SYNC_SETTLE_SECONDS', 5))
+    page = SyncPage(since=since or horizon, positions=dict(positions))
+    remaining = limit
+
+    for name, entity in ENTITIES.items():
+        model = apps.get_model(entity.model)
+        # One extra row tells us whether more changes are waiting.
+        rows = list(
+            model._default_manager
+            .filter(_after(page.positions.get(name), 'updated_at'), updated_at__lte=horizon)
+            .order_by('updated_at', 'pk')
+            .values('pk', 'updated_at', *entity.filters)[:remaining + 1]
+        )
+        if len(rows) > remaining:
+            page.has_more = True
+            rows = rows[:remaining]
+        if not rows:
+            if page.has_more:
+                return page
+            continue
+
+        visible = [row for row in rows if all(row[key] == value for key, value in entity.filters.items())]
+        shown = {row['pk'] for row in visible}
+        page.removed[name] = [
+            row['pk'] for row in rows if row['pk'] not in shown and row['updated_at'] > page.since
+        ]
+        page.changed[name] = _render(model, entity, visible, request)
+        page.positions[name] = (rows[-1]['updated_at'], rows[-1]['pk'])
+        remaining -= len(rows)
+
+    if page.has_more:
+        return page
+
+    tombstones = list(
+        Tombstone.objects
+        .filter(_after(page.positions.get(DELETED, (page.since, 0)), 'deleted_at'), deleted_at__lte=horizon)
+        .order_by('deleted_at', 'pk')
+        .values_list('pk', 'entity', 'object_id', 'deleted_at')[:remaining + 1]
+    )
+    if len(tombstones) > remaining:
+        page.has_more = True
+        tombstones = tombstones[:remaining]
+    for _, name, object_id, _ in tombstones:
+        if name in page.removed:
+            page.removed[name].append(object_id)
+    if page.has_more:
+        if tombstones:
+            page.positions[DELETED] = tombstones[-1][3], tombstones[-1][0]
+    else:
+        # Every tombstone up to the horizon has been read
+        page.positions[DELETED] = horizon, 0
+    return page
+
+
+# Signals
+
+_ENTITY_NAMES = {}
+
+
+def _record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(entity=_ENTITY_NAMES[sender], object_id=instance.pk)
+
+
+def _touch_dependents(sender, instance, **kwargs):
+    # SET_NULL rewrites the dependent rows without a save; move their updated_at so they sync
+    for entity in ENTITIES.values():
+        model = apps.get_model(entity.model)
+        representation = representations.REPRESENTATIONS.get(model._meta.label)
+        for field_name in representation.related if representation else ():
+            if model._meta.get_field(field_name).related_model is sender:
+                model._default_manager.filter(**{field_name: instance}).update(updated_at=timezone.now())
+
+
+def connect_signals():
+    for name, entity in ENTITIES.items():
+        model = apps.get_model(entity.model)
+        _ENTITY_NAMES[model] = name
+        post_delete.connect(_record_tombstone, sender=model, dispatch_uid=f'sync-tombstone-{name}')
+
+        representation = representations.REPRESENTATIONS.get(model._meta.label)
+        for field_name in representation.related if representation else ():
+            related_model = model._meta.get_field(field_name).related_model
+            pre_delete.connect(
+                _touch_dependents,
+                sender=related_model,
+                dispatch_uid=f'sync-related-{related_model._meta.label}',
+            )
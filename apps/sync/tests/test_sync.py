@@ -0,0 +1,207 @@
+import gzip
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+import msgpack
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.hotels.models.hotels import Hotel
+from apps.sync.models import Tombstone
+from apps.sync.services import bundle, sync
+from apps.testimonials.models.testimonials import Testimonial
+from apps.tours.models.tours import Tour
+from apps.users.models.user_auth import User
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTests(APITestCase):
+
+    def setUp(self):
+        self.url = reverse('sync:sync')
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!'
+        )
+        self.hotel = Hotel.objects.create(name='Hotel', location='City', price_per_night=100)
+        self.tours = [
+            Tour.objects.create(
+                title=f'Tour {i}', destination='Paris', duration_days=5, price=1000, capacity=10,
+                hotel=self.hotel,
+            )
+            for i in range(3)
+        ]
+        Tour.objects.create(title='Draft', destination='Rome', duration_days=2, price=500, capacity=5, status=False)
+        Testimonial.objects.create(name='Ann', role='Guest', text='Great', is_published=True)
+
+    def sync_all(self, token=None, limit=None):
+        """Follow has_more to the end; returns the changes, removals and final token."""
+        changed, removed = {}, {}
+        while True:
+            params = {'token': token} if token else {}
+            if limit:
+                params['limit'] = limit
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            for name, rows in response.data['data'].items():
+                changed.setdefault(name, []).extend(row['id'] for row in rows)
+            for name, ids in response.data['removed'].items():
+                removed.setdefault(name, []).extend(ids)
+            token = response.data['sync_token']
+            if not response.data['has_more']:
+                return changed, removed, token
+
+    def test_first_sync_returns_visible_rows_in_pages(self):
+        """A first sync pages through every visible row once"""
+        changed, removed, _ = self.sync_all(limit=2)
+        self.assertEqual(sorted(changed['tours']), sorted(tour.id for tour in self.tours))
+        self.assertEqual(changed['hotels'], [self.hotel.id])
+        self.assertEqual(len(changed['testimonials']), 1)
+        self.assertFalse(any(removed.values()))
+
+    def test_sync_returns_only_changes_since_token(self):
+        """Later syncs return changed rows and ids of deleted or hidden ones"""
+        _, _, token = self.sync_all()
+
+        changed, removed, token = self.sync_all(token)
+        self.assertFalse(any(changed.values()))
+        self.assertFalse(any(removed.values()))
+
+        self.tours[0].price = 1100
+        self.tours[0].save()
+        self.tours[1].status = False
+        self.tours[1].save()
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.delete(reverse('tours:delete', kwargs={'pk': self.tours[2].pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(None)
+
+        response = self.client.get(self.url, {'token': token})
+        self.assertEqual([row['id'] for row in response.data['data']['tours']], [self.tours[0].id])
+        self.assertEqual(response.data['data']['tours'][0]['price'], '1100.00')
+        self.assertEqual(sorted(response.data['removed']['tours']), [self.tours[1].id, self.tours[2].id])
+        self.assertTrue(Tombstone.objects.filter(entity='tours', object_id=self.tours[2].pk).exists())
+
+    def test_unchanged_catalog_costs_one_query_per_entity(self):
+        """An up-to-date client does not read the catalog"""
+        for i in range(20):
+            Hotel.objects.create(name=f'Hotel {i}', location='City', price_per_night=100)
+        _, _, token = self.sync_all()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'token': token})
+        # One range scan per entity and one for tombstones
+        self.assertEqual(len(queries), 6)
+
+    def test_deleting_hotel_resyncs_its_tours(self):
+        """Tours whose hotel is deleted are sent again"""
+        _, _, token = self.sync_all()
+        hotel_id = self.hotel.id
+        self.hotel.delete()
+
+        changed, removed, _ = self.sync_all(token)
+        self.assertEqual(sorted(changed['tours']), sorted(tour.id for tour in self.tours))
+        self.assertEqual(removed['hotels'], [hotel_id])
+
+    def test_msgpack_response_matches_json(self):
+        """Accept: application/msgpack gets the JSON body's data as MessagePack"""
+        expected = self.client.get(self.url).json()
+        response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertIn('Accept', response['Vary'])
+        body = msgpack.unpackb(response.content)
+        # The token of a first sync carries the time of the request
+        del body['sync_token'], expected['sync_token']
+        self.assertEqual(body, expected)
+
+    def test_tokens_past_the_tombstone_retention_resync(self):
+        """Old tombstones are pruned, and a token that may have missed them starts over"""
+        _, _, token = self.sync_all()
+        self.assertFalse(self.client.get(self.url, {'token': token}).data['reset'])
+
+        old = Tombstone.objects.create(
+            entity='tours', object_id=10 ** 6, deleted_at=timezone.now() - timedelta(days=91)
+        )
+        recent = Tombstone.objects.create(entity='tours', object_id=10 ** 6 + 1)
+        out = StringIO()
+        call_command('prune_tombstones', stdout=out)
+        self.assertIn('1 tombstones older than 90 days deleted', out.getvalue())
+        self.assertEqual(list(Tombstone.objects.values_list('pk', flat=True)), [recent.pk])
+        self.assertFalse(Tombstone.objects.filter(pk=old.pk).exists())
+
+        response = self.client.get(self.url, {'token': sync.token_at(timezone.now() - timedelta(days=91))})
+        self.assertTrue(response.data['reset'])
+        self.assertEqual(sorted(row['id'] for row in response.data['data']['tours']), sorted(t.id for t in self.tours))
+        self.assertFalse(any(response.data['removed'].values()))
+
+        # A client that keeps syncing moves past the cutoff even when nothing is deleted
+        _, positions = sync.decode_token(response.data['sync_token'])
+        self.assertGreater(positions[sync.DELETED][0], sync.tombstone_cutoff())
+
+    def test_invalid_token(self):
+        """A malformed token is rejected"""
+        response = self.client.get(self.url, {'token': 'not-a-token'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class CatalogBundleTests(APITestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.hotel = Hotel.objects.create(name='Hotel', location='City', price_per_night=100)
+        self.tour = Tour.objects.create(
+            title='Tour', destination='Paris', duration_days=5, price=1000, capacity=10, image='tours/a.jpg'
+        )
+        Tour.objects.create(title='Draft', destination='Rome', duration_days=2, price=500, capacity=5, status=False)
+        self.url = reverse('sync:bundle')
+
+    def read_bundle(self, manifest):
+        path = bundle.bundle_directory() / manifest['file']
+        with gzip.open(path, 'rb') as f:
+            return [json.loads(line) for line in f]
+
+    def test_bundle_holds_visible_catalog_and_sync_token(self):
+        """The bundle lists every visible row, and its token syncs from there"""
+        call_command('build_catalog_bundle', stdout=StringIO())
+        manifest = bundle.read_manifest()
+        header, *lines = self.read_bundle(manifest)
+
+        self.assertEqual(manifest['counts']['tours'], 1)
+        self.assertEqual(
+            [(line['entity'], line['id']) for line in lines],
+            [('hotels', self.hotel.pk), ('tours', self.tour.pk)]
+        )
+        self.assertEqual(lines[1]['data']['image'], '/media/tours/a.jpg')
+
+        response = self.client.get(reverse('sync:sync'), {'token': header['sync_token']})
+        self.assertFalse(any(response.data['data'].values()))
+
+    def test_manifest_supports_conditional_get(self):
+        """The manifest carries the bundle URL and answers If-None-Match with 304"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        manifest = bundle.build_bundle()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['sha256'], manifest['sha256'])
+        self.assertTrue(response.data['data']['url'].endswith(f"/media/catalog/{manifest['file']}"))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
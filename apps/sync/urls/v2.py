@@ -0,0 +1,11 @@
+from django.urls import path
+
+from apps.sync.views.bundle_view import CatalogBundleView
+from apps.sync.views.sync_view import SyncView
+
+app_name = 'sync'
+
+urlpatterns = [
+    path('', SyncView.as_view(), name='sync'),
+    path('bundle/', CatalogBundleView.as_view(), name='bundle'),
+]
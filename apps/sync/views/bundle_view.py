@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+from apps.shared.mixins.negotiation_mixins import MessagePackMixin
+from apps.shared.utils.custom_response import CustomResponse
+from apps.sync.services.bundle import read_manifest
+
+
+class CatalogBundleView(MessagePackMixin, APIView):
+    """
+    Manifest of the current offline catalog bundle (apps.sync.services.bundle).
+
+    The bundle itself is a static media file; this answers with its URL,
+    SHA-256, size and sync token, and with 304 to a client whose
+    If-None-Match already names the current bundle.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        manifest = read_manifest()
+        if manifest is None:
+            return CustomResponse.not_found(request=request)
+
+        etag = f'"{manifest["sha256"]}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        bundle_dir = getattr(settings, 'CATALOG_BUNDLE_DIR', 'catalog')
+        response = CustomResponse.success(
+            request=request,
+            data={
+                **manifest,
+                'url': request.build_absolute_uri(f"{settings.MEDIA_URL}{bundle_dir}/{manifest['file']}"),
+            }
+        )
+        response['ETag'] = etag
+        return response
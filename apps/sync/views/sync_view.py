@@ -0,0 +1,55 @@
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+from apps.shared.mixins.negotiation_mixins import MessagePackMixin
+from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.renderers import RawJSON, render_with_raw
+from apps.sync.services import sync
+
+
+class SyncView(MessagePackMixin, APIView):
+    """
+    Catalog changes since a sync token (apps.sync.services.sync).
+
+    Without ?token= every visible row is returned. Clients call again with
+    the returned sync_token while has_more is true, and keep the last token
+    for the next launch. A token older than the tombstone retention is
+    answered like a first sync with reset set: the client drops its copy.
+    """
+    permission_classes = [permissions.AllowAny]
+    token_query_param = 'token'
+    limit_query_param = 'limit'
+    default_limit = 200
+    max_limit = 1000
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get(self.limit_query_param, self.default_limit))
+        except (TypeError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def get(self, request, *args, **kwargs):
+        try:
+            since, positions = sync.decode_token(request.query_params.get(self.token_query_param))
+        except sync.InvalidSyncToken:
+            return CustomResponse.validation_error(
+                request=request,
+                errors={self.token_query_param: ['Invalid sync token.']}
+            )
+
+        reset = sync.is_expired(since, positions)
+        if reset:
+            since, positions = None, {}
+
+        page = sync.collect(since, positions, self.get_limit(request), request)
+        return CustomResponse.prerendered(
+            request=request,
+            data=RawJSON(render_with_raw({name: RawJSON.array(rows) for name, rows in page.changed.items()})),
+            removed=page.removed,
+            sync_token=page.token,
+            has_more=page.has_more,
+            reset=reset
+        )
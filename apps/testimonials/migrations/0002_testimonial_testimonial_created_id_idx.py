@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testimonials', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['-created_at', '-id'], name='testimonial_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testimonials', '0002_testimonial_testimonial_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['updated_at', 'id'], name='testimonial_updated_id_idx'),
+        ),
+    ]
@@ -0,0 +1 @@
+from .testimonials import Testimonial
\ No newline at end of file
@@ -19,6 +19,11 @@ class Testimonial(BaseModel):
         verbose_name = "Testimonial"
         verbose_name_plural = "Testimonials"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='testimonial_created_id_idx'),
+            # Keyset scans of changed rows for mobile sync (apps.sync)
+            models.Index(fields=['updated_at', 'id'], name='testimonial_updated_id_idx'),
+        ]
         
 
 
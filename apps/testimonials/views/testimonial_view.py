@@ -1,47 +1,58 @@
-from rest_framework import generics, permissions, status
+from rest_framework import generics, permissions
 from rest_framework.exceptions import ValidationError
 
 from apps.testimonials.models.testimonials import Testimonial
 from apps.testimonials.serializers.testimonial_serializer import TestimonialSerializer
+from apps.shared.mixins.conditional_mixins import ConditionalGetMixin
+from apps.shared.mixins.fieldset_mixins import SparseFieldsetsMixin
+from apps.shared.mixins.streaming_mixins import StreamingListMixin
+from apps.shared.utils.compiled_serializer import CompiledListMixin
+from apps.shared.utils.custom_pagination import CustomCursorPagination
+from apps.shared.utils.response_cache import CachedResponseMixin
 from apps.shared.utils.custom_response import CustomResponse
 
 
-class TestimonialListView(generics.ListAPIView):
+class TestimonialListView(ConditionalGetMixin, CachedResponseMixin, StreamingListMixin, SparseFieldsetsMixin, CompiledListMixin,
+                          generics.ListAPIView):
+    cache_tags = ('testimonials',)
     queryset = Testimonial.objects.filter(is_published=True)
     serializer_class = TestimonialSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = CustomCursorPagination
 
     def list(self, request, *args, **kwargs):
-        testimonials = self.get_queryset()
-        serializer = self.get_serializer(testimonials, many=True)
+        testimonials = self.filter_queryset(self.get_queryset())
+        if self.should_stream(request):
+            return self.stream_list(self.sparse_queryset(testimonials))
 
         return CustomResponse.success(
             message_key="SUCCESS_MESSAGE",
             request=request,
-            data=serializer.data,
-            count=testimonials.count()
+            data=self.paginate_compiled(testimonials, fields=self.get_sparse_fields()),
+            count=testimonials.count(),
+            pagination=self.paginator.get_pagination_meta()
         )
 
 
-class TestimonialDetailView(generics.RetrieveAPIView):
+class TestimonialDetailView(ConditionalGetMixin, CachedResponseMixin, SparseFieldsetsMixin, generics.RetrieveAPIView):
+    cache_tags = ('testimonials',)
     queryset = Testimonial.objects.all()
     serializer_class = TestimonialSerializer
     permission_classes = [permissions.AllowAny]
 
     def retrieve(self, request, *args, **kwargs):
         try:
-            testimonial = self.get_object()
+            testimonial = self.serialize_sparse_object()
         except Exception:
             return CustomResponse.not_found(
                 message_key="NOT_FOUND",
                 request=request
             )
 
-        serializer = self.get_serializer(testimonial)
         return CustomResponse.success(
             message_key="SUCCESS_MESSAGE",
             request=request,
-            data=serializer.data
+            data=testimonial
         )
 
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0003_hotel_hotel_created_id_idx'),
+        ('tours', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tour',
+            index=models.Index(fields=['-created_at', '-id'], name='tour_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:02
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_seats_booked(apps, schema_editor):
+    Tour = apps.get_model('tours', 'Tour')
+    Booking = apps.get_model('bookings', 'Booking')
+
+    booked = (
+        Booking.objects
+        .filter(tour__isnull=False)
+        .exclude(status='canceled')
+        .values('tour_id')
+        .annotate(seats=Sum('guests'))
+    )
+    for row in booked:
+        Tour.objects.filter(pk=row['tour_id']).update(seats_booked=row['seats'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0002_tour_tour_created_id_idx'),
+        ('bookings', '0002_booking_booking_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='seats_booked',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_seats_booked, migrations.RunPython.noop),
+    ]
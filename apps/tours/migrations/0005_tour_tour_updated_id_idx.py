@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0007_hotel_hotel_updated_id_idx'),
+        ('tours', '0004_tour_geohash_tour_latitude_tour_longitude'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tour',
+            index=models.Index(fields=['updated_at', 'id'], name='tour_updated_id_idx'),
+        ),
+    ]
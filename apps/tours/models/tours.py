@@ -1,10 +1,11 @@
 from django.db import models
 from apps.users.models.user_auth import BaseModel
+from apps.shared.models import GeoLocatedModel
 from apps.hotels.models.hotels import Hotel
 
 
 
-class Tour(BaseModel):
+class Tour(GeoLocatedModel, BaseModel):
     TOUR_TYPE_CHOICES = [
         ('ADVENTURE', 'Adventure'),
         ('CULTURAL', 'Cultural'),
@@ -21,16 +22,26 @@ class Tour(BaseModel):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     tour_type = models.CharField(max_length=20, choices=TOUR_TYPE_CHOICES, default='OTHER')
     capacity = models.PositiveIntegerField()
+    seats_booked = models.PositiveIntegerField(default=0)
     hotel = models.ForeignKey(Hotel, on_delete=models.SET_NULL, null=True, blank=True, related_name='tours')
     image = models.ImageField(upload_to='tours/', null=True, blank=True)
     status = models.BooleanField(default=True)  
 
     def __str__(self):
         return self.title
+
+    @property
+    def seats_available(self):
+        return max(self.capacity - self.seats_booked, 0)
     
 
     class Meta:
         verbose_name = 'Tour'
         verbose_name_plural = 'Tours'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='tour_created_id_idx'),
+            # Keyset scans of changed rows for mobile sync (apps.sync)
+            models.Index(fields=['updated_at', 'id'], name='tour_updated_id_idx'),
+        ]
         
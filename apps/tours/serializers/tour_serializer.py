@@ -4,7 +4,19 @@ from apps.tours.models.tours import Tour
 class TourSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tour
-        fields = '__all__'
+        # Seats change with every booking, so they are read live (TourAvailabilitySerializer)
+        # rather than kept in the stored payloads, the snapshot and sync;
+        # the geohash is an index column, not part of the API
+        exclude = ['seats_booked', 'geohash']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class TourAvailabilitySerializer(serializers.ModelSerializer):
+    seats_available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Tour
+        fields = ['id', 'capacity', 'seats_booked', 'seats_available']
+        read_only_fields = fields
+
+
@@ -1,3 +1,4 @@
+import json
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
@@ -56,6 +57,22 @@ class TourTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(len(response.data) > 0)
 
+    def test_stream_tours(self):
+        """?stream=1 returns every tour in the usual envelope, streamed"""
+        for i in range(12):
+            Tour.objects.create(
+                title=f'Tour {i}', destination='Rome', duration_days=2, price=100, capacity=5
+            )
+
+        response = self.client.get(self.list_url, {'stream': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(set(body), {'id', 'message', 'data'})
+        self.assertEqual(len(body['data']), 13)
+        self.assertEqual(body['data'][0]['title'], 'Tour 11')
+
     def test_retrieve_tour(self):
         """Anyone can retrieve a tour"""
         response = self.client.get(self.detail_url)
@@ -1,14 +1,17 @@
 from django.urls import path
 from apps.tours.views.tours_view import (
     TourListView, TourDetailView, TourCreateView,
-    TourUpdateView, TourDeleteView
+    TourUpdateView, TourDeleteView, TourNearbyView, TourMapClusterView, TourAvailabilityView
 )
 
 app_name = 'tours'
 
 urlpatterns = [
     path('', TourListView.as_view(), name='list'),
+    path('nearby/', TourNearbyView.as_view(), name='nearby'),
+    path('map-clusters/', TourMapClusterView.as_view(), name='map-clusters'),
     path('<int:pk>/', TourDetailView.as_view(), name='detail'),
+    path('<int:pk>/availability/', TourAvailabilityView.as_view(), name='availability'),
     path('create/', TourCreateView.as_view(), name='create'),
     path('<int:pk>/update/', TourUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', TourDeleteView.as_view(), name='delete'),
@@ -1,42 +1,85 @@
 from rest_framework import generics, permissions
 from apps.tours.models.tours import Tour
-from apps.tours.serializers.tour_serializer import TourSerializer
+from apps.tours.serializers.tour_serializer import TourAvailabilitySerializer, TourSerializer
+from apps.shared.mixins.geo_mixins import MapClusterMixin, NearbyListMixin
+from apps.shared.mixins.prerendered_mixins import CatalogSnapshotMixin
+from apps.shared.mixins.streaming_mixins import StreamingListMixin
+from apps.shared.utils.custom_pagination import CustomCursorPagination
+from apps.shared.utils.response_cache import CachedResponseMixin
 from apps.shared.utils.custom_response import CustomResponse
 from rest_framework.parsers import MultiPartParser, FormParser
 
 
-class TourListView(generics.ListAPIView):
+class TourListView(CatalogSnapshotMixin, CachedResponseMixin, StreamingListMixin, generics.ListAPIView):
+    cache_tags = ('tours',)
+    snapshot_section = 'tours'
     queryset = Tour.objects.filter(status=True)
     serializer_class = TourSerializer
     permission_classes = [permissions.AllowAny]
-    pagination_class = None
+    pagination_class = CustomCursorPagination
     
 
     def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        return CustomResponse.success(
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.should_stream(request):
+            return self.stream_list(self.sparse_queryset(queryset))
+
+        return CustomResponse.prerendered(
             message_key="SUCCESS_MESSAGE",
             request=request,
-            data=serializer.data
+            data=self.paginate_catalog(queryset),
+            pagination=self.paginator.get_pagination_meta()
         )
 
 
-class TourDetailView(generics.RetrieveAPIView):
+class TourNearbyView(NearbyListMixin, generics.ListAPIView):
+    queryset = Tour.objects.filter(status=True)
+    serializer_class = TourSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+class TourMapClusterView(CachedResponseMixin, MapClusterMixin, generics.ListAPIView):
+    cache_tags = ('tours',)
+    queryset = Tour.objects.filter(status=True)
+    permission_classes = [permissions.AllowAny]
+
+
+class TourDetailView(CatalogSnapshotMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_tags = ('tours',)
+    snapshot_section = 'tours'
     queryset = Tour.objects.filter(status=True)
     serializer_class = TourSerializer
     permission_classes = [permissions.AllowAny]
 
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            tour = self.get_catalog_object()
+        except Exception:
+            return CustomResponse.not_found(request=request)
+
+        return CustomResponse.prerendered(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data=tour
+        )
+
+
+class TourAvailabilityView(CachedResponseMixin, generics.RetrieveAPIView):
+    """Seats left on a tour, read live: bookings do not touch the tour's payload."""
+    cache_tags = ('tours', 'availability')
+    queryset = Tour.objects.filter(status=True)
+    serializer_class = TourAvailabilitySerializer
+    permission_classes = [permissions.AllowAny]
+
     def retrieve(self, request, *args, **kwargs):
         try:
             tour = self.get_object()
         except Exception:
             return CustomResponse.not_found(request=request)
 
-        serializer = self.get_serializer(tour)
         return CustomResponse.success(
-            message_key="SUCCESS_MESSAGE",
             request=request,
-            data=serializer.data
+            data=self.get_serializer(tour).data
         )
 
 
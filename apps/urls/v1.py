@@ -1,5 +1,7 @@
 from django.urls import path, include
 
+from apps.shared.views import BatchView
+
 
 urlpatterns = [
     path('users/', include('apps.users.urls.v1')),
@@ -9,6 +11,8 @@ urlpatterns = [
     path('excursions/', include('apps.excursions.urls.v1')),
     path('blogs/', include('apps.blog.urls.v1')),
     path('testimonials/', include('apps.testimonials.urls.v1')),
-    path('bookings/', include('apps.bookings.urls.v1'))
+    path('bookings/', include('apps.bookings.urls.v1')),
+    path('search/', include('apps.search.urls.v1')),
+    path('batch/', BatchView.as_view(), name='batch'),
 ]
 
@@ -1,6 +1,6 @@
-from django.urls import path
+from django.urls import path, include
 
 
 urlpatterns = [
-
-]
\ No newline at end of file
+    path('sync/', include('apps.sync.urls.v2')),
+]
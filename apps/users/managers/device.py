@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 
+from apps.shared.utils.device_session import invalidate_device_sessions
+
 
 class DeviceManager(models.Manager):
 
@@ -29,22 +31,28 @@ class DeviceManager(models.Manager):
 
     def logout_all_devices(self, user):
 
-        return self.filter(user=user, is_active=True).update(
-            is_active=False,
-            logged_out_at=timezone.now()
-        )
+        devices = self.filter(user=user, is_active=True)
+        return self._logout(devices)
 
     def logout_other_devices(self, user, current_device_id):
 
-        return self.filter(
+        devices = self.filter(
             user=user,
             is_active=True
         ).exclude(
             id=current_device_id
-        ).update(
+        )
+        return self._logout(devices)
+
+    def _logout(self, devices):
+        # Bulk update skips save(), so cached device sessions are dropped here
+        tokens = list(devices.values_list('device_token', flat=True))
+        updated = devices.update(
             is_active=False,
             logged_out_at=timezone.now()
         )
+        invalidate_device_sessions(*tokens)
+        return updated
 
     def is_token_valid(self, refresh_token_jti):
 
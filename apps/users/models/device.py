@@ -6,6 +6,7 @@ from django.utils import timezone
 
 from apps.shared.exceptions.custom_exceptions import CustomException
 from apps.shared.models import BaseModel, Language
+from apps.shared.utils.device_session import invalidate_device_sessions
 from apps.users.managers.device import DeviceManager
 from apps.users.models.user_auth import User
 
@@ -170,6 +171,16 @@ class Device(BaseModel):
         status = "Active" if self.is_active else "Logged Out"
         return f"{user_info} - {self.device_type} ({self.device_model}) [{status}]"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_device_sessions(self.device_token)
+
+    def delete(self, *args, **kwargs):
+        device_token = self.device_token
+        result = super().delete(*args, **kwargs)
+        invalidate_device_sessions(device_token)
+        return result
+
     def logout(self):
         """
         Logout from this specific device.
@@ -202,23 +213,12 @@ class Device(BaseModel):
     @classmethod
     def logout_all_devices(cls, user):
         """Logout from all devices for a user"""
-        return cls.objects.filter(user=user, is_active=True).update(
-            is_active=False,
-            logged_out_at=timezone.now()
-        )
+        return cls.objects.logout_all_devices(user)
 
     @classmethod
     def logout_other_devices(cls, user, current_device_id):
         """Logout from all devices except current one"""
-        return cls.objects.filter(
-            user=user,
-            is_active=True
-        ).exclude(
-            id=current_device_id
-        ).update(
-            is_active=False,
-            logged_out_at=timezone.now()
-        )
+        return cls.objects.logout_other_devices(user, current_device_id)
 
     @classmethod
     def is_token_valid(cls, refresh_token_jti):
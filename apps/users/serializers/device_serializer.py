@@ -335,5 +335,6 @@ class DeviceUpdateSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         
+        # Device.save() also drops the cached device session (language may have changed)
         instance.save()
         return instance
\ No newline at end of file
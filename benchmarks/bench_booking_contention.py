@@ -0,0 +1,139 @@
+"""
+Contention benchmark: many threads booking the same hotel at once.
+
+Every worker books one room for the same night through BookingSerializer
+until the hotel reports no rooms left. The run passes when the number of
+successful bookings equals the room stock and that night ends fully booked.
+--legacy replays the old read-modify-write (hotel.available_rooms -= n;
+hotel.save()) for comparison.
+
+Runs against a throw-away test database:
+
+    python benchmarks/bench_booking_contention.py [--threads 16] [--rooms 500] [--legacy]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+django.setup()
+
+from django.db import OperationalError, connection, connections  # noqa: E402
+
+from apps.bookings.models import Booking  # noqa: E402
+from apps.bookings.serializers.booking_serializer import BookingSerializer  # noqa: E402
+from apps.bookings.services.inventory import InsufficientInventory  # noqa: E402
+from apps.hotels.models import Hotel, HotelRoomNight  # noqa: E402
+from apps.users.models.user_auth import User  # noqa: E402
+
+
+def book_atomic(hotel, user):
+    serializer = BookingSerializer(
+        data={'hotel_id': hotel.pk, 'check_in': '2026-01-01', 'check_out': '2026-01-02', 'guests': 1},
+        context={'request': SimpleNamespace(user=user)},
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+def book_legacy(hotel, user):
+    hotel = Hotel.objects.get(pk=hotel.pk)
+    if hotel.available_rooms < 1:
+        raise InsufficientInventory("Not enough rooms available.")
+    hotel.available_rooms -= 1
+    hotel.save()
+    Booking.objects.create(user=user, hotel=hotel, guests=1, total_price=hotel.price_per_night)
+
+
+def worker(book, hotel, user, results, lock):
+    booked = rejected = retried = 0
+    try:
+        while True:
+            try:
+                book(hotel, user)
+                booked += 1
+            except InsufficientInventory:
+                rejected += 1
+                break
+            except OperationalError:
+                # SQLite "database is locked" under heavy write contention
+                retried += 1
+    finally:
+        connections.close_all()
+        with lock:
+            results['booked'] += booked
+            results['rejected'] += rejected
+            results['retried'] += retried
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--rooms', type=int, default=500)
+    parser.add_argument('--legacy', action='store_true')
+    args = parser.parse_args()
+
+    db = settings.DATABASES['default']
+    if db['ENGINE'] == 'django.db.backends.sqlite3':
+        # A file database (threads cannot share :memory:) with writers taking the lock up front
+        db.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+        db.setdefault('OPTIONS', {}).update({'transaction_mode': 'IMMEDIATE', 'timeout': 30})
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user(username='bench', email='bench@example.com', password='x')
+        hotel = Hotel.objects.create(
+            name='Bench Hotel', location='Tashkent', price_per_night=100, available_rooms=args.rooms
+        )
+        connections.close_all()
+
+        book = book_legacy if args.legacy else book_atomic
+        results = {'booked': 0, 'rejected': 0, 'retried': 0}
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=worker, args=(book, hotel, user, results, lock))
+            for _ in range(args.threads)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        hotel.refresh_from_db()
+        bookings = Booking.objects.filter(hotel=hotel).count()
+        oversold = bookings - args.rooms
+        if args.legacy:
+            rooms_left = hotel.available_rooms
+        else:
+            night = HotelRoomNight.objects.get(hotel=hotel)
+            rooms_left = hotel.available_rooms - night.rooms_booked
+
+        print(f"mode:              {'legacy read-modify-write' if args.legacy else 'conditional F() update'}")
+        print(f"backend:           {connection.vendor}, {args.threads} threads, {args.rooms} rooms")
+        print(f"bookings created:  {bookings}")
+        print(f"rooms left:        {rooms_left}")
+        print(f"oversold:          {max(oversold, 0)}  (lost updates: {bookings - (args.rooms - rooms_left)})")
+        print(f"lock retries:      {results['retried']}")
+        print(f"throughput:        {results['booked'] / elapsed:.0f} bookings/s")
+
+        if not args.legacy and (bookings != args.rooms or rooms_left != 0):
+            sys.exit("FAIL: inventory does not match the bookings")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: JSON vs MessagePack bodies for the hotel and tour lists.
+
+Builds --rows hotels and tours in memory, serializes them as the list
+endpoints do and compares FastJSONRenderer with MessagePackRenderer: body
+size (plain and gzipped) and the time to encode and to decode it. Both
+bodies must decode to the same data.
+
+    python benchmarks/bench_msgpack.py [--rows 1000] [--repeat 50]
+"""
+import argparse
+import gzip
+import os
+import sys
+import timeit
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import msgpack  # noqa: E402
+import orjson  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.hotels.models import Hotel  # noqa: E402
+from apps.hotels.serializers.hotel_serializer import HotelSerializer  # noqa: E402
+from apps.shared.utils.renderers import FastJSONRenderer, MessagePackRenderer  # noqa: E402
+from apps.tours.models import Tour  # noqa: E402
+from apps.tours.serializers.tour_serializer import TourSerializer  # noqa: E402
+
+
+def envelope(data):
+    return {
+        'id': 'LIST',
+        'message': 'Retrieved successfully',
+        'data': data,
+        'pagination': {'next_cursor': 'eyJ2IjoiMjAyNSJ9', 'prev_cursor': None, 'page_size': len(data)},
+    }
+
+
+def hotel_list(count):
+    now = timezone.now()
+    hotels = [
+        Hotel(
+            id=i + 1,
+            uuid=uuid.uuid4(),
+            name=f'Hotel {i}',
+            location='Tashkent, Amir Temur ko\'chasi',
+            rating=Decimal('4.5'),
+            description='Комфортабельный отель в центре города. ' * 4,
+            price_per_night=Decimal('129.99') + i,
+            available_rooms=i % 40,
+            is_available=bool(i % 5),
+            has_wifi=True,
+            has_pool=bool(i % 2),
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+    return envelope(HotelSerializer(hotels, many=True).data)
+
+
+def tour_list(count):
+    now = timezone.now()
+    tours = [
+        Tour(
+            id=i + 1,
+            title=f'Tour {i}', description='Silk Road highlights. ' * 8, destination='Samarkand',
+            duration_days=1 + i % 10, price=Decimal('199.99') + i, capacity=20,
+            image=f'tours/{i}.jpg' if i % 3 else None, latitude=39.65, longitude=66.96,
+            created_at=now - timedelta(minutes=i), updated_at=now,
+        )
+        for i in range(count)
+    ]
+    return envelope(TourSerializer(tours, many=True).data)
+
+
+def best_of(repeat, func):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    json_renderer, msgpack_renderer = FastJSONRenderer(), MessagePackRenderer()
+    formats = [
+        ('JSON', json_renderer.render, orjson.loads),
+        ('MessagePack', msgpack_renderer.render, msgpack.unpackb),
+    ]
+
+    print(f'{args.rows} rows per list, best of {args.repeat} runs')
+    print(f"{'':<20} {'size':>9} {'gzipped':>9} {'encode':>10} {'decode':>10}")
+    for name, payload in (('hotels', hotel_list(args.rows)), ('tours', tour_list(args.rows))):
+        reference = orjson.loads(json_renderer.render(payload))
+        for label, encode, decode in formats:
+            body = encode(payload)
+            assert decode(body) == reference, f'{label} body of {name} decodes differently'
+            encode_time = best_of(args.repeat, lambda: encode(payload))
+            decode_time = best_of(args.repeat, lambda: decode(body))
+            print(
+                f'{name + " " + label:<20} {len(body) / 1024:7.0f} KiB {len(gzip.compress(body)) / 1024:5.0f} KiB'
+                f' {encode_time * 1000:7.2f} ms {decode_time * 1000:7.2f} ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
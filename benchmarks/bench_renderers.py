@@ -0,0 +1,81 @@
+"""
+Micro-benchmark: DRF's JSONRenderer vs FastJSONRenderer on a 1,000-hotel payload.
+
+Run from the project root:
+
+    python benchmarks/bench_renderers.py [--hotels 1000] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import timeit
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.hotels.models import Hotel  # noqa: E402
+from apps.hotels.serializers.hotel_serializer import HotelSerializer  # noqa: E402
+from apps.shared.utils.renderers import FastJSONRenderer  # noqa: E402
+
+
+def build_payload(count):
+    now = timezone.now()
+    hotels = [
+        Hotel(
+            id=i + 1,
+            uuid=uuid.uuid4(),
+            name=f'Hotel {i}',
+            location='Tashkent, Amir Temur ko\'chasi',
+            rating=Decimal('4.5'),
+            description='Комфортабельный отель в центре города. ' * 4,
+            price_per_night=Decimal('129.99') + i,
+            available_rooms=i % 40,
+            is_available=bool(i % 5),
+            has_wifi=True,
+            has_pool=bool(i % 2),
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+    return {
+        'id': 'HOTEL_LIST',
+        'message': 'Hotels retrieved successfully',
+        'data': HotelSerializer(hotels, many=True).data,
+        'pagination': {'next_cursor': 'eyJ2IjoiMjAyNSJ9', 'prev_cursor': None, 'page_size': count},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hotels', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    payload = build_payload(args.hotels)
+    renderers = [('JSONRenderer', JSONRenderer()), ('FastJSONRenderer', FastJSONRenderer())]
+
+    reference = JSONRenderer().render(payload)
+    assert FastJSONRenderer().render(payload) == reference, 'renderers disagree'
+
+    print(f'{args.hotels} hotels, {len(reference) / 1024:.0f} KiB, best of {args.repeat} runs')
+    baseline = None
+    for name, renderer in renderers:
+        best = min(timeit.repeat(lambda: renderer.render(payload), number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f'{name:<18} {best * 1000:8.2f} ms  {baseline / best:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: ModelSerializer vs the compiled read path on list endpoints.
+
+Seeds a throw-away test database with --rows tours, excursions and
+testimonials, then times serializing all of them both ways: model
+instances through SerializerClass(many=True) and values() rows through
+compile_serializer(SerializerClass). The rendered JSON must be identical.
+
+    python benchmarks/bench_serializers.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.excursions.models import Excursion  # noqa: E402
+from apps.excursions.serializers.excursion_serializer import ExcursionSerializer  # noqa: E402
+from apps.shared.utils.compiled_serializer import compile_serializer  # noqa: E402
+from apps.shared.utils.renderers import FastJSONRenderer  # noqa: E402
+from apps.testimonials.models import Testimonial  # noqa: E402
+from apps.testimonials.serializers.testimonial_serializer import TestimonialSerializer  # noqa: E402
+from apps.tours.models import Tour  # noqa: E402
+from apps.tours.serializers.tour_serializer import TourSerializer  # noqa: E402
+
+
+def seed(count):
+    now = timezone.now()
+    Tour.objects.bulk_create([
+        Tour(
+            title=f'Tour {i}', description='Silk Road highlights. ' * 8, destination='Samarkand',
+            duration_days=1 + i % 10, price=Decimal('199.99') + i, capacity=20,
+            image=f'tours/{i}.jpg' if i % 3 else None, latitude=39.65, longitude=66.96,
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    Excursion.objects.bulk_create([
+        Excursion(
+            title=f'Excursion {i}', location='Khiva', duration_hours=1 + i % 8,
+            price=Decimal('25.50') + i, description='Old town walk. ' * 8,
+            image=f'excursions/images/{i}.jpg', is_available=bool(i % 4),
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    Testimonial.objects.bulk_create([
+        Testimonial(name=f'Guest {i}', role='Traveller', text='Wonderful trip. ' * 6)
+        for i in range(count)
+    ], batch_size=1000)
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        seed(args.rows)
+        request = RequestFactory().get('/')
+        renderer = FastJSONRenderer()
+        failed = False
+
+        for serializer_class in (TourSerializer, ExcursionSerializer, TestimonialSerializer):
+            queryset = serializer_class.Meta.model.objects.order_by('-created_at', '-id')
+            compiled = compile_serializer(serializer_class)
+
+            drf_time, drf_data = best_of(args.repeat, lambda: serializer_class(
+                queryset, many=True, context={'request': request}).data)
+            compiled_time, compiled_data = best_of(args.repeat, lambda: compiled.many(
+                compiled.project(queryset), request))
+            identical = renderer.render(drf_data) == renderer.render(compiled_data)
+            failed |= not identical
+
+            print(f"{serializer_class.__name__:<22} {args.rows} rows  "
+                  f"ModelSerializer {drf_time * 1000:8.1f} ms  "
+                  f"compiled {compiled_time * 1000:7.1f} ms  "
+                  f"x{drf_time / compiled_time:4.1f}  "
+                  f"{'identical' if identical else 'MISMATCH'}")
+
+        if failed:
+            sys.exit("FAIL: compiled output differs from ModelSerializer")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
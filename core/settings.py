@@ -52,7 +52,9 @@ INSTALLED_APPS = [
     'apps.tours',
     'apps.shared',
     'apps.testimonials',
-    'apps.bookings'
+    'apps.bookings',
+    'apps.sync',
+    'apps.search',
 ]
 
 
@@ -95,9 +97,10 @@ REST_FRAMEWORK = {
         # 'rest_framework.authentication.SessionAuthentication'
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    # 'DEFAULT_RENDERER_CLASSES': [
-    #     'rest_framework.renderers.JSONRenderer',
-    # ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.shared.utils.renderers.FastJSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    ],
     'PAGE_SIZE': 10,
     # 'EXCEPTION_HANDLER': 'apps.shared.exceptions.handler.custom_exception_handler',
     
@@ -133,6 +136,65 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Response-cache tag versions and catalog snapshot generations must be seen by
+# every worker, so the cache has to be shared: files under var/ serve the
+# workers of one machine without external services; use
+# 'django.core.cache.backends.redis.RedisCache' when running several machines.
+# A per-process backend (LocMemCache) is refused at startup
+# (apps.shared.utils.response_cache.check_shared_cache).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'var' / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+# Runs tests against their own, emptied cache directory
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+# Seconds a public catalog response stays cached (apps.shared.utils.response_cache)
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Seconds a resolved Device-Token stays cached (apps.shared.utils.device_session)
+DEVICE_SESSION_CACHE_TIMEOUT = 300
+
+# Catalog snapshot file every worker maps (apps.shared.utils.catalog_snapshot).
+# MAX_AGE: seconds before it is rebuilt even without a signalled change;
+# CHECK_INTERVAL: seconds between checks of the shared generations for changes on other nodes;
+# REBUILD_DELAY: seconds a background rebuild waits, so a burst of changes is written once.
+CATALOG_SNAPSHOT_DIR = BASE_DIR / 'var'
+CATALOG_SNAPSHOT_MAX_AGE = 300
+CATALOG_SNAPSHOT_CHECK_INTERVAL = 1
+CATALOG_SNAPSHOT_REBUILD_DELAY = 0.5
+
+# Mobile delta sync (apps.sync) only reads rows changed at least this many seconds ago,
+# so rows committed shortly after their updated_at was stamped are not skipped
+SYNC_SETTLE_SECONDS = 5
+
+# Days deletion tombstones are kept for mobile sync (manage.py prune_tombstones);
+# clients whose token is older are sent a full sync with `reset`
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
+
+# Batched requests (/api/v1/batch/): sub-requests per batch, and threads for parallel GETs
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# Directory under MEDIA_ROOT holding the offline catalog bundle (manage.py build_catalog_bundle)
+CATALOG_BUNDLE_DIR = 'catalog'
+
+# Exception alerts (apps.shared.utils.telegram_alerts). Use FileTransport or StubTransport locally.
+ALERT_TRANSPORT = 'apps.shared.utils.telegram_alerts.TelegramTransport'
+ALERT_QUEUE_SIZE = 1000
+ALERT_DIGEST_INTERVAL = 60
+ALERT_FILE_PATH = BASE_DIR / 'alerts.log'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -157,6 +219,14 @@ AUTH_PASSWORD_VALIDATORS = [
 
 LANGUAGE_CODE = 'en-us'
 
+# Mirrors apps.shared.models.Language; Django would otherwise default to ~100 languages.
+LANGUAGES = [
+    ('ru', 'Russian'),
+    ('en', 'English'),
+    ('crl', 'Cyrillic'),
+    ('uz', 'Uzbek'),
+]
+
 TIME_ZONE = 'UTC'
 
 USE_I18N = True
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    The default cache is a directory that outlives a run: tests get their own
+    one, emptied first, so entries of an earlier run or of the development
+    server are never read.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches = override_settings(CACHES={
+            alias: {**config, 'LOCATION': f"{config['LOCATION']}-test"}
+            if config['BACKEND'].endswith('FileBasedCache') else config
+            for alias, config in settings.CACHES.items()
+        })
+        self._caches.enable()
+        for cache in caches.all():
+            cache.clear()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)